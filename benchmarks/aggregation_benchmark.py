@@ -0,0 +1,56 @@
+"""
+Benchmark of league wide shotchart: binning one concatenated frame of all players against counting shots of
+players by integer codes in tasks and merging the counters. Counting the string zone columns of data frames in tasks
+is measured too, it is how shots were counted before they were encoded.
+
+Run from the root of the repository with:
+
+    python -m benchmarks.aggregation_benchmark --shots 2000000 --players 500
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from nba_shotcharts.shotcharts.accumulator import BinAccumulator
+from nba_shotcharts.shotcharts.aggregation import aggregate_shotchart, aggregate_groups, _shot_tasks
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.shotcharts.streaming import STREAM_COLUMNS
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+def frame_counters(players, lookup):
+    accumulators = [BinAccumulator().add(task) for task in _shot_tasks(players, STREAM_COLUMNS, 250000)]
+    return BinAccumulator.combine(accumulators).shotchart(lookup).create_bin_table()
+
+
+def run(number_of_shots, number_of_players):
+    shots = generate_shots(number_of_shots, seed=1, n_players=number_of_players)
+    lookup = LeagueAverageLookup(generate_league_averages(shots))
+    players = [group for _, group in shots.groupby("PLAYER_ID", sort=False)]
+
+    start = time.perf_counter()
+    concatenated = Shotchart(shotchart_data=pd.concat(players, ignore_index=True), league_average_data=lookup)
+    concatenated.create_bins()
+    full = time.perf_counter() - start
+    print("{:<40} {:>8.2f} s".format("create_bins on concatenated frame", full))
+
+    variants = [
+        ("counters of data frames", lambda: frame_counters(players, lookup)),
+        ("counters of coded shots", lambda: aggregate_shotchart(players, lookup).create_bin_table()),
+        ("counters of coded shots per player", lambda: aggregate_groups(players, "PLAYER_ID")),
+    ]
+    for name, function in variants:
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        print("{:<40} {:>8.2f} s {:>8.1f}x".format(name, seconds, full / seconds))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shots", type=int, default=2000000, help="Number of shots in the league.")
+    parser.add_argument("--players", type=int, default=500, help="Number of players.")
+    args = parser.parse_args()
+    run(args.shots, args.players)
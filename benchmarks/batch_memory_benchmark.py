@@ -0,0 +1,80 @@
+"""
+Memory of a rendering worker over many charts: jobs are rendered one after another in a single worker process, as
+BatchRenderer does, and resident memory of the worker is sampled at checkpoints. Memory is flat if it doesn't grow
+after the first charts are rendered.
+
+Run from the root of the repository with:
+
+    python -m benchmarks.batch_memory_benchmark --charts 10000 --court-template
+    python -m benchmarks.batch_memory_benchmark --charts 2000
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from nba_shotcharts.shotcharts.batch_renderer import RenderJob, render_job, _init_worker
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+# Number of distinct datasets, jobs cycle through them
+DATASETS = 20
+# Number of distinct file names, files are overwritten so the benchmark doesn't fill the disk
+FILES = 100
+
+
+def resident_memory():
+    """
+    Current resident memory of this process in MB and the peak resident memory in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Peak is in kilobytes on Linux and in bytes on macOS
+    peak = peak / 1024.0 if sys.platform != "darwin" else peak / 1024.0 ** 2
+    try:
+        with open("/proc/self/statm") as statm:
+            current = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024.0 ** 2
+    except OSError:
+        current = peak
+    return current, peak
+
+
+def render_and_measure(jobs, output_directory, use_court_template):
+    for job in jobs:
+        render_job(job, output_directory, ("png",), use_court_template)
+    return resident_memory()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--charts", type=int, default=10000, help="Number of charts rendered by the worker.")
+    parser.add_argument("--shots", type=int, default=1000, help="Number of shots in every chart.")
+    parser.add_argument("--checkpoints", type=int, default=10, help="Number of memory samples.")
+    parser.add_argument("--court-template", action="store_true", help="Composite PNG images on cached court.")
+    args = parser.parse_args()
+
+    datasets = [generate_shots(args.shots, seed=seed) for seed in range(DATASETS)]
+    league_averages = generate_league_averages(n_shots=20000)
+    output_directory = tempfile.mkdtemp()
+    step = max(args.charts // args.checkpoints, 1)
+    rendered = 0
+    start = time.perf_counter()
+    samples = []
+    with ProcessPoolExecutor(max_workers=1, initializer=_init_worker) as executor:
+        while rendered < args.charts:
+            count = min(step, args.charts - rendered)
+            jobs = [RenderJob("chart_{}".format((rendered + index) % FILES), "Chart {}".format(rendered + index),
+                              datasets[(rendered + index) % DATASETS], league_averages, {"image_size": "small"})
+                    for index in range(count)]
+            current, peak = executor.submit(render_and_measure, jobs, output_directory,
+                                            args.court_template).result()
+            rendered += count
+            samples.append(current)
+            print("charts={:<7} rss={:>7.1f} MB   peak={:>7.1f} MB   {:>7.1f} s".format(
+                rendered, current, peak, time.perf_counter() - start))
+    print("growth after the first checkpoint: {:+.1f} MB".format(samples[-1] - samples[0]))
+
+
+if __name__ == '__main__':
+    main()
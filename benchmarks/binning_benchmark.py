@@ -0,0 +1,53 @@
+"""
+Benchmark of the vectorized create_bins against the old row by row implementation.
+
+Run from the root of the repository with:
+
+    python -m benchmarks.binning_benchmark
+
+Row by row implementation is very slow for large data sets, so it is timed only up to --legacy-limit shots.
+"""
+import argparse
+import time
+
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.tests.legacy_binning import legacy_create_bins
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+SIZES = [1000, 100000, 1000000]
+
+
+def best_time(function, repeat):
+    """
+    Returns the best wall time out of repeat calls of function.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes, legacy_limit, repeat):
+    league_average = generate_league_averages()
+    print("{:>10} {:>14} {:>14} {:>10}".format("shots", "vectorized [s]", "legacy [s]", "speedup"))
+    for size in sizes:
+        shots = generate_shots(size, seed=size)
+        shotchart = Shotchart(shotchart_data=shots, league_average_data=league_average)
+        vectorized = best_time(shotchart.create_bins, repeat)
+        if size <= legacy_limit:
+            legacy = best_time(lambda: legacy_create_bins(shotchart), 1)
+            print("{:>10} {:>14.4f} {:>14.4f} {:>9.1f}x".format(size, vectorized, legacy, legacy / vectorized))
+        else:
+            print("{:>10} {:>14.4f} {:>14} {:>10}".format(size, vectorized, "skipped", "-"))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Numbers of shots which are binned.")
+    parser.add_argument("--legacy-limit", type=int, default=100000,
+                        help="Largest number of shots for which row by row implementation is timed.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of repetitions for vectorized binning.")
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_limit, args.repeat)
@@ -0,0 +1,54 @@
+"""
+Benchmark of PNG rendering with cached court template against drawing the whole figure for every chart.
+
+Run from the root of the repository with:
+
+    python -m benchmarks.court_template_benchmark
+"""
+import argparse
+import io
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+
+def full_redraw(shotchart, binned_df):
+    buffer = io.BytesIO()
+    Shotchart.save_figure(shotchart.create_figure("Shotchart", binned_df), buffer, "png")
+    return buffer.getvalue()
+
+
+def run(charts, image_sizes):
+    league_average = generate_league_averages()
+    print("{:>8} {:>16} {:>16} {:>10}".format("size", "full [ms/chart]", "template [ms/chart]", "speedup"))
+    for image_size in image_sizes:
+        shotcharts = [Shotchart(shotchart_data=generate_shots(1500, seed=seed), league_average_data=league_average,
+                                image_size=image_size, should_save_image=True) for seed in range(charts)]
+        binned = [shotchart.create_bins() for shotchart in shotcharts]
+        # Template is created once per style, outside of the timed loop
+        shotcharts[0].render_png("Shotchart", binned[0])
+
+        start = time.perf_counter()
+        for shotchart, binned_df in zip(shotcharts, binned):
+            full_redraw(shotchart, binned_df)
+        full = (time.perf_counter() - start) / charts
+
+        start = time.perf_counter()
+        for shotchart, binned_df in zip(shotcharts, binned):
+            shotchart.render_png("Shotchart", binned_df)
+        template = (time.perf_counter() - start) / charts
+        print("{:>8} {:>16.1f} {:>16.1f} {:>9.1f}x".format(image_size, full * 1000, template * 1000,
+                                                           full / template))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--charts", type=int, default=20, help="Number of charts rendered per image size.")
+    parser.add_argument("--image-sizes", nargs="+", default=["small", "medium", "large"])
+    args = parser.parse_args()
+    run(args.charts, args.image_sizes)
@@ -0,0 +1,63 @@
+"""
+Small multiples: one ShotchartGrid figure against rendering every panel as a separate shotchart, both with the pyplot
+path of plot_shotchart and with create_figure.
+
+Run from the root of the repository with:
+
+    python -m benchmarks.facet_benchmark --panels 10 15 --shots 2000
+"""
+import argparse
+import io
+import statistics
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from nba_shotcharts.shotcharts.facets import ShotchartGrid  # noqa: E402
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+
+def separate_pyplot(panels, league_average):
+    for title, shots in panels:
+        Shotchart(shotchart_data=shots, league_average_data=league_average, image_size="small",
+                  should_save_image=True).plot_shotchart(title, is_plot_for_response=True)
+
+
+def separate_figures(panels, league_average):
+    for title, shots in panels:
+        shotchart = Shotchart(shotchart_data=shots, league_average_data=league_average, image_size="small",
+                              should_save_image=True)
+        Shotchart.save_figure(shotchart.create_figure(title), io.BytesIO(), "png")
+
+
+def grid(panels, league_average):
+    ShotchartGrid(panels, league_average).render(io.BytesIO(), "Grid", "png")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--panels", type=int, nargs="+", default=[10, 15], help="Numbers of panels.")
+    parser.add_argument("--shots", type=int, default=2000, help="Number of shots per panel.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of repetitions.")
+    args = parser.parse_args()
+
+    for number_of_panels in args.panels:
+        panels = [("Panel {}".format(index), generate_shots(args.shots, seed=index))
+                  for index in range(number_of_panels)]
+        league_average = generate_league_averages(panels[0][1])
+        for name, render in [("separate_pyplot", separate_pyplot), ("separate_figures", separate_figures),
+                             ("grid", grid)]:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                render(panels, league_average)
+                timings.append(time.perf_counter() - start)
+            print("panels={:<4} {:<18} best {:>8.1f} ms   median {:>8.1f} ms".format(
+                number_of_panels, name, min(timings) * 1000, statistics.median(timings) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Repeated chart requests: a new Shotchart is built for every request (as the web layer does) and it is either drawn
+with plot_shotchart, or served from RenderCache. Time of cache hits includes hashing of the shots.
+
+Run from the root of the repository with:
+
+    python -m benchmarks.render_cache_benchmark --shots 2000 20000 --requests 20
+"""
+import argparse
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup  # noqa: E402
+from nba_shotcharts.shotcharts.render_cache import RenderCache, render_key  # noqa: E402
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+
+def uncached(shots, lookup, requests):
+    for _ in range(requests):
+        shotchart = Shotchart(shotchart_data=shots, league_average_data=lookup, should_save_image=True)
+        shotchart.plot_shotchart("Benchmark", is_plot_for_response=True)
+
+
+def cached(cache, shots, lookup, requests):
+    for _ in range(requests):
+        cache.render(Shotchart(shotchart_data=shots, league_average_data=lookup, should_save_image=True),
+                     "Benchmark")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shots", type=int, nargs="+", default=[2000, 20000], help="Numbers of shots.")
+    parser.add_argument("--requests", type=int, default=20, help="Number of identical requests.")
+    args = parser.parse_args()
+
+    for size in args.shots:
+        shots = generate_shots(size, seed=size)
+        lookup = LeagueAverageLookup(generate_league_averages(shots))
+        memory_cache = RenderCache()
+        disk_cache = RenderCache(tempfile.mkdtemp())
+        # Both caches are filled by the first request, disk cache is read from disk by new instances
+        cached(memory_cache, shots, lookup, 1)
+        cached(disk_cache, shots, lookup, 1)
+        variants = [
+            ("plot_shotchart", lambda: uncached(shots, lookup, args.requests)),
+            ("memory_hit", lambda: cached(memory_cache, shots, lookup, args.requests)),
+            ("disk_hit", lambda: [cached(RenderCache(disk_cache.directory), shots, lookup, 1)
+                                  for _ in range(args.requests)]),
+            ("render_key", lambda: [render_key(Shotchart(shotchart_data=shots, league_average_data=lookup,
+                                                         should_save_image=True), "Benchmark")
+                                    for _ in range(args.requests)]),
+        ]
+        for name, function in variants:
+            start = time.perf_counter()
+            function()
+            seconds = time.perf_counter() - start
+            print("shots={:<7} requests={:<4} {:<15} {:>9.1f} ms   {:>8.2f} ms per request".format(
+                size, args.requests, name, seconds * 1000, seconds * 1000 / args.requests))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Latency of PNG rendering under concurrent requests: the current response path of plot_shotchart, a new figure for
+every request (create_figure) and ShotchartRenderer with the pool of pre-built figures.
+
+A local load generator sends requests from several threads, as a threaded web server would, and the latency of
+every request is measured from the moment it is sent.
+
+Run from the root of the repository with:
+
+    python -m benchmarks.renderer_benchmark --requests 200 --concurrency 8
+"""
+import argparse
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+
+from nba_shotcharts.shotcharts.renderer import ShotchartRenderer  # noqa: E402
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+# pyplot isn't thread safe, so the current path is serialized as it must be in a threaded server
+_pyplot_lock = threading.Lock()
+
+
+def pyplot_response(shotchart, binned_df, renderer):
+    with _pyplot_lock:
+        # Binning is done in advance for all paths, only rendering is measured
+        shotchart.binned_for_drawing = lambda: binned_df
+        return shotchart.plot_shotchart("Shotchart", is_plot_for_response=True).getvalue()
+
+
+def new_figure(shotchart, binned_df, renderer):
+    buffer = io.BytesIO()
+    Shotchart.save_figure(shotchart.create_figure("Shotchart", binned_df), buffer, "png")
+    return buffer.getvalue()
+
+
+def pooled_figure(shotchart, binned_df, renderer):
+    return renderer.render(shotchart, "Shotchart", binned_df)
+
+
+def load(render, charts, requests, concurrency, renderer):
+    """
+    Sends requests from concurrency threads.
+
+    :return: Tuple (latencies in seconds, total seconds)
+    """
+    def request(index):
+        shotchart, binned_df = charts[index % len(charts)]
+        start = time.perf_counter()
+        render(shotchart, binned_df, renderer)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(request, range(requests)))
+    return np.array(latencies), time.perf_counter() - start
+
+
+def run(requests, concurrency, image_size, pool_size):
+    league_average = generate_league_averages()
+    charts = []
+    for seed in range(20):
+        shotchart = Shotchart(shotchart_data=generate_shots(1500, seed=seed), league_average_data=league_average,
+                              image_size=image_size, should_save_image=True)
+        charts.append((shotchart, shotchart.create_bins()))
+    renderer = ShotchartRenderer(pool_size=pool_size)
+    renderer.warm_up(charts[0][0])
+
+    print("{:>10} {:>10} {:>10} {:>10} {:>12}".format("path", "p50 [ms]", "p99 [ms]", "max [ms]", "charts/s"))
+    for name, render in [("pyplot", pyplot_response), ("figure", new_figure), ("pooled", pooled_figure)]:
+        # One warm up request so imports and font caches aren't measured
+        render(*charts[0], renderer)
+        latencies, seconds = load(render, charts, requests, concurrency, renderer)
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print("{:>10} {:>10.1f} {:>10.1f} {:>10.1f} {:>12.1f}".format(name, p50, p99, latencies.max() * 1000,
+                                                                      requests / seconds))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Number of requests per path.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent clients.")
+    parser.add_argument("--image-size", default="medium", help="Size of rendered images.")
+    parser.add_argument("--pool-size", type=int, default=4, help="Number of figures in renderer's pool.")
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.image_size, args.pool_size)
@@ -0,0 +1,63 @@
+"""
+Handing a season wide dataset to worker processes: pickling the shot and league average frames into every job
+against publishing them once to shared memory and sending only row ranges of players. Workers compute bin tables,
+so the time is dominated by the handoff.
+
+Run from the root of the repository with:
+
+    python -m benchmarks.shared_memory_benchmark --shots 500000 --players 450 --workers 4
+"""
+import argparse
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from nba_shotcharts.shotcharts.shared_data import SharedDataset
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+def pickled_job(arguments):
+    shots, league_average, player_id = arguments
+    shots = shots.loc[shots.PLAYER_ID == player_id]
+    return len(Shotchart(shotchart_data=shots, league_average_data=league_average).create_bin_table())
+
+
+def shared_job(selection):
+    shots, league_average_lookup = selection.resolve()
+    return len(Shotchart(shotchart_data=shots, league_average_data=league_average_lookup).create_bin_table())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shots", type=int, default=500000, help="Number of shots in the season.")
+    parser.add_argument("--players", type=int, default=450, help="Number of players.")
+    parser.add_argument("--jobs", type=int, default=100, help="Number of players whose charts are computed.")
+    parser.add_argument("--workers", type=int, default=2, help="Number of worker processes.")
+    args = parser.parse_args()
+
+    shots = generate_shots(args.shots, seed=1, n_players=args.players)
+    league_average = generate_league_averages(shots)
+    player_ids = shots.PLAYER_ID.unique()[:args.jobs]
+
+    job_bytes = len(pickle.dumps((shots, league_average, player_ids[0]), protocol=pickle.HIGHEST_PROTOCOL))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(pickled_job, [(shots, league_average, player_id) for player_id in player_ids]))
+    pickled_seconds = time.perf_counter() - start
+    print("pickled frames   {:>8.2f} s   {:>12,} bytes per job".format(pickled_seconds, job_bytes))
+
+    start = time.perf_counter()
+    with SharedDataset.publish(shots, league_average) as dataset:
+        publish_seconds = time.perf_counter() - start
+        selections = [dataset.select(player_id) for player_id in player_ids]
+        job_bytes = len(pickle.dumps(selections[0], protocol=pickle.HIGHEST_PROTOCOL))
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            list(executor.map(shared_job, selections))
+        shared_seconds = time.perf_counter() - start
+        print("shared memory    {:>8.2f} s   {:>12,} bytes per job   ({:.2f} s publishing {:,} bytes)".format(
+            shared_seconds, job_bytes, publish_seconds, dataset.memory.size))
+
+
+if __name__ == '__main__':
+    main()
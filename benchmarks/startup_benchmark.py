@@ -0,0 +1,83 @@
+"""
+Startup cost: time of importing the modules of the package in a fresh interpreter, and of the first render, which
+loads matplotlib and seaborn. Every measurement is done in a new process, so nothing is imported in advance.
+
+Run from the root of the repository with:
+
+    python -m benchmarks.startup_benchmark --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules whose import time is measured
+MODULES = [
+    "nba_shotcharts.shotcharts.shotchart",
+    "nba_shotcharts.shotcharts.export",
+    "nba_shotcharts.shotcharts.aggregation",
+    "nba_shotcharts.shotcharts.data_retriever",
+]
+
+_IMPORT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(",".join(sorted(name for name in ("matplotlib.pyplot", "seaborn") if name in sys.modules)))
+"""
+
+_FIRST_RENDER = """
+import io, time
+import matplotlib
+matplotlib.use("Agg")
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+shots = generate_shots(1000, seed=1)
+shotchart = Shotchart(shotchart_data=shots, league_average_data=generate_league_averages(shots), image_size="small")
+binned_df = shotchart.create_bins()
+start = time.perf_counter()
+Shotchart.save_figure(shotchart.create_figure("Startup", binned_df), io.BytesIO(), "png")
+print(time.perf_counter() - start)
+print("")
+"""
+
+
+def run(code, repeat):
+    """
+    Runs code in repeat new interpreters, the code prints seconds and loaded plotting modules.
+
+    :return: Dictionary with best and median time in seconds and plotting modules which were loaded.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timings = []
+    loaded = ""
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=root).decode().split("\n")
+        timings.append(float(output[0]))
+        loaded = output[1]
+    return {"best": min(timings), "median": statistics.median(timings), "repeat": repeat,
+            "loaded": loaded.split(",") if loaded else []}
+
+
+def startup_benchmarks(repeat):
+    results = [dict(stage="import", variant=module, **run(_IMPORT.format(module=module), repeat))
+               for module in MODULES]
+    results.append(dict(stage="first_render", variant="create_figure", **run(_FIRST_RENDER, repeat)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Number of new interpreters per measurement.")
+    args = parser.parse_args()
+
+    for result in startup_benchmarks(args.repeat):
+        print("{:<14} {:<45} best {:>8.1f} ms   median {:>8.1f} ms   plotting modules loaded: {}".format(
+            result["stage"], result["variant"], result["best"] * 1000, result["median"] * 1000,
+            ", ".join(result["loaded"]) or "none"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark suite for the stages of shotchart pipeline: startup, retrieval, binning, league average lookup, figure
+construction and PNG encoding. All data is synthetic, so results are reproducible and no network is used.
+
+Run from the root of the repository with:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --output new.json --compare results.json
+
+When --compare is given, stages which got slower than --threshold are reported and the exit code is 1.
+"""
+import argparse
+import datetime
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks.startup_benchmark import startup_benchmarks  # noqa: E402
+from nba_shotcharts.shotcharts.cache import ShotchartCache  # noqa: E402
+from nba_shotcharts.shotcharts.data_retriever import DataRetrieverFactory  # noqa: E402
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup  # noqa: E402
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.tests.fake_endpoint import FakeShotChartDetail  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+SIZES = [1000, 10000, 100000]
+NUMBER_OF_MARKERS = ["small", "medium", "large"]
+
+
+def measure(function, repeat):
+    """
+    Calls function repeat times.
+
+    :return: Dictionary with best and median wall time in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {"best": min(timings), "median": statistics.median(timings), "repeat": repeat}
+
+
+def retrieval_benchmarks(repeat):
+    """
+    Retrieval with the local fake of ShotChartDetail: player lookup, filtering and cache reads and writes.
+    """
+    results = []
+    fetch = lambda cache=None: DataRetrieverFactory.get_shotchart_league_averages(  # noqa: E731
+        "Russell Westbrook", season="2017-18", cache=cache, endpoint=FakeShotChartDetail)
+    results.append(dict(stage="retrieval", variant="no_cache", **measure(fetch, repeat)))
+
+    directory = tempfile.mkdtemp()
+    cache = ShotchartCache(directory, current_season="2018-19")
+    results.append(dict(stage="retrieval", variant="cache_write",
+                        **measure(lambda: (cache.clear(), fetch(cache)), repeat)))
+    fetch(cache)
+    results.append(dict(stage="retrieval", variant="cache_hit", **measure(lambda: fetch(cache), repeat)))
+    return results
+
+
+def stage_benchmarks(sizes, markers, repeat):
+    results = []
+    league_average = generate_league_averages()
+    lookup = LeagueAverageLookup(league_average)
+    for size in sizes:
+        shots = generate_shots(size, seed=size)
+        zones = shots[["SHOT_ZONE_BASIC", "SHOT_ZONE_AREA", "SHOT_ZONE_RANGE"]]
+        results.append(dict(stage="league_average_build", shots=size,
+                            **measure(lambda: LeagueAverageLookup(league_average), repeat)))
+        results.append(dict(stage="league_average_lookup", shots=size, **measure(
+            lambda: lookup.lookup(zones.SHOT_ZONE_BASIC, zones.SHOT_ZONE_AREA, zones.SHOT_ZONE_RANGE), repeat)))
+
+        for number_of_markers in markers:
+            shotchart = Shotchart(shotchart_data=shots, league_average_data=lookup,
+                                  number_of_markers=number_of_markers, image_size="medium", should_save_image=True)
+            common = {"shots": size, "number_of_markers": number_of_markers}
+            results.append(dict(stage="create_bins", **common, **measure(shotchart.create_bins, repeat)))
+            binned_df = shotchart.create_bins()
+
+            def construct():
+                figure = shotchart.create_figure("Benchmark", binned_df)
+                figure.canvas.draw()
+                return figure
+
+            results.append(dict(stage="figure_construction", **common, **measure(construct, repeat)))
+            figure = construct()
+            results.append(dict(stage="png_encoding", **common, **measure(
+                lambda: Shotchart.save_figure(figure, io.BytesIO(), "png"), repeat)))
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__
+    }
+
+
+def result_key(result):
+    return tuple((name, result[name]) for name in ["stage", "variant", "shots", "number_of_markers"] if name in result)
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares best times with the baseline.
+
+    :return: List of (key, baseline_time, new_time) for stages which are slower than threshold allows.
+    """
+    baseline_times = {result_key(result): result["best"] for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        key = result_key(result)
+        if key in baseline_times and result["best"] > baseline_times[key] * (1 + threshold):
+            regressions.append((key, baseline_times[key], result["best"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Path of JSON file into which results are written.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Numbers of shots.")
+    parser.add_argument("--markers", nargs="+", default=NUMBER_OF_MARKERS, help="Numbers of markers.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions of each stage.")
+    parser.add_argument("--compare", help="JSON file with baseline results.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown against the baseline.")
+    args = parser.parse_args()
+
+    results = (startup_benchmarks(args.repeat) + retrieval_benchmarks(args.repeat) +
+               stage_benchmarks(args.sizes, args.markers, args.repeat))
+    for result in results:
+        name = ", ".join("{}={}".format(key, value) for key, value in result_key(result))
+        print("{:<70} best {:>9.2f} ms   median {:>9.2f} ms".format(name, result["best"] * 1000,
+                                                                     result["median"] * 1000))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"metadata": metadata(), "results": results}, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for key, baseline_time, new_time in regressions:
+            print("REGRESSION {}: {:.2f} ms -> {:.2f} ms".format(dict(key), baseline_time * 1000, new_time * 1000))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Rolling windows of games: counts and bin tables of every window computed by binning shots of the window again
+against prefix sum differences of ShotTimeline (which is built inside the measured time).
+
+Run from the root of the repository with:
+
+    python -m benchmarks.timeline_benchmark --shots 2000 20000 --window 10
+"""
+import argparse
+import time
+
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.shotcharts.timeline import ShotTimeline
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+def rebinned_windows(shots, lookup, windows, game_ids, counts_only):
+    for start, stop in windows:
+        window_shots = shots.loc[shots.GAME_ID.isin(game_ids[start:stop])]
+        shotchart = Shotchart(shotchart_data=window_shots, league_average_data=lookup)
+        shotchart.aggregate_bins() if counts_only else shotchart.create_bin_table()
+
+
+def timeline_windows(shots, lookup, windows, game_ids, counts_only):
+    timeline = ShotTimeline(shots)
+    for start, stop in windows:
+        timeline.window(start, stop) if counts_only else timeline.bin_table(start, stop, lookup)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shots", type=int, nargs="+", default=[2000, 20000], help="Numbers of shots in a season.")
+    parser.add_argument("--window", type=int, default=10, help="Number of games in a window.")
+    args = parser.parse_args()
+
+    for size in args.shots:
+        shots = generate_shots(size, seed=size)
+        lookup = LeagueAverageLookup(generate_league_averages(shots))
+        timeline = ShotTimeline(shots)
+        windows = timeline.rolling_windows(args.window)
+        for counts_only in [True, False]:
+            for name, compute in [("rebinned", rebinned_windows), ("prefix_sums", timeline_windows)]:
+                start = time.perf_counter()
+                compute(shots, lookup, windows, timeline.game_ids, counts_only)
+                seconds = time.perf_counter() - start
+                print("shots={:<7} windows={:<4} {:<10} {:<12} {:>8.1f} ms   {:>6.2f} ms per window".format(
+                    size, len(windows), "counts" if counts_only else "bin_table", name, seconds * 1000,
+                    seconds * 1000 / len(windows)))
+
+
+if __name__ == '__main__':
+    main()
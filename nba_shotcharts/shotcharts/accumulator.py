@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.binning import aggregate_bin_zones, BIN_COLUMNS, ZONE_COLUMNS, NUMBER_OF_MARKERS
+from nba_shotcharts.shotcharts.compact import CompactShotTable
+from nba_shotcharts.shotcharts.grid import get_bin_grid
+
+AGGREGATE_COLUMNS = BIN_COLUMNS + ZONE_COLUMNS + ["ATTEMPTS", "MADE", "FIRST_SEEN"]
+
+
+class BinAccumulator:
+
+    def __init__(self, number_of_markers="medium"):
+        """
+        Mergeable counters of attempts and made shots per bin and zone. New shots can be folded in at any time (for
+        example games played since the last update) and the shotchart is computed only from the counters, with the
+        same result as if all shots were binned at once.
+
+        :param number_of_markers: Whether there will be small, medium or large number of markers.
+        """
+        self.number_of_markers = number_of_markers
+        self.bin_number_x = NUMBER_OF_MARKERS.get(number_of_markers, NUMBER_OF_MARKERS["medium"])
+        self.grid = get_bin_grid(self.bin_number_x)
+        self.bin_number_y = self.grid.bin_number_y
+        self.counts = pd.DataFrame({column: pd.Series(dtype=np.int64) for column in AGGREGATE_COLUMNS})
+        self.shots_seen = 0
+        self.seen_games = set()
+
+    def new_shots(self, shots):
+        """
+        Shots from games which weren't added yet.
+
+        :param shots: Data frame with shots, it must have GAME_ID column.
+        :return: Data frame with shots from new games.
+        """
+        return shots.loc[~shots.GAME_ID.isin(self.seen_games)]
+
+    def add(self, shots, skip_seen_games=False):
+        """
+        Folds shots into counters. Shots must be added in the same order in which they would be in the full data set.
+
+        :param shots: Data frame with LOC_X, LOC_Y, SHOT_MADE_FLAG and zone columns or CompactShotTable, whose games
+        aren't tracked.
+        :param skip_seen_games: If True, shots from games which were already added are ignored.
+        :return: self
+        """
+        if isinstance(shots, CompactShotTable):
+            grid = self.grid
+            counts = shots.aggregate_bins(grid.bin_number_x, grid.bin_number_y, grid.width, grid.height, grid.norm_x,
+                                          grid.norm_y, grid)
+            return self.add_counts(counts, len(shots))
+        if skip_seen_games:
+            shots = self.new_shots(shots)
+        if "GAME_ID" in shots:
+            self.seen_games.update(shots.GAME_ID.unique())
+        if len(shots) == 0:
+            return self
+        x_bins, y_bins = self.grid.bin_indices(shots.LOC_X.to_numpy(), shots.LOC_Y.to_numpy())
+        return self.add_counts(aggregate_bin_zones(x_bins, y_bins, shots), len(shots))
+
+    def add_counts(self, counts, number_of_shots):
+        """
+        Folds counts of shots per bin and zone (same format as aggregate_bin_zones returns) into counters.
+
+        :param counts: Data frame with counts of shots which came after all shots that were already added.
+        :param number_of_shots: Number of shots from which counts were computed.
+        :return: self
+        """
+        counts = counts[AGGREGATE_COLUMNS].copy()
+        counts["FIRST_SEEN"] = counts.FIRST_SEEN + self.shots_seen
+        merged = pd.concat([self.counts, counts], ignore_index=True) if len(self.counts) else counts
+        self.counts = merged.groupby(BIN_COLUMNS + ZONE_COLUMNS, sort=False, dropna=False).agg(
+            ATTEMPTS=("ATTEMPTS", "sum"),
+            MADE=("MADE", "sum"),
+            FIRST_SEEN=("FIRST_SEEN", "min")
+        ).reset_index()
+        self.shots_seen += number_of_shots
+        return self
+
+    def merge(self, other):
+        """
+        Folds counters of other accumulator, whose shots came after shots of this one.
+
+        :param other: BinAccumulator with the same number of markers.
+        :return: self
+        """
+        if other.bin_number_x != self.bin_number_x:
+            raise ValueError('Accumulators with different number of markers can not be merged')
+        self.seen_games.update(other.seen_games)
+        return self.add_counts(other.counts, other.shots_seen)
+
+    @staticmethod
+    def combine(accumulators, number_of_markers="medium"):
+        """
+        Merges many accumulators at once, in the given order. It gives the same counters as merging them one by one,
+        but the counts are grouped only once, so it is fast for thousands of accumulators (e.g. one per player).
+
+        :param accumulators: Iterable of BinAccumulator objects with the same number of markers.
+        :param number_of_markers: Number of markers of the result if there are no accumulators.
+        :return: New BinAccumulator
+        """
+        accumulators = list(accumulators)
+        combined = BinAccumulator(accumulators[0].number_of_markers if accumulators else number_of_markers)
+        counts = []
+        for accumulator in accumulators:
+            if accumulator.bin_number_x != combined.bin_number_x:
+                raise ValueError('Accumulators with different number of markers can not be merged')
+            if len(accumulator.counts):
+                shifted = accumulator.counts[AGGREGATE_COLUMNS].copy()
+                shifted["FIRST_SEEN"] = shifted.FIRST_SEEN + combined.shots_seen
+                counts.append(shifted)
+            combined.shots_seen += accumulator.shots_seen
+            combined.seen_games.update(accumulator.seen_games)
+        if counts:
+            shots_seen = combined.shots_seen
+            combined.shots_seen = 0
+            combined.add_counts(pd.concat(counts, ignore_index=True), shots_seen)
+        return combined
+
+    def aggregate(self):
+        """
+        Counters in order in which bins appeared, in the same format as aggregate_bin_zones returns them.
+        """
+        return self.counts.sort_values("FIRST_SEEN", kind="mergesort").reset_index(drop=True)
+
+    def shotchart(self, league_average_data, **kwargs):
+        """
+        Creates Shotchart which is drawn from the counters.
+
+        :param league_average_data: League averages data frame or LeagueAverageLookup.
+        :param kwargs: Other arguments of Shotchart constructor.
+        :return: Shotchart object
+        """
+        from nba_shotcharts.shotcharts.shotchart import Shotchart
+
+        return Shotchart(shotchart_data=None, league_average_data=league_average_data,
+                         number_of_markers=self.number_of_markers, bin_aggregate=self.aggregate(), **kwargs)
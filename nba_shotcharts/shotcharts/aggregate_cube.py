@@ -0,0 +1,149 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.binning import ZONE_COLUMNS, NUMBER_OF_MARKERS
+from nba_shotcharts.shotcharts.grid import get_bin_grid
+
+CUBE_FILE = "cube.npy"
+INDEX_FILE = "index.npy"
+ZONES_FILE = "zones.json"
+# Shots are binned into square bins, charts of other shapes can't be drawn from the cube
+CUBE_BIN_SHAPE = "square"
+
+# One row per (player, resolution, bin, zone)
+CUBE_DTYPE = np.dtype([
+    ("player_id", np.int64),
+    ("resolution", np.int16),  # Number of bins on x axis
+    ("bin_x", np.int16),
+    ("bin_y", np.int16),
+    ("zone", np.int16),  # Index into the list of zones
+    ("attempts", np.int32),
+    ("made", np.int32),
+    ("first_seen", np.int32)  # Position of the first shot in player's shots, used for ties of dominant zone
+])
+
+INDEX_DTYPE = np.dtype([
+    ("player_id", np.int64),
+    ("resolution", np.int16),
+    ("start", np.int64),
+    ("stop", np.int64)
+])
+
+
+class BinAggregateCube:
+
+    def __init__(self, directory):
+        """
+        Counts of attempts and made shots per (player, bin resolution, x_bin, y_bin, zone) for whole season, stored
+        on disk and memory mapped. Charts are drawn from the cube without touching raw shots, so their latency
+        depends only on the number of bins.
+
+        :param directory: Directory in which cube was built with BinAggregateCube.build.
+        """
+        self.directory = directory
+        self.cube = np.load(os.path.join(directory, CUBE_FILE), mmap_mode="r")
+        index = np.load(os.path.join(directory, INDEX_FILE))
+        self.index = {(int(row["player_id"]), int(row["resolution"])): (int(row["start"]), int(row["stop"]))
+                      for row in index}
+        with open(os.path.join(directory, ZONES_FILE)) as zones_file:
+            zones = json.load(zones_file)
+        self.zones = [np.asarray([zone[position] for zone in zones], dtype=object)
+                      for position in range(len(ZONE_COLUMNS))]
+
+    @staticmethod
+    def build(shots, directory, resolutions=tuple(NUMBER_OF_MARKERS.values()), player_column="PLAYER_ID"):
+        """
+        Builds the cube out of raw shots of a season and writes it into directory.
+
+        :param shots: Data frame with shots of many players.
+        :param directory: Directory in which cube is written.
+        :param resolutions: Numbers of bins on x axis for which shots are aggregated.
+        :param player_column: Column which identifies the player.
+        :return: BinAggregateCube object
+        """
+        os.makedirs(directory, exist_ok=True)
+        zone_codes, zones = pd.MultiIndex.from_frame(shots[ZONE_COLUMNS]).factorize()
+        players = shots[player_column].to_numpy(dtype=np.int64)
+        # Position of each shot among shots of the same player
+        order = shots.groupby(player_column, sort=False).cumcount().to_numpy(dtype=np.int64)
+        made = shots.SHOT_MADE_FLAG.to_numpy(dtype=np.int64)
+
+        parts = []
+        for resolution in resolutions:
+            grid = get_bin_grid(resolution, shape=CUBE_BIN_SHAPE)
+            x_bins, y_bins = grid.bin_indices(shots.LOC_X.to_numpy(), shots.LOC_Y.to_numpy())
+            table = pd.DataFrame({"player_id": players, "bin_x": x_bins, "bin_y": y_bins, "zone": zone_codes,
+                                  "made": made, "first_seen": order})
+            aggregate = table.groupby(["player_id", "bin_x", "bin_y", "zone"], sort=False).agg(
+                attempts=("made", "size"),
+                made=("made", "sum"),
+                first_seen=("first_seen", "min")
+            ).reset_index()
+            aggregate["resolution"] = int(resolution)
+            parts.append(aggregate)
+        aggregate = pd.concat(parts, ignore_index=True)
+        # Rows of each player and resolution are kept together in the order in which bins appeared
+        aggregate = aggregate.sort_values(["player_id", "resolution", "first_seen"], kind="mergesort")
+
+        cube = np.empty(len(aggregate), dtype=CUBE_DTYPE)
+        for field in CUBE_DTYPE.names:
+            cube[field] = aggregate[field].to_numpy()
+        np.save(os.path.join(directory, CUBE_FILE), cube)
+
+        keys = aggregate[["player_id", "resolution"]].to_numpy()
+        boundaries = np.flatnonzero(np.any(keys[1:] != keys[:-1], axis=1)) + 1
+        starts = np.concatenate([[0], boundaries]).astype(np.int64)
+        stops = np.concatenate([boundaries, [len(keys)]]).astype(np.int64)
+        index = np.empty(len(starts), dtype=INDEX_DTYPE)
+        index["player_id"], index["resolution"] = keys[starts, 0], keys[starts, 1]
+        index["start"], index["stop"] = starts, stops
+        np.save(os.path.join(directory, INDEX_FILE), index)
+
+        with open(os.path.join(directory, ZONES_FILE), "w") as zones_file:
+            json.dump([list(zone) for zone in zones], zones_file)
+        return BinAggregateCube(directory)
+
+    def players(self):
+        return sorted({player_id for player_id, _ in self.index})
+
+    def aggregate(self, player_id, bin_number_x=NUMBER_OF_MARKERS["medium"]):
+        """
+        Counts of shots per bin and zone for one player, in the same format as aggregate_bin_zones returns them.
+
+        :param player_id: Id of the player.
+        :param bin_number_x: Number of bins on x axis.
+        :return: Data frame with BIN_X, BIN_Y, zone columns, ATTEMPTS, MADE and FIRST_SEEN columns.
+        """
+        start, stop = self.index.get((int(player_id), int(bin_number_x)), (0, 0))
+        rows = self.cube[start:stop]
+        aggregate = pd.DataFrame({"BIN_X": rows["bin_x"].astype(np.int64), "BIN_Y": rows["bin_y"].astype(np.int64)})
+        for column, zones in zip(ZONE_COLUMNS, self.zones):
+            aggregate[column] = zones[rows["zone"]]
+        aggregate["ATTEMPTS"] = rows["attempts"].astype(np.int64)
+        aggregate["MADE"] = rows["made"].astype(np.int64)
+        aggregate["FIRST_SEEN"] = rows["first_seen"].astype(np.int64)
+        return aggregate
+
+    def shotchart(self, player_id, league_average_data, number_of_markers="medium", bin_shape=CUBE_BIN_SHAPE,
+                  **kwargs):
+        """
+        Creates Shotchart for player which is drawn straight from the cube.
+
+        :param player_id: Id of the player.
+        :param league_average_data: League averages data frame or LeagueAverageLookup.
+        :param number_of_markers: Whether there will be small, medium or large number of markers.
+        :param bin_shape: Shape of bins, only square bins are stored in the cube.
+        :param kwargs: Other arguments of Shotchart constructor.
+        :return: Shotchart object
+        """
+        if bin_shape != CUBE_BIN_SHAPE:
+            raise ValueError('Cube has only ' + CUBE_BIN_SHAPE + ' bins, not ' + str(bin_shape))
+        from nba_shotcharts.shotcharts.shotchart import Shotchart
+
+        bin_number_x = NUMBER_OF_MARKERS.get(number_of_markers, NUMBER_OF_MARKERS["medium"])
+        return Shotchart(shotchart_data=None, league_average_data=league_average_data,
+                         number_of_markers=number_of_markers, bin_shape=bin_shape,
+                         bin_aggregate=self.aggregate(player_id, bin_number_x), **kwargs)
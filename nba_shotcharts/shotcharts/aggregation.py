@@ -0,0 +1,80 @@
+import pandas as pd
+
+from nba_shotcharts.shotcharts.accumulator import BinAccumulator
+from nba_shotcharts.shotcharts.compact import CompactShotTable
+from nba_shotcharts.shotcharts.streaming import STREAM_COLUMNS
+
+# Number of shots which are encoded and counted at once
+DEFAULT_TASK_SIZE = 250000
+
+
+def _shot_tasks(shots, columns, task_size):
+    """
+    Splits shots into frames of about task_size rows with only the columns needed for binning, order of shots is
+    kept. Small frames (e.g. one per player) are joined, so they aren't encoded and counted one by one.
+    """
+    frames = [shots] if isinstance(shots, pd.DataFrame) else shots
+    pending, pending_rows = [], 0
+    for frame in frames:
+        frame = frame[columns]
+        for start in range(0, len(frame), task_size):
+            part = frame.iloc[start:start + task_size]
+            pending.append(part)
+            pending_rows += len(part)
+            if pending_rows >= task_size:
+                yield pd.concat(pending, ignore_index=True) if len(pending) > 1 else part
+                pending, pending_rows = [], 0
+    if pending:
+        yield pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+
+
+def aggregate_shots(shots, number_of_markers="medium", task_size=DEFAULT_TASK_SIZE):
+    """
+    Counts shots of many players (a team, a lineup or the whole league) per bin and zone. Shots are encoded to
+    CompactShotTable in tasks, so they are counted by integer keys instead of strings, and the counters are merged,
+    the result is the same as if all shots were binned together.
+
+    :param shots: Data frame with shots or iterable of data frames (e.g. one per player).
+    :param number_of_markers: Whether there will be small, medium or large number of markers.
+    :param task_size: Number of shots counted at once.
+    :return: BinAccumulator
+    """
+    accumulators = [BinAccumulator(number_of_markers).add(CompactShotTable.from_frame(task))
+                    for task in _shot_tasks(shots, STREAM_COLUMNS, task_size)]
+    return BinAccumulator.combine(accumulators, number_of_markers)
+
+
+def aggregate_groups(shots, group_by, number_of_markers="medium", task_size=DEFAULT_TASK_SIZE):
+    """
+    Counts shots per bin and zone separately for every group, e.g. per player, team or split. Counters of groups can
+    be compared with each other or combined with BinAccumulator.combine.
+
+    :param shots: Data frame with shots or iterable of data frames, they must have group_by column.
+    :param group_by: Column or list of columns by which shots are grouped.
+    :param number_of_markers: Whether there will be small, medium or large number of markers.
+    :param task_size: Number of shots counted at once.
+    :return: Dictionary which maps group key to BinAccumulator, in order in which groups first appear.
+    """
+    group_columns = [group_by] if isinstance(group_by, str) else list(group_by)
+    parts = {}
+    for task in _shot_tasks(shots, STREAM_COLUMNS + group_columns, task_size):
+        table = CompactShotTable.from_frame(task[STREAM_COLUMNS])
+        for key, rows in task.groupby(group_by, sort=False).indices.items():
+            parts.setdefault(key, []).append(BinAccumulator(number_of_markers).add(table.take(rows)))
+    # Groups whose shots were all in one task don't need merging
+    return {key: accumulators[0] if len(accumulators) == 1 else BinAccumulator.combine(accumulators)
+            for key, accumulators in parts.items()}
+
+
+def aggregate_shotchart(shots, league_average_data, number_of_markers="medium", task_size=DEFAULT_TASK_SIZE,
+                        **kwargs):
+    """
+    Creates Shotchart for shots of many players, drawn from merged counters, see aggregate_shots.
+
+    :param shots: Data frame with shots or iterable of data frames.
+    :param league_average_data: League averages data frame or LeagueAverageLookup.
+    :param kwargs: Other arguments of Shotchart constructor.
+    :return: Shotchart object
+    """
+    accumulator = aggregate_shots(shots, number_of_markers, task_size)
+    return accumulator.shotchart(league_average_data, **kwargs)
@@ -0,0 +1,128 @@
+import asyncio
+from typing import Optional
+
+import pandas as pd
+from nba_api.stats.endpoints.shotchartdetail import ShotChartDetail
+from nba_api.stats.library.http import NBAStatsHTTP, STATS_HEADERS
+
+from nba_shotcharts.shotcharts.cache import CacheMissError
+from nba_shotcharts.shotcharts.data_retriever import DataRetrieverFactory
+from nba_shotcharts.utils.data_constants import CURRENT_SEASON
+
+
+class AsyncDataRetriever:
+
+    def __init__(self, base_url=NBAStatsHTTP.base_url, timeout=30, limit=10, headers=None, cache=None):
+        """
+        Asynchronous counterpart of DataRetrieverFactory for asyncio servers. Requests share one aiohttp session, so
+        connections are pooled and kept alive, and concurrent requests for the same player and season share one
+        fetch. It must be used as async context manager or closed with close().
+
+        :param base_url: URL of stats endpoints with {endpoint} placeholder.
+        :param timeout: Timeout of one request in seconds, asyncio.TimeoutError is raised when it passes.
+        :param limit: Maximal number of open connections.
+        :param headers: HTTP headers of requests, defaults to headers which nba_api uses.
+        :param cache: ShotchartCache object, data is served from it when possible and stored into it after fetching.
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limit = limit
+        self.headers = STATS_HEADERS if headers is None else headers
+        self.cache = cache
+        self.session = None
+        # Fetches which are in progress, by (player_id, season, context_measure)
+        self.in_flight = {}
+        self.requests_sent = 0
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def open(self):
+        import aiohttp
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.headers
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _request(self, player_id, season, context_measure):
+        """
+        Sends the same request as ShotChartDetail and parses its result sets.
+
+        :return: Tuple of data frames (dataset, league_averages)
+        """
+        await self.open()
+        parameters = ShotChartDetail(team_id=0, player_id=player_id, season_nullable=season,
+                                     context_measure_simple=context_measure, get_request=False).parameters
+        parameters = {key: "" if value is None else str(value) for key, value in parameters.items()}
+        self.requests_sent += 1
+        url = self.base_url.format(endpoint=ShotChartDetail.endpoint)
+        async with self.session.get(url, params=parameters) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+        result_sets = data["resultSets"]
+        return tuple(pd.DataFrame(result["rowSet"], columns=result["headers"]) for result in result_sets[:2])
+
+    async def _fetch(self, player_id, season, context_measure):
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, player_id, season, context_measure)
+            if cached is not None:
+                return cached
+            if self.cache.offline:
+                raise CacheMissError('No cached data for player {} in season {}'.format(player_id, season))
+        dataset, league_averages = await self._request(player_id, season, context_measure)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, player_id, season, context_measure, dataset, league_averages)
+        return dataset, league_averages
+
+    async def get_data_frames(self, player_id, season: str = CURRENT_SEASON, context_measure: str = 'FGA'):
+        """
+        Retrieves raw shotchart detailed data and league averages. If the same data is already being fetched, the
+        caller waits for that fetch instead of sending another request.
+
+        :return: Tuple of data frames (dataset, league_averages)
+        """
+        key = (int(player_id), season, context_measure)
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(player_id, season, context_measure))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # Cancelling one caller doesn't cancel the fetch which other callers wait for
+        return await asyncio.shield(task)
+
+    async def get_shotchart_league_averages(
+            self,
+            player_name: str,
+            season: str = CURRENT_SEASON,
+            team_id: Optional[str] = None,
+            context_measure: str = 'FGA'
+    ):
+        """
+        Retrieves shotchart detailed data and league averages for each specific zones.
+
+        :param player_name: Player's full name whose shotchart will be retrieved.
+
+        :param season: Season for which the data will be retrieved
+
+        :param team_id: Team id which is used only if multiple players are found
+
+        :param context_measure: Context measure of the shotchart detail request.
+
+        :return: Tuple of data frames (dataset, league_averages), dataset is filtered as in DataRetrieverFactory
+        """
+        # Lookup of the player can build the player index or request team rosters, so it doesn't block the loop
+        player = await asyncio.to_thread(DataRetrieverFactory.find_player, player_name, team_id, season)
+        dataset, league_averages = await self.get_data_frames(player['id'], season, context_measure)
+        return DataRetrieverFactory.filter_dataset(dataset), league_averages
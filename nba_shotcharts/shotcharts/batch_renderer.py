@@ -0,0 +1,186 @@
+"""
+Headless rendering of many shotcharts in a pool of processes.
+
+Shotcharts for players and seasons can be rendered from command line with:
+
+    python -m nba_shotcharts.shotcharts.batch_renderer --players "Russell Westbrook" --seasons 2017-18 --output charts
+"""
+import argparse
+import logging
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import matplotlib
+
+logger = logging.getLogger(__name__)
+
+# Job for rendering one shotchart, options are passed to Shotchart constructor. Shotchart data can be a
+# SharedSelection of a dataset published to shared memory, then league averages default to the shared ones.
+RenderJob = namedtuple("RenderJob", ["name", "title", "shotchart_data", "league_average_data", "options"])
+RenderJob.__new__.__defaults__ = (None,)
+
+# Summary of one batch run
+BatchReport = namedtuple("BatchReport", ["rendered", "failed", "seconds", "charts_per_second", "errors"])
+
+
+def _init_worker():
+    # Workers never show anything, so the non interactive backend is used
+    matplotlib.use("Agg")
+
+
+def render_job(job, output_directory, formats=("png",), use_court_template=False):
+    """
+    Renders one job and writes an image for every format into output directory.
+
+    :param job: RenderJob object.
+    :param output_directory: Directory in which images are written.
+    :param formats: Formats of images, e.g. png and svg.
+    :param use_court_template: If True, PNG images are composited on top of cached court template.
+    :return: List of paths of written images.
+    """
+    from nba_shotcharts.shotcharts.shared_data import SharedSelection
+    from nba_shotcharts.shotcharts.shotchart import Shotchart
+
+    options = dict(job.options or {})
+    options.setdefault("should_save_image", True)
+    shotchart_data, league_average_data = job.shotchart_data, job.league_average_data
+    if isinstance(shotchart_data, SharedSelection):
+        # Rows of a dataset in shared memory, league averages default to the shared ones
+        shotchart_data, shared_league_averages = shotchart_data.resolve()
+        if league_average_data is None:
+            league_average_data = shared_league_averages
+    shotchart = Shotchart(shotchart_data=shotchart_data, league_average_data=league_average_data, **options)
+    binned_df = shotchart.binned_for_drawing()
+    paths = []
+    if use_court_template and "png" in formats:
+        path = os.path.join(output_directory, "{}.png".format(job.name))
+        with open(path, "wb") as image:
+            image.write(shotchart.render_png(job.title, binned_df))
+        paths.append(path)
+        formats = [image_format for image_format in formats if image_format != "png"]
+    if not formats:
+        return paths
+
+    figure = shotchart.create_figure(job.title, binned_df)
+    try:
+        for image_format in formats:
+            path = os.path.join(output_directory, "{}.{}".format(job.name, image_format))
+            Shotchart.save_figure(figure, path, image_format)
+            paths.append(path)
+    finally:
+        figure.clear()
+    return paths
+
+
+def _render_job_safely(job, output_directory, formats, use_court_template):
+    try:
+        return job.name, render_job(job, output_directory, formats, use_court_template), None
+    except Exception as error:
+        return job.name, [], repr(error)
+
+
+class BatchRenderer:
+
+    def __init__(self, output_directory, max_workers=None, formats=("png",), max_pending=None,
+                 use_court_template=False):
+        """
+        Renders shotcharts in a pool of processes. Figures are created without pyplot, so nothing stays in memory
+        after a chart is written.
+
+        :param output_directory: Directory in which images are written.
+        :param max_workers: Number of worker processes, defaults to the number of CPUs.
+        :param formats: Formats of images, e.g. png and svg.
+        :param max_pending: Maximum number of jobs which are submitted but not finished, so that jobs given as
+        generator aren't all loaded into memory. Defaults to twice the number of workers.
+        :param use_court_template: If True, PNG images are composited on top of court template which every worker
+        creates once per style.
+        """
+        self.output_directory = output_directory
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.formats = tuple(formats)
+        self.max_pending = max_pending or 2 * self.max_workers
+        self.use_court_template = use_court_template
+        os.makedirs(self.output_directory, exist_ok=True)
+
+    def render(self, jobs, progress=None):
+        """
+        Renders all jobs.
+
+        :param jobs: Iterable of RenderJob objects.
+        :param progress: Function which is called with (name, paths, error) after each job.
+        :return: BatchReport object.
+        """
+        start = time.perf_counter()
+        rendered, errors = 0, {}
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker) as executor:
+            pending = set()
+            jobs = iter(jobs)
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < self.max_pending:
+                    job = next(jobs, None)
+                    if job is None:
+                        exhausted = True
+                        break
+                    pending.add(executor.submit(_render_job_safely, job, self.output_directory, self.formats,
+                                                 self.use_court_template))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, paths, error = future.result()
+                    if error is None:
+                        rendered += 1
+                    else:
+                        errors[name] = error
+                    if progress is not None:
+                        progress(name, paths, error)
+        seconds = time.perf_counter() - start
+        return BatchReport(rendered, len(errors), seconds, rendered / seconds if seconds else 0.0, errors)
+
+
+def _file_name(text):
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", text).strip("_")
+
+
+def retrieved_jobs(players, seasons, options=None, **retriever_options):
+    """
+    Creates render jobs for every combination of players and seasons by retrieving their data with BulkRetriever.
+
+    :param players: Iterable of player ids or full names.
+    :param seasons: Iterable of seasons.
+    :param options: Options passed to Shotchart constructor.
+    :param retriever_options: Arguments for BulkRetriever.
+    :return: Generator of RenderJob objects.
+    """
+    from nba_shotcharts.shotcharts.bulk_retriever import BulkRetriever
+
+    for result in BulkRetriever(**retriever_options).retrieve(players, seasons):
+        if result.error is not None:
+            logger.warning("Skipping %s %s: %s", result.player, result.season, result.error)
+            continue
+        name = _file_name("{}_{}".format(result.player, result.season))
+        title = "{} Shotchart for {}".format(result.player, result.season)
+        yield RenderJob(name, title, result.dataset, result.league_averages, options)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", nargs="+", required=True, help="Player ids or full names.")
+    parser.add_argument("--seasons", nargs="+", required=True, help="Seasons in format YYYY-YY.")
+    parser.add_argument("--output", required=True, help="Directory in which images are written.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of rendering processes.")
+    parser.add_argument("--formats", nargs="+", default=["png"], help="Formats of images (png, svg).")
+    parser.add_argument("--image-size", default="medium", help="Size of image, can be small, medium and large.")
+    parser.add_argument("--court-template", action="store_true", help="Composite PNG images on cached court.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    renderer = BatchRenderer(args.output, max_workers=args.workers, formats=args.formats,
+                             use_court_template=args.court_template)
+    report = renderer.render(retrieved_jobs(args.players, args.seasons, options={"image_size": args.image_size}))
+    print("Rendered {} charts in {:.1f}s ({:.2f} charts per second), {} failed".format(
+        report.rendered, report.seconds, report.charts_per_second, report.failed))
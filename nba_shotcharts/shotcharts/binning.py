@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.instrumentation import measure_stage
+
+ZONE_COLUMNS = ["SHOT_ZONE_BASIC", "SHOT_ZONE_AREA", "SHOT_ZONE_RANGE"]
+BIN_COLUMNS = ["BIN_X", "BIN_Y"]
+RESTRICTED_AREA = "Restricted Area"
+BACK_COURT = "Back Court(BC)"
+MAX_SHOT_Y = 300  # Shots further from the baseline aren't drawn
+
+COURT_WIDTH = 500.0  # Width of the area that will be binned
+COURT_HEIGHT = 470.0  # Height of the area that will be binned, these numbers are equivalent to plot range
+NORM_X = 250  # Shots can go left and right of basket at most to -250 and +250
+NORM_Y = 48.5  # Minimal range of shots is -48.5
+# Number of bins on x axis for each number of markers
+NUMBER_OF_MARKERS = {"small": 20.0, "medium": 30.0, "large": 40.0}
+# Policies for scaling counts of shots to marker sizes, see scale_marker_sizes
+MARKER_SCALING = ("linear", "sqrt", "log", "percentile")
+# Percentile of counts out of restricted area which gets the biggest marker with percentile scaling
+PERCENTILE_CAP = 95
+# Comparison with league average (in percentage points) is clipped to this range, charts use it as their color scale
+COMPARISON_RANGE = (-10, 10)
+
+
+def filter_shots(dataset):
+    """
+    Flips the x coordinates of shots as returned by ShotChartDetail and drops shots that aren't close to the basket.
+    """
+    dataset = dataset.copy()
+    dataset.LOC_X = -dataset.LOC_X  # REAL DATA IS FLIPPED
+    return dataset.loc[(dataset.SHOT_ZONE_AREA != BACK_COURT) & (dataset.LOC_Y < MAX_SHOT_Y)]
+
+
+def bin_number_y_for(bin_number_x, width=COURT_WIDTH, height=COURT_HEIGHT):
+    """
+    Number of bins on y axis, bins are squares so it depends on the number of bins on x axis.
+    """
+    return height / (width / bin_number_x)
+
+
+def compute_bin_indices(loc_x, loc_y, bin_number_x, bin_number_y, width, height, norm_x, norm_y):
+    """
+    Maps shot locations to bin indices. Indices are computed with the same float operations that were previously
+    done per shot, so the resulting bins are exactly the same.
+
+    :param loc_x: Array of x coordinates of shots.
+    :param loc_y: Array of y coordinates of shots.
+    :param bin_number_x: Number of bins on x axis.
+    :param bin_number_y: Number of bins on y axis.
+    :param width: Width of the area that is binned.
+    :param height: Height of the area that is binned.
+    :param norm_x: Value which is added to x coordinates so that minimum is zero.
+    :param norm_y: Value which is added to y coordinates so that minimum is zero.
+    :return: Tuple of integer arrays (x_bins, y_bins)
+    """
+    x_shot = np.asarray(loc_x) + norm_x
+    y_shot = np.asarray(loc_y) + norm_y
+    # int() truncates towards zero, np.trunc does the same
+    x_bins = np.trunc((x_shot / float(width)) * bin_number_x).astype(np.int64)
+    y_bins = np.trunc((y_shot / float(height)) * bin_number_y).astype(np.int64)
+    return x_bins, y_bins
+
+
+def aggregate_bin_zones(x_bins, y_bins, shots):
+    """
+    Counts attempts and made shots for each (bin, zone) pair. Along with counts, the position of the first shot
+    for each pair is stored, which is used to resolve ties when dominant zone of a bin is searched.
+
+    :param x_bins: Array of x bin indices, one per shot.
+    :param y_bins: Array of y bin indices, one per shot.
+    :param shots: Data frame with SHOT_MADE_FLAG and zone columns, in the same order as bin indices.
+    :return: Data frame with BIN_X, BIN_Y, zone columns, ATTEMPTS, MADE and FIRST_SEEN columns.
+    """
+    table = pd.DataFrame({"BIN_X": x_bins, "BIN_Y": y_bins})
+    for column in ZONE_COLUMNS:
+        table[column] = shots[column].to_numpy()
+    table["MADE"] = shots.SHOT_MADE_FLAG.to_numpy().astype(np.int64)
+    table["FIRST_SEEN"] = np.arange(len(table), dtype=np.int64)
+    aggregate = table.groupby(BIN_COLUMNS + ZONE_COLUMNS, sort=False, dropna=False).agg(
+        ATTEMPTS=("MADE", "size"),
+        MADE=("MADE", "sum"),
+        FIRST_SEEN=("FIRST_SEEN", "min")
+    ).reset_index()
+    aggregate["ATTEMPTS"] = aggregate.ATTEMPTS.astype(np.int64)
+    return aggregate
+
+
+def max_size_for_bins(width, height, bin_number_x, bin_number_y):
+    """
+    Maximum size of an element in one bin.
+    """
+    bin_size_x = float(width) / float(bin_number_x)
+    bin_size_y = float(height) / float(bin_number_y)
+    return int((int(bin_size_x) - 1) * (int(bin_size_y) - 1))
+
+
+def scale_marker_sizes(counts, in_restricted, max_size, policy="linear", percentile=PERCENTILE_CAP):
+    """
+    Scales counts of shots per bin to marker sizes. Counts are capped at the largest count out of restricted area,
+    because players usually have a lot more shots in restricted area. If all bins are in restricted area, the
+    largest count is used.
+
+    :param counts: Array of counts of shots, one per bin.
+    :param in_restricted: Boolean array, True for bins with shots from restricted area.
+    :param max_size: Size of marker of the biggest bin.
+    :param policy: linear, sqrt or log scaling of capped counts, or percentile which is linear, but counts are capped
+    at the given percentile of counts out of restricted area, so a few hot spots don't shrink all other markers.
+    :param percentile: Percentile used by percentile policy.
+    :return: Array of marker sizes
+    """
+    if policy not in MARKER_SCALING:
+        raise ValueError('Invalid marker scaling: ' + str(policy))
+    counts = np.asarray(counts, dtype=np.float64)
+    if len(counts) == 0:
+        return counts
+    non_restricted = counts[~np.asarray(in_restricted, dtype=bool)]
+    reference = non_restricted if len(non_restricted) else counts
+    if policy == "percentile":
+        cap = float(np.percentile(reference, percentile))
+    else:
+        cap = float(reference.max())
+    value_to_scale = np.minimum(counts, cap)
+    if policy == "sqrt":
+        return np.sqrt(value_to_scale / cap) * max_size
+    if policy == "log":
+        return np.log1p(value_to_scale) / np.log1p(cap) * max_size
+    return (value_to_scale / cap) * max_size
+
+
+def compute_bin_statistics(aggregate, league_average, bin_number_x, bin_number_y, width, height, norm_x, norm_y,
+                           grid=None, marker_scaling="linear", instrumentation=None):
+    """
+    Calculates statistics for each bin out of (bin, zone) aggregate. Each bin gets its binned location, shooting
+    percentage, dominant zone with its percentage and comparison with league average and scaled count of shots.
+
+    :param aggregate: Data frame returned by aggregate_bin_zones.
+    :param league_average: LeagueAverageLookup with league averages per zone, can be None.
+    :param bin_number_x: Number of bins on x axis.
+    :param bin_number_y: Number of bins on y axis.
+    :param width: Width of the area that is binned.
+    :param height: Height of the area that is binned.
+    :param norm_x: Value which was added to x coordinates when binning.
+    :param norm_y: Value which was added to y coordinates when binning.
+    :param grid: BinGrid with which shots were binned, if given its bin centers and marker size are used.
+    :param marker_scaling: Policy for scaling counts of shots to marker sizes, see scale_marker_sizes.
+    :param instrumentation: Instrumentation which measures matching of bins with league averages, can be None.
+    :return: Data frame with one row per bin.
+    """
+    bins = aggregate.groupby(BIN_COLUMNS, sort=False).agg(
+        ATTEMPTS=("ATTEMPTS", "sum"),
+        MADE=("MADE", "sum")
+    )
+    restricted = aggregate.SHOT_ZONE_BASIC == RESTRICTED_AREA
+    bins["IN_RESTRICTED"] = restricted.groupby([aggregate.BIN_X, aggregate.BIN_Y], sort=False).any()
+
+    # Dominant zone is the one with most shots in bin, ties are resolved with the zone which appeared first
+    dominant = aggregate.sort_values(["ATTEMPTS", "FIRST_SEEN"], ascending=[False, True], kind="mergesort")
+    dominant = dominant.drop_duplicates(subset=BIN_COLUMNS, keep="first").set_index(BIN_COLUMNS)
+    bins = bins.join(dominant[ZONE_COLUMNS]).reset_index()
+
+    zones = aggregate.groupby(ZONE_COLUMNS, sort=False, dropna=False).agg(
+        ZONE_ATTEMPTS=("ATTEMPTS", "sum"),
+        ZONE_MADE=("MADE", "sum")
+    ).reset_index()
+    bins = bins.merge(zones, on=ZONE_COLUMNS, how="left")
+
+    counts = bins.ATTEMPTS.to_numpy(dtype=np.int64)
+    shot_percent = bins.MADE.to_numpy(dtype=np.float64) / counts
+    zone_percent = bins.ZONE_MADE.to_numpy(dtype=np.float64) / bins.ZONE_ATTEMPTS.to_numpy(dtype=np.float64)
+
+    x_bin = bins.BIN_X.to_numpy()
+    y_bin = bins.BIN_Y.to_numpy()
+    if grid is not None:
+        bins["BIN_LOC_X"], bins["BIN_LOC_Y"] = grid.centers(x_bin, y_bin)
+    else:
+        # Middle of current and next bin is where we will place the marker in real coordinates
+        bins["BIN_LOC_X"] = ((x_bin * float(width)) / bin_number_x + ((x_bin + 1) * float(width)) / bin_number_x) \
+            / 2 - norm_x
+        bins["BIN_LOC_Y"] = ((y_bin * float(height)) / bin_number_y + ((y_bin + 1) * float(height)) / bin_number_y) \
+            / 2 - norm_y
+
+    if league_average is not None:
+        with measure_stage(instrumentation, "league_average_lookup", len(bins)):
+            avg_percentage = league_average.lookup(bins.SHOT_ZONE_BASIC, bins.SHOT_ZONE_AREA, bins.SHOT_ZONE_RANGE)
+        # Comparison of league average and each bin
+        bins["PCT_LEAGUE_AVG_COMPARISON"] = np.clip((shot_percent - avg_percentage) * 100, *COMPARISON_RANGE)
+        # Comparison of zone and league average
+        bins["PCT_LEAGUE_COMPARISON_ZONE"] = np.clip((zone_percent - avg_percentage) * 100, *COMPARISON_RANGE)
+
+    bins["LOC_PERCENTAGE"] = shot_percent * 100
+    bins["LOC_ZONE_PERCENTAGE"] = np.clip(zone_percent * 100, 35, 65)
+
+    max_size = grid.max_size if grid is not None else max_size_for_bins(width, height, bin_number_x, bin_number_y)
+    bins["LOC_COUNTS"] = scale_marker_sizes(counts, bins.IN_RESTRICTED.to_numpy(), max_size, marker_scaling)
+    bins["LOC_RAW_COUNTS"] = counts
+    return bins
+
+
+def bin_indexer(bins, x_bins, y_bins):
+    """
+    Positions of shots' bins in per bin data frame.
+
+    :param bins: Data frame with BIN_X and BIN_Y columns, one row per bin.
+    :param x_bins: Array of x bin indices, one per shot.
+    :param y_bins: Array of y bin indices, one per shot.
+    :return: Integer array which can be used to take per bin values for each shot.
+    """
+    bin_index = pd.MultiIndex.from_arrays([bins.BIN_X.to_numpy(), bins.BIN_Y.to_numpy()])
+    return bin_index.get_indexer(pd.MultiIndex.from_arrays([x_bins, y_bins]))
@@ -0,0 +1,122 @@
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from nba_api.stats.endpoints.shotchartdetail import ShotChartDetail
+from nba_shotcharts.shotcharts.cache import CacheMissError
+from nba_shotcharts.shotcharts.data_retriever import DataRetrieverFactory
+
+# Result of one (player, season) request, error is set if all retries failed
+BulkResult = namedtuple("BulkResult", ["player", "player_id", "season", "dataset", "league_averages", "error"])
+
+
+class RateLimiter:
+
+    def __init__(self, min_interval, clock=time.monotonic, sleep=time.sleep):
+        """
+        Limits how often requests can be started, shared between all worker threads.
+
+        :param min_interval: Minimal time in seconds between the start of two requests.
+        """
+        self.min_interval = min_interval
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            self.sleep(start - now)
+
+
+class BulkRetriever:
+
+    def __init__(self, max_workers=4, min_interval=0.6, retries=3, backoff=1.0, context_measure='FGA', cache=None,
+                 endpoint=ShotChartDetail, sleep=time.sleep):
+        """
+        Retrieves shotcharts for many players and seasons concurrently with bounded pool of worker threads.
+
+        :param max_workers: Maximum number of requests which run at the same time.
+        :param min_interval: Minimal time in seconds between the start of two requests.
+        :param retries: Number of retries of failed request.
+        :param backoff: Base of exponential backoff in seconds, n-th retry waits backoff * 2 ** n with some jitter.
+        :param context_measure: Context measure of the shotchart detail request.
+        :param cache: ShotchartCache object which is used by each request.
+        :param endpoint: Class with the same interface as ShotChartDetail which is used for fetching.
+        :param sleep: Function used for waiting.
+        """
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.context_measure = context_measure
+        self.cache = cache
+        self.endpoint = endpoint
+        self.sleep = sleep
+        self.rate_limiter = RateLimiter(min_interval, sleep=sleep)
+        self._league_averages = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resolve_player_id(player):
+        """
+        Players can be given with their ids or full names.
+        """
+        if isinstance(player, int) or (isinstance(player, str) and player.isdigit()):
+            return int(player)
+        return DataRetrieverFactory.find_player(player)['id']
+
+    def _shared_league_averages(self, season, league_averages):
+        # League averages are the same for every player in season, so only the first frame is kept
+        with self._lock:
+            return self._league_averages.setdefault(season, league_averages)
+
+    def _fetch(self, player, season):
+        player_id = None
+        for attempt in range(self.retries + 1):
+            try:
+                if player_id is None:
+                    try:
+                        player_id = self.resolve_player_id(player)
+                    except ValueError as error:
+                        # Invalid player name, retrying won't help
+                        return BulkResult(player, player_id, season, None, None, error)
+                self.rate_limiter.wait()
+                dataset, league_averages = DataRetrieverFactory.get_data_frames(
+                    player_id, season, self.context_measure, cache=self.cache, endpoint=self.endpoint
+                )
+                return BulkResult(player, player_id, season, DataRetrieverFactory.filter_dataset(dataset),
+                                  self._shared_league_averages(season, league_averages), None)
+            except CacheMissError as error:
+                # Missing data in offline mode, retrying won't help
+                return BulkResult(player, player_id, season, None, None, error)
+            except Exception as error:
+                # Endpoint errors, including malformed JSON of truncated or rate limited responses, are retried
+                if attempt == self.retries:
+                    return BulkResult(player, player_id, season, None, None, error)
+                self.sleep(self.backoff * 2 ** attempt * (1 + random.random() * 0.1))
+
+    def retrieve(self, players, seasons):
+        """
+        Retrieves shotcharts for every combination of given players and seasons. Results are yielded as soon as
+        each request is completed.
+
+        :param players: Iterable of player ids or full names.
+        :param seasons: Iterable of seasons.
+        :return: Generator of BulkResult objects.
+        """
+        seasons = list(seasons)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._fetch, player, season) for player in players for season in seasons]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # If the consumer stops early, requests which haven't started yet are dropped
+                for future in futures:
+                    future.cancel()
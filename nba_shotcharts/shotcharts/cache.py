@@ -0,0 +1,149 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+import pandas as pd
+
+from nba_shotcharts.utils.data_constants import CURRENT_SEASON
+
+SHOTS_FILE = "shots.parquet"
+LEAGUE_AVERAGES_FILE = "league_averages.parquet"
+META_FILE = "meta.json"
+
+
+class CacheMissError(LookupError):
+    """
+    Raised when cache is in offline mode and requested data isn't cached.
+    """
+
+
+class ShotchartCache:
+
+    def __init__(
+            self,
+            directory: str,
+            current_season: str = CURRENT_SEASON,
+            current_season_ttl: float = 12 * 60 * 60,
+            max_size_bytes: Optional[int] = None,
+            offline: bool = False,
+            clock=time.time
+    ):
+        """
+        On disk cache for data frames returned by ShotChartDetail. Each entry is keyed by (player_id, season,
+        context_measure) and both frames are stored as Parquet files in a separate directory.
+
+        :param directory: Directory in which the data is cached.
+        :param current_season: Season which is still in progress, entries of finished seasons never expire.
+        :param current_season_ttl: Time in seconds after which entries of current season expire.
+        :param max_size_bytes: Maximum size of the cache, least recently used entries are removed above it.
+        :param offline: If set to True, data is served only from cache and nothing is fetched.
+        :param clock: Function which returns current time in seconds.
+        """
+        self.directory = directory
+        self.current_season = current_season
+        self.current_season_ttl = current_season_ttl
+        self.max_size_bytes = max_size_bytes
+        self.offline = offline
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _entry_path(self, player_id, season, context_measure):
+        return os.path.join(self.directory, "{}_{}_{}".format(player_id, season, context_measure))
+
+    def is_season_finished(self, season):
+        """
+        Seasons are in format YYYY-YY, so the ones which are finished are lexicographically smaller than current.
+        """
+        return season < self.current_season
+
+    def _is_expired(self, meta):
+        if self.is_season_finished(meta["season"]):
+            return False
+        return self.clock() - meta["created"] > self.current_season_ttl
+
+    def get(self, player_id, season, context_measure="FGA"):
+        """
+        Retrieves cached data frames.
+
+        :return: Tuple (dataset, league_averages) or None if entry isn't cached or it is expired.
+        """
+        path = self._entry_path(player_id, season, context_measure)
+        meta_path = os.path.join(path, META_FILE)
+        try:
+            with open(meta_path) as meta_file:
+                meta = json.load(meta_file)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if self._is_expired(meta) and not self.offline:
+            self.misses += 1
+            return None
+        dataset = pd.read_parquet(os.path.join(path, SHOTS_FILE))
+        league_averages = pd.read_parquet(os.path.join(path, LEAGUE_AVERAGES_FILE))
+        # Modification time of meta file is used as the last access time for LRU eviction
+        now = self.clock()
+        os.utime(meta_path, (now, now))
+        self.hits += 1
+        return dataset, league_averages
+
+    def put(self, player_id, season, context_measure, dataset, league_averages):
+        """
+        Stores data frames into cache and evicts least recently used entries if the cache is too large.
+        """
+        path = self._entry_path(player_id, season, context_measure)
+        # Files are written into temporary directory first, so readers never see incomplete entry
+        temporary = tempfile.mkdtemp(dir=self.directory, prefix=".tmp_")
+        dataset.to_parquet(os.path.join(temporary, SHOTS_FILE), index=False)
+        league_averages.to_parquet(os.path.join(temporary, LEAGUE_AVERAGES_FILE), index=False)
+        now = self.clock()
+        meta_path = os.path.join(temporary, META_FILE)
+        with open(meta_path, "w") as meta_file:
+            json.dump({"player_id": player_id, "season": season, "context_measure": context_measure,
+                       "created": now}, meta_file)
+        os.utime(meta_path, (now, now))
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.rename(temporary, path)
+        self.evict()
+
+    def entries(self):
+        """
+        Lists cached entries.
+
+        :return: List of tuples (path, size_in_bytes, last_access)
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            meta_path = os.path.join(path, META_FILE)
+            if name.startswith(".") or not os.path.exists(meta_path):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, file_name)) for file_name in os.listdir(path))
+            entries.append((path, size, os.path.getmtime(meta_path)))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        Removes least recently used entries until the size of cache is under max_size_bytes.
+        """
+        if self.max_size_bytes is None:
+            return
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_size_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
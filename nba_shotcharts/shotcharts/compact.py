@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.binning import compute_bin_indices, ZONE_COLUMNS
+from nba_shotcharts.utils.shotchart_constants import SHOT_TYPES, SHOT_ZONE_BASIC, SHOT_ZONE_AREAS, SHOT_ZONE_RANGES
+
+# Fixed vocabularies of coded columns and the type of their codes
+CODED_COLUMNS = {
+    "SHOT_ZONE_BASIC": (SHOT_ZONE_BASIC, np.int8),
+    "SHOT_ZONE_AREA": (SHOT_ZONE_AREAS, np.int8),
+    "SHOT_ZONE_RANGE": (SHOT_ZONE_RANGES, np.int8),
+    "ACTION_TYPE": (SHOT_TYPES, np.int16)
+}
+
+
+def extend_vocabulary(vocabulary, values):
+    """
+    Appends values which aren't in vocabulary to its end, so codes of known values never change. Missing values get
+    one NaN entry, so they have their own code like any other value.
+    """
+    vocabulary = list(vocabulary)
+    known = set(value for value in vocabulary if not pd.isna(value))
+    has_missing = any(pd.isna(value) for value in vocabulary)
+    for value in pd.unique(np.asarray(values, dtype=object)):
+        if pd.isna(value):
+            if not has_missing:
+                vocabulary.append(np.nan)
+                has_missing = True
+        elif value not in known:
+            vocabulary.append(value)
+            known.add(value)
+    return vocabulary
+
+
+def encode(vocabulary, values):
+    """
+    Codes of values in vocabulary returned by extend_vocabulary, all missing values get the code of its NaN entry.
+    """
+    codes = pd.Index(vocabulary, dtype=object).get_indexer(values)
+    missing = pd.isna(values)
+    if missing.any():
+        codes[missing] = next(index for index, value in enumerate(vocabulary) if pd.isna(value))
+    return codes
+
+
+class CompactShotTable:
+
+    def __init__(self, columns, vocabularies):
+        """
+        Shots stored as numpy arrays of small types: int16 coordinates, bool made flag and integer codes of zone and
+        action type columns. It takes several times less memory than the data frame with string columns and shots
+        are grouped by integer keys instead of strings.
+
+        :param columns: Dictionary of numpy arrays, all of the same length.
+        :param vocabularies: Dictionary of lists which map codes of coded columns to their values.
+        """
+        self.columns = columns
+        self.vocabularies = vocabularies
+
+    @staticmethod
+    def from_frame(shots, vocabularies=None):
+        """
+        Encodes data frame with shots.
+
+        :param shots: Data frame with LOC_X, LOC_Y, SHOT_MADE_FLAG, zone columns and optionally ACTION_TYPE and
+        PLAYER_ID columns.
+        :param vocabularies: Vocabularies of another table, given so that codes of both tables are the same.
+        :return: CompactShotTable object
+        """
+        columns = {
+            "LOC_X": shots.LOC_X.to_numpy().astype(np.int16),
+            "LOC_Y": shots.LOC_Y.to_numpy().astype(np.int16),
+            "SHOT_MADE_FLAG": shots.SHOT_MADE_FLAG.to_numpy().astype(bool)
+        }
+        if "PLAYER_ID" in shots:
+            columns["PLAYER_ID"] = shots.PLAYER_ID.to_numpy().astype(np.int32)
+        vocabularies = dict(vocabularies or {})
+        for column, (enumeration, code_type) in CODED_COLUMNS.items():
+            if column not in shots:
+                continue
+            # Only distinct values are looked up in the vocabulary, shots get their codes through factorized codes
+            value_codes, values = pd.factorize(shots[column], use_na_sentinel=False)
+            values = np.asarray(values, dtype=object)
+            vocabulary = extend_vocabulary(vocabularies.get(column, enumeration), values)
+            vocabularies[column] = vocabulary
+            columns[column] = encode(vocabulary, values).astype(code_type)[value_codes]
+        return CompactShotTable(columns, vocabularies)
+
+    def __len__(self):
+        return len(self.columns["LOC_X"])
+
+    def memory_usage(self):
+        """
+        Number of bytes taken by the arrays of this table.
+        """
+        return sum(array.nbytes for array in self.columns.values())
+
+    def take(self, rows):
+        """
+        New table with selected rows, rows can be a slice, boolean mask or array of positions.
+        """
+        return CompactShotTable({column: array[rows] for column, array in self.columns.items()}, self.vocabularies)
+
+    def decode(self, column, codes=None):
+        """
+        Values of coded column, for all rows or for the given codes.
+        """
+        codes = self.columns[column] if codes is None else codes
+        return np.asarray(self.vocabularies[column], dtype=object)[codes]
+
+    def to_frame(self):
+        """
+        Decodes table back to data frame.
+        """
+        frame = pd.DataFrame({column: array for column, array in self.columns.items() if column not in CODED_COLUMNS})
+        for column in CODED_COLUMNS:
+            if column in self.columns:
+                frame[column] = self.decode(column)
+        return frame
+
+    def zone_codes(self):
+        """
+        One integer per shot which identifies the combination of basic zone, area and range.
+        """
+        areas = len(self.vocabularies["SHOT_ZONE_AREA"])
+        ranges = len(self.vocabularies["SHOT_ZONE_RANGE"])
+        return (self.columns["SHOT_ZONE_BASIC"].astype(np.int64) * areas +
+                self.columns["SHOT_ZONE_AREA"]) * ranges + self.columns["SHOT_ZONE_RANGE"]
+
+    def decode_zones(self, zone_codes):
+        """
+        Splits zone codes back into basic zone, area and range values.
+
+        :return: Tuple of arrays (basic_zones, areas, ranges)
+        """
+        areas = len(self.vocabularies["SHOT_ZONE_AREA"])
+        ranges = len(self.vocabularies["SHOT_ZONE_RANGE"])
+        return (self.decode("SHOT_ZONE_BASIC", zone_codes // (areas * ranges)),
+                self.decode("SHOT_ZONE_AREA", zone_codes // ranges % areas),
+                self.decode("SHOT_ZONE_RANGE", zone_codes % ranges))
+
+    def aggregate_bins(self, bin_number_x, bin_number_y, width, height, norm_x, norm_y, grid=None):
+        """
+        Counts attempts and made shots for each (bin, zone) pair, the result is the same as aggregate_bin_zones
+        returns for the decoded data frame.
+
+        :param grid: BinGrid which maps shots to bins, if None square bins of given size are used.
+        :return: Data frame with BIN_X, BIN_Y, zone columns, ATTEMPTS, MADE and FIRST_SEEN columns.
+        """
+        if grid is not None:
+            x_bins, y_bins = grid.bin_indices(self.columns["LOC_X"], self.columns["LOC_Y"])
+        else:
+            x_bins, y_bins = compute_bin_indices(self.columns["LOC_X"], self.columns["LOC_Y"], bin_number_x,
+                                                 bin_number_y, width, height, norm_x, norm_y)
+        zone_codes = self.zone_codes()
+        if len(self) == 0:
+            x_min = y_min = 0
+            y_span = zone_span = 1
+        else:
+            x_min, y_min = x_bins.min(), y_bins.min()
+            y_span, zone_span = y_bins.max() - y_min + 1, zone_codes.max() + 1
+        keys = ((x_bins - x_min) * y_span + (y_bins - y_min)) * zone_span + zone_codes
+
+        # Groups are numbered in order of their first appearance
+        groups, uniques = pd.factorize(keys, sort=False)
+        first_seen = np.flatnonzero(~pd.Series(groups).duplicated().to_numpy())
+        attempts = np.bincount(groups, minlength=len(uniques))
+        made = np.bincount(groups, weights=self.columns["SHOT_MADE_FLAG"], minlength=len(uniques))
+
+        unique_zones = uniques % zone_span
+        basic_zones, areas, ranges = self.decode_zones(unique_zones)
+        return pd.DataFrame({
+            "BIN_X": uniques // zone_span // y_span + x_min,
+            "BIN_Y": uniques // zone_span % y_span + y_min,
+            ZONE_COLUMNS[0]: basic_zones,
+            ZONE_COLUMNS[1]: areas,
+            ZONE_COLUMNS[2]: ranges,
+            "ATTEMPTS": attempts.astype(np.int64),
+            "MADE": made.astype(np.int64),
+            "FIRST_SEEN": first_seen.astype(np.int64)
+        })
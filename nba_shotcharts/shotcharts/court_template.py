@@ -0,0 +1,174 @@
+import io
+import threading
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+from PIL import Image
+
+# Padding around the chart, same as the default padding of savefig with bbox_inches='tight'
+PAD_INCHES = 0.1
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+class CourtTemplate:
+
+    def __init__(self, shotchart):
+        """
+        Court and legends of a shotchart rasterized once, so that only the shots are drawn for each chart.
+
+        Shots are drawn between two cached layers: the background which contains court color and court lines that
+        are under the shots and the transparent foreground which contains everything that is drawn over the shots
+        (legends, texts, hoop, outer lines). Layers are split by zorder, so charts look the same as the ones that
+        are fully drawn.
+
+        :param shotchart: Shotchart object whose style is used for the template.
+        """
+        self.dpi = 80
+        self.multiplier = shotchart.multiplier
+        self.figure = Figure(figsize=(shotchart.figure_size, shotchart.figure_size), dpi=self.dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        shotchart.draw_static(self.ax)
+        self.title = self.ax.set_title("Shotchart", size=shotchart.title_font)
+        # Title changes with every chart, so only the bounding box of everything else is cached and the crop is
+        # computed for each chart from the extent of its title, see _tight_crop
+        self.title.set_visible(False)
+        self.canvas.draw()
+        self.static_bbox = self.figure.get_tightbbox(self.canvas.get_renderer())
+        self.title.set_visible(True)
+
+        self.scatter = self.ax.scatter([], [], marker=shotchart.marker, c=[], cmap=shotchart.cmap, linewidths=1.0,
+                                       animated=True)
+        self.title.set_animated(True)
+
+        # Everything that was added after shots in full drawing with the same or higher zorder is drawn over them
+        artists = [artist for artist in self.ax.get_children()
+                   if artist not in (self.scatter, self.title, self.ax.patch)]
+        over = [artist for artist in artists if artist.get_zorder() >= self.scatter.get_zorder()]
+        under = [artist for artist in artists if artist.get_zorder() < self.scatter.get_zorder()]
+
+        for artist in over:
+            artist.set_visible(False)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+        for artist in over:
+            artist.set_visible(True)
+        for artist in under + [self.figure.patch, self.ax.patch]:
+            artist.set_visible(False)
+        self.canvas.draw()
+        foreground = np.asarray(self.canvas.buffer_rgba()).astype(np.float32)
+        self.foreground_alpha = foreground[..., 3:] / 255.0
+        self.foreground = foreground[..., :3] * self.foreground_alpha
+        for artist in under + [self.figure.patch, self.ax.patch]:
+            artist.set_visible(True)
+        self.lock = threading.Lock()
+
+    def _set_title(self, title):
+        """
+        Sets the title and moves it above decorations of the axes, as it is done when the axes are drawn.
+
+        :return: Bounding box of the figure with the title in inches.
+        """
+        self.title.set_text(title)
+        axes_bbox = self.ax.get_tightbbox(self.canvas.get_renderer())
+        return Bbox.union([self.static_bbox, axes_bbox.transformed(self.figure.dpi_scale_trans.inverted())])
+
+    def _tight_crop(self, titles):
+        bbox = Bbox.union([self._set_title(title) for title in titles])
+        bbox = Bbox.from_extents(bbox.x0 - PAD_INCHES, bbox.y0 - PAD_INCHES, bbox.x1 + PAD_INCHES,
+                                 bbox.y1 + PAD_INCHES)
+        # Saved image would contain area outside of the figure, which isn't in the buffer
+        if bbox.x0 < 0 or bbox.y0 < 0 or bbox.x1 > self.figure.get_figwidth() or \
+                bbox.y1 > self.figure.get_figheight():
+            return None
+        # Size of the saved image is truncated to whole pixels at its top and right edge
+        width, height = int(bbox.width * self.dpi), int(bbox.height * self.dpi)
+        x0 = int(round(bbox.x0 * self.dpi))
+        y0 = int(self.figure.bbox.height) - int(round(bbox.y0 * self.dpi)) - height
+        return slice(y0, y0 + height), slice(x0, x0 + width)
+
+    def tight_crop(self, titles):
+        """
+        Slices of the image buffer which correspond to savefig with bbox_inches='tight' for the largest of the titles.
+        Frames of an animation are rendered with the crop of all their titles, so they have the same size.
+
+        :param titles: List of titles.
+        :return: Tuple of slices or None if some title doesn't fit on the figure.
+        """
+        with self.lock:
+            return self._tight_crop(titles)
+
+    def render(self, binned_df, title, multiplier, color_range=None, crop=None):
+        """
+        Renders shots on the template.
+
+        :param binned_df: Data frame returned by create_bins.
+        :param title: Title of the chart.
+        :param multiplier: Multiplier for markers.
+        :param color_range: Tuple (vmin, vmax) of fixed color scale, if None colors are normalized to the data.
+        :param crop: Slices returned by tight_crop, if None the image is cropped around the title.
+        :return: Numpy array with RGB image or None if the title is too large for the template.
+        """
+        with self.lock:
+            if crop is None:
+                crop = self._tight_crop([title])
+                if crop is None:
+                    return None
+            else:
+                self._set_title(title)
+            self.canvas.restore_region(self.background)
+            self.scatter.set_offsets(np.column_stack([binned_df.BIN_LOC_X, binned_df.BIN_LOC_Y]))
+            self.scatter.set_sizes(np.asarray(binned_df.LOC_COUNTS) * multiplier)
+            self.scatter.set_array(np.asarray(binned_df.PCT_LEAGUE_COMPARISON_ZONE))
+            if color_range is not None:
+                self.scatter.norm.vmin, self.scatter.norm.vmax = color_range
+            else:
+                # Colors are normalized to the range of the data, same as when scatter is created with them
+                self.scatter.norm.vmin, self.scatter.norm.vmax = None, None
+                self.scatter.autoscale()
+            self.ax.draw_artist(self.scatter)
+            self.ax.draw_artist(self.title)
+            under = np.asarray(self.canvas.buffer_rgba())[crop][..., :3].astype(np.float32)
+        image = self.foreground[crop] + under * (1.0 - self.foreground_alpha[crop])
+        return np.round(image).astype(np.uint8)
+
+    def render_png(self, binned_df, title, multiplier=None):
+        """
+        Renders shots on the template and encodes the image as PNG.
+
+        :return: PNG image as bytes or None if the title is too large for the template.
+        """
+        image = self.render(binned_df, title, self.multiplier if multiplier is None else multiplier)
+        if image is None:
+            return None
+        buffer = io.BytesIO()
+        Image.fromarray(image).save(buffer, format="png", compress_level=6)
+        return buffer.getvalue()
+
+
+def get_court_template(shotchart):
+    """
+    Retrieves court template for the style of given shotchart, the template is created only the first time.
+
+    :param shotchart: Shotchart object.
+    :return: CourtTemplate object
+    """
+    key = shotchart.style_key()
+    template = _templates.get(key)
+    if template is None:
+        with _templates_lock:
+            template = _templates.get(key)
+            if template is None:
+                template = CourtTemplate(shotchart)
+                _templates[key] = template
+    return template
+
+
+def clear_court_templates():
+    with _templates_lock:
+        _templates.clear()
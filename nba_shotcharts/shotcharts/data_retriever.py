@@ -1,17 +1,97 @@
 from typing import Optional
 
-from nba_api.stats.static import players
 from nba_api.stats.endpoints.shotchartdetail import ShotChartDetail
+from nba_shotcharts.shotcharts.binning import filter_shots
+from nba_shotcharts.shotcharts.cache import CacheMissError
+from nba_shotcharts.shotcharts.instrumentation import measure_stage
+from nba_shotcharts.shotcharts.player_index import get_player_index
 from nba_shotcharts.utils.data_constants import CURRENT_SEASON
 
 
 class DataRetrieverFactory:
 
+    @staticmethod
+    def find_player(player_name: str, team_id: Optional[str] = None, season: Optional[str] = None):
+        """
+        Finds player with given full name in the shared player index.
+
+        :param player_name: Player's full name.
+
+        :param team_id: Team id which is used only if multiple players are found
+
+        :param season: Season in which the player played for the team, used only if multiple players are found
+
+        :return: Dictionary with player's info from nba_api static players
+        """
+        return get_player_index().resolve(player_name, team_id, season)
+
+    @staticmethod
+    def get_data_frames(
+            player_id,
+            season: str = CURRENT_SEASON,
+            context_measure: str = 'FGA',
+            cache=None,
+            endpoint=ShotChartDetail,
+            instrumentation=None
+    ):
+        """
+        Retrieves raw shotchart detailed data and league averages, from cache if it is given and data is cached.
+
+        :param player_id: Id of the player.
+
+        :param season: Season for which the data will be retrieved
+
+        :param context_measure: Context measure of the shotchart detail request.
+
+        :param cache: ShotchartCache object, data is stored into it after it is fetched.
+
+        :param endpoint: Class with the same interface as ShotChartDetail which is used for fetching.
+
+        :param instrumentation: Instrumentation object which measures cache and request stages.
+
+        :return: Tuple of data frames (dataset, league_averages)
+        """
+        if cache is not None:
+            with measure_stage(instrumentation, "cache_read") as stage:
+                cached = cache.get(player_id, season, context_measure)
+                stage["rows"] = len(cached[0]) if cached is not None else 0
+            if instrumentation is not None:
+                instrumentation.count("cache_hits" if cached is not None else "cache_misses")
+            if cached is not None:
+                return cached
+            if cache.offline:
+                raise CacheMissError('No cached data for player {} in season {}'.format(player_id, season))
+
+        with measure_stage(instrumentation, "shotchart_detail") as stage:
+            shotchart_obj = endpoint(
+                team_id=0,  # not necessary for fetching shotchart data
+                player_id=player_id,
+                season_nullable=season,
+                context_measure_simple=context_measure
+            )
+            dataset, league_averages = shotchart_obj.get_data_frames()
+            stage["rows"] = len(dataset)
+        if cache is not None:
+            with measure_stage(instrumentation, "cache_write", len(dataset)):
+                cache.put(player_id, season, context_measure, dataset, league_averages)
+        return dataset, league_averages
+
+    @staticmethod
+    def filter_dataset(dataset):
+        """
+        Flips the x coordinates of shots and drops shots that aren't close to the basket, see binning.filter_shots.
+        """
+        return filter_shots(dataset)
+
     @staticmethod
     def get_shotchart_league_averages(
             player_name: str,
             season: str = CURRENT_SEASON,
-            team_id: Optional[str] = None
+            team_id: Optional[str] = None,
+            context_measure: str = 'FGA',
+            cache=None,
+            endpoint=ShotChartDetail,
+            instrumentation=None
     ):
         """
         Retrieves shotchart detailed data and league averages for each specific zones.
@@ -23,27 +103,22 @@ class DataRetrieverFactory:
 
         :param season: Season for which the data will be retrieved
 
+        :param context_measure: Context measure of the shotchart detail request.
+
+        :param cache: ShotchartCache object, if given the data is served from it when possible.
+
+        :param endpoint: Class with the same interface as ShotChartDetail which is used for fetching.
+
+        :param instrumentation: Instrumentation object, if given every stage of retrieval is measured.
+
         :return: Shotchart for player in given season
         """
-        # Let's assume that players are correctly on first index
-        players_for_name = players.find_players_by_full_name(player_name)
-        if not players_for_name:
-            raise ValueError('Invalid player name given, no players found')
-        if len(players_for_name) == 1:
-            player = players_for_name[0]
-        else:
-            # todo dbratulic: USE TEAM ID TO FETCH PLAYER_ID
-            print("Will use " + team_id + " in future, using first player for now.")
-            player = players_for_name[0]
-
-        shotchart_obj = ShotChartDetail(
-            team_id=0,  # not necessary for fetching shotchart data
-            player_id=player['id'],
-            season_nullable=season,
-            context_measure_simple='FGA'
+        with measure_stage(instrumentation, "find_player"):
+            player = DataRetrieverFactory.find_player(player_name, team_id, season)
+        dataset, league_averages = DataRetrieverFactory.get_data_frames(
+            player['id'], season, context_measure, cache=cache, endpoint=endpoint, instrumentation=instrumentation
         )
-        dataset, league_averages = shotchart_obj.get_data_frames()
-        dataset.LOC_X = -dataset.LOC_X  # REAL DATA IS FLIPPED
-        dataset = dataset.loc[(dataset.SHOT_ZONE_AREA != "Back Court(BC)")
-                              & (dataset.LOC_Y < 300)]  # drop shots that aren't close to the center
+        with measure_stage(instrumentation, "filter_dataset") as stage:
+            dataset = DataRetrieverFactory.filter_dataset(dataset)
+            stage["rows"] = len(dataset)
         return dataset, league_averages
@@ -0,0 +1,130 @@
+"""
+Export of per bin shotchart data for clients which draw charts themselves. Nothing here imports matplotlib or
+seaborn, so data can be served at a fraction of the cost of rendering images.
+"""
+import json
+import os
+
+import numpy as np
+
+from nba_shotcharts.shotcharts.binning import ZONE_COLUMNS
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+
+# Columns of exported table, one row per bin
+EXPORT_COLUMNS = ["BIN_X", "BIN_Y", "BIN_LOC_X", "BIN_LOC_Y", "ATTEMPTS", "MADE"] + ZONE_COLUMNS + [
+    "LOC_PERCENTAGE", "LOC_ZONE_PERCENTAGE", "PCT_LEAGUE_AVG_COMPARISON", "PCT_LEAGUE_COMPARISON_ZONE", "LOC_COUNTS"]
+EXPORT_FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".json": "json"}
+# Number of decimals of floats in JSON
+JSON_DECIMALS = 2
+
+
+def bin_table(shots, league_average_data, number_of_markers="medium", bin_shape="square", bin_aggregate=None,
+              marker_scaling="linear"):
+    """
+    Statistics of every bin, Shotchart.create_bin_table restricted to EXPORT_COLUMNS.
+
+    :param shots: Data frame with shots, CompactShotTable or None if bin_aggregate is given.
+    :param league_average_data: League averages data frame, LeagueAverageLookup or None.
+    :param number_of_markers: Whether there will be small, medium or large number of markers.
+    :param bin_shape: Shape of bins, square or hexagon.
+    :param bin_aggregate: Precomputed counts of shots per bin and zone.
+    :param marker_scaling: Scaling of counts of shots to LOC_COUNTS: linear, sqrt, log or percentile.
+    :return: Tuple (bins data frame, metadata dictionary)
+    """
+    shotchart = Shotchart(shotchart_data=shots, league_average_data=league_average_data,
+                          number_of_markers=number_of_markers, bin_shape=bin_shape, bin_aggregate=bin_aggregate,
+                          marker_scaling=marker_scaling)
+    bins = shotchart.create_bin_table()
+    grid = shotchart.grid
+    metadata = {
+        "bin_shape": grid.shape,
+        "bin_number_x": grid.bin_number_x,
+        "bin_size_x": grid.bin_size_x,
+        "bin_size_y": grid.bin_size_y,
+        "max_marker_size": grid.max_size,
+        "marker_scaling": marker_scaling,
+        "shots": int(bins.ATTEMPTS.sum())
+    }
+    return bins[[column for column in EXPORT_COLUMNS if column in bins]], metadata
+
+
+def _to_arrow(bins, metadata):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(bins, preserve_index=False)
+    # Zones repeat a lot, so they are dictionary encoded
+    for column in ZONE_COLUMNS:
+        position = table.schema.get_field_index(column)
+        table = table.set_column(position, column, table.column(column).dictionary_encode())
+    return table.replace_schema_metadata({b"nba_shotcharts": json.dumps(metadata).encode()})
+
+
+def to_compact_json(bins, metadata, decimals=JSON_DECIMALS):
+    """
+    Column oriented JSON: zones are given as codes into per column vocabularies, floats are rounded and missing
+    values are null.
+
+    :return: string
+    """
+    columns = {}
+    vocabularies = {}
+    for column in bins.columns:
+        values = bins[column]
+        if column in ZONE_COLUMNS:
+            codes, uniques = values.factorize(use_na_sentinel=False)
+            vocabularies[column] = [None if value != value else value for value in uniques]
+            columns[column] = codes.tolist()
+        elif np.issubdtype(values.dtype, np.floating):
+            rounded = np.round(values.to_numpy(dtype=np.float64), decimals)
+            columns[column] = [None if np.isnan(value) else value for value in rounded.tolist()]
+        else:
+            columns[column] = values.to_numpy().tolist()
+    document = {"meta": metadata, "rows": len(bins), "vocabularies": vocabularies, "columns": columns}
+    return json.dumps(document, separators=(",", ":"))
+
+
+def write_bins(bins, metadata, path, export_format=None):
+    """
+    Writes per bin table as Parquet, Arrow IPC (feather) or compact JSON. Parquet and Arrow need pyarrow, Arrow IPC
+    files are uncompressed so that they can be read by Arrow implementations without compression codecs.
+
+    :param bins: Data frame returned by bin_table.
+    :param metadata: Metadata returned by bin_table, it is stored with the data.
+    :param path: Path of the file or binary file like object.
+    :param export_format: parquet, arrow or json, if None it is deduced from the extension of the path.
+    """
+    if export_format is None:
+        extension = os.path.splitext(str(path))[1].lower()
+        if extension not in EXPORT_FORMATS:
+            raise ValueError('Unknown export format of ' + str(path))
+        export_format = EXPORT_FORMATS[extension]
+    if export_format == "json":
+        data = to_compact_json(bins, metadata).encode()
+        if hasattr(path, "write"):
+            path.write(data)
+        else:
+            with open(path, "wb") as output:
+                output.write(data)
+    elif export_format == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(_to_arrow(bins, metadata), path)
+    elif export_format == "arrow":
+        import pyarrow.feather as feather
+
+        feather.write_feather(_to_arrow(bins, metadata), path, compression="uncompressed")
+    else:
+        raise ValueError('Invalid export format: ' + str(export_format))
+
+
+def export_bins(shots, league_average_data, path, export_format=None, number_of_markers="medium",
+                bin_shape="square", bin_aggregate=None, marker_scaling="linear"):
+    """
+    Computes per bin table of shots and writes it, see bin_table and write_bins.
+
+    :return: bins data frame
+    """
+    bins, metadata = bin_table(shots, league_average_data, number_of_markers, bin_shape, bin_aggregate,
+                               marker_scaling)
+    write_bins(bins, metadata, path, export_format)
+    return bins
@@ -0,0 +1,266 @@
+"""
+Small multiples: many shotcharts (e.g. one player over many seasons or a whole roster) drawn as panels of one figure.
+Shots of all panels are binned in one pass, court lines are built once and every panel gets them as a single
+collection, and all panels share one color scale and one color bar.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.binning import compute_bin_statistics, BIN_COLUMNS, ZONE_COLUMNS, COMPARISON_RANGE
+from nba_shotcharts.shotcharts.compact import CompactShotTable
+from nba_shotcharts.shotcharts.instrumentation import measure_stage
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+
+# One panel of the grid, league averages default to the ones of the grid
+FacetPanel = namedtuple("FacetPanel", ["title", "shots", "league_average_data"])
+FacetPanel.__new__.__defaults__ = (None,)
+
+# Size of panel in inches at which markers have the size of a small shotchart
+BASE_PANEL_SIZE = 8.0
+
+
+@lru_cache(maxsize=None)
+def court_geometry(outer_lines=True):
+    """
+    Court lines as paths in court coordinates, the same lines that Shotchart.draw_court draws with patches. They are
+    built once and shared by all panels.
+
+    :param outer_lines: Whether half court line, baseline and side lines are included.
+    :return: Tuple of two lists of (path, filled, dashed) tuples, lines under the shots and lines over them.
+    """
+    from matplotlib.path import Path
+    from matplotlib.transforms import Affine2D
+
+    def arc(center, diameter, theta1, theta2):
+        if theta2 < theta1:
+            theta2 += 360
+        radius = diameter / 2.0
+        return Affine2D().scale(radius).translate(*center).transform_path(Path.arc(theta1, theta2))
+
+    def rectangle(x, y, width, height):
+        corners = [(x, y), (x + width, y), (x + width, y + height), (x, y + height), (x, y)]
+        return Path(corners, closed=True)
+
+    under = [
+        (rectangle(-80, -47.5, 160, 190), False, False),  # Outer box of the paint
+        (rectangle(-60, -47.5, 120, 190), False, False),  # Inner box of the paint
+        (arc((0, 142.5), 120, 0, 180), False, False),  # Free throw top arc
+        (arc((0, 142.5), 120, 180, 0), False, True),  # Free throw bottom arc
+        (arc((0, 0), 80, 0, 180), False, False),  # Restricted area
+        (rectangle(-220, -47.5, 0, 138), False, False),  # Corner threes
+        (rectangle(220, -47.5, 0, 138), False, False),
+        (arc((0, 0), 475, 22, 158), False, False),  # Three point arc
+        (arc((0, 422.5), 120, 180, 0), False, False),  # Center court
+        (arc((0, 422.5), 40, 180, 0), False, False),
+    ]
+    over = [
+        (Path.circle((0, 0), 7.5), False, False),  # Hoop
+        (rectangle(-30, -7.5, 60, -1), True, False),  # Backboard
+    ]
+    if outer_lines:
+        over.append((rectangle(-250, -48, 500, 470), False, False))
+    return under, over
+
+
+def court_collections(shotchart):
+    """
+    New collections with court lines for one panel, styled as given shotchart.
+
+    :return: Tuple of two PathCollection objects, lines under the shots and lines over them.
+    """
+    from matplotlib.collections import PathCollection
+
+    collections = []
+    for geometry, zorder in zip(court_geometry(shotchart.outer_lines), (0, 2)):
+        collections.append(PathCollection(
+            [path for path, _, _ in geometry],
+            facecolors=[shotchart.lines_color if filled else "none" for _, filled, _ in geometry],
+            edgecolors=shotchart.lines_color,
+            linewidths=shotchart.lw,
+            linestyles=["dashed" if dashed else "solid" for _, _, dashed in geometry],
+            zorder=zorder
+        ))
+    return collections
+
+
+class ShotchartGrid:
+
+    def __init__(self, panels, league_average_data=None, columns=None, panel_size=4.0, **options):
+        """
+        Grid of shotcharts drawn on one figure.
+
+        :param panels: List of FacetPanel objects or (title, shots[, league_average_data]) tuples. Shots are data
+        frames or CompactShotTable objects.
+        :param league_average_data: League averages data frame or LeagueAverageLookup used for panels which don't
+        have their own.
+        :param columns: Number of panels in a row, if None the grid is as square as possible.
+        :param panel_size: Size of one panel in inches.
+        :param options: Other arguments of Shotchart constructor (court_color, number_of_markers, marker, ...), they
+        are the same for all panels.
+        """
+        self.panels = [panel if isinstance(panel, FacetPanel) else FacetPanel(*panel) for panel in panels]
+        if not self.panels:
+            raise ValueError('Grid needs at least one panel')
+        self.columns = columns or int(np.ceil(np.sqrt(len(self.panels))))
+        if self.columns < 1:
+            raise ValueError('Grid needs at least one column')
+        self.rows = int(np.ceil(len(self.panels) / float(self.columns)))
+        self.panel_size = panel_size
+        # Style of all panels and the bin grid are taken from one shotchart
+        self.shotchart = Shotchart(shotchart_data=None, league_average_data=None, **options)
+        self.instrumentation = self.shotchart.instrumentation
+        self.league_average_data = league_average_data
+        self.bin_tables = None
+
+    def league_average_lookups(self):
+        """
+        League average lookup for every panel, each distinct league averages object is indexed only once.
+
+        :return: List of LeagueAverageLookup objects or None values.
+        """
+        lookups = {}
+        result = []
+        for panel in self.panels:
+            data = panel.league_average_data if panel.league_average_data is not None else self.league_average_data
+            if data is not None and id(data) not in lookups:
+                if isinstance(data, LeagueAverageLookup):
+                    lookups[id(data)] = data
+                else:
+                    with measure_stage(self.instrumentation, "league_average_build", len(data)):
+                        lookups[id(data)] = LeagueAverageLookup(data)
+            result.append(lookups[id(data)] if data is not None else None)
+        return result
+
+    def aggregate_bins(self):
+        """
+        Counts of shots per bin and zone of every panel. Shots of all panels are binned and counted in one pass, the
+        counts are the same as aggregate_bin_zones gives for each panel alone.
+
+        :return: List of data frames (None for panels without shots).
+        """
+        frames = [panel.shots.to_frame() if isinstance(panel.shots, CompactShotTable) else panel.shots
+                  for panel in self.panels]
+        lengths = np.array([0 if frame is None else len(frame) for frame in frames], dtype=np.int64)
+        frames = [frame for frame, length in zip(frames, lengths) if length]
+        aggregates = [None] * len(self.panels)
+        if not frames:
+            return aggregates
+
+        with measure_stage(self.instrumentation, "aggregate_bins", int(lengths.sum())) as stage:
+            panel = np.repeat(np.arange(len(self.panels)), lengths)
+            x_bins, y_bins = self.shotchart.grid.bin_indices(
+                np.concatenate([frame.LOC_X.to_numpy() for frame in frames]),
+                np.concatenate([frame.LOC_Y.to_numpy() for frame in frames]))
+            table = pd.DataFrame({"PANEL": panel, "BIN_X": x_bins, "BIN_Y": y_bins})
+            for column in ZONE_COLUMNS:
+                table[column] = pd.concat([frame[column] for frame in frames], ignore_index=True).to_numpy()
+            table["MADE"] = np.concatenate([frame.SHOT_MADE_FLAG.to_numpy() for frame in frames]).astype(np.int64)
+            # Positions of shots are counted from the start of their panel
+            starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+            table["FIRST_SEEN"] = np.arange(len(table), dtype=np.int64) - starts[panel]
+            aggregate = table.groupby(["PANEL"] + BIN_COLUMNS + ZONE_COLUMNS, sort=False, dropna=False).agg(
+                ATTEMPTS=("MADE", "size"),
+                MADE=("MADE", "sum"),
+                FIRST_SEEN=("FIRST_SEEN", "min")
+            ).reset_index()
+            aggregate["ATTEMPTS"] = aggregate.ATTEMPTS.astype(np.int64)
+            stage["rows"] = len(aggregate)
+        for index, group in aggregate.groupby("PANEL", sort=False):
+            aggregates[index] = group.drop(columns="PANEL").reset_index(drop=True)
+        return aggregates
+
+    def create_bin_tables(self):
+        """
+        Statistics of each bin of every panel, the same tables that Shotchart.create_bin_table gives. They are
+        computed once.
+
+        :return: List of data frames (None for panels without shots).
+        """
+        if self.bin_tables is not None:
+            return self.bin_tables
+        grid = self.shotchart.grid
+        tables = []
+        for aggregate, lookup in zip(self.aggregate_bins(), self.league_average_lookups()):
+            if aggregate is None:
+                tables.append(None)
+                continue
+            with measure_stage(self.instrumentation, "bin_statistics", len(aggregate)):
+                tables.append(compute_bin_statistics(aggregate, lookup, grid.bin_number_x, grid.bin_number_y,
+                                                     grid.width, grid.height, grid.norm_x, grid.norm_y, grid,
+                                                     self.shotchart.marker_scaling, self.instrumentation))
+        self.bin_tables = tables
+        return tables
+
+    def draw_panel(self, ax, panel, bins, norm, multiplier):
+        """
+        Draws one panel: court, shots with the shared color scale and the title.
+
+        :return: axes
+        """
+        shotchart = self.shotchart
+        ax.set_facecolor(shotchart.court_color)
+        for collection in court_collections(shotchart):
+            ax.add_collection(collection)
+        if bins is not None:
+            color = bins.PCT_LEAGUE_COMPARISON_ZONE if "PCT_LEAGUE_COMPARISON_ZONE" in bins else None
+            ax.scatter(x=bins.BIN_LOC_X, y=bins.BIN_LOC_Y, marker=shotchart.marker,
+                       s=bins.LOC_COUNTS * multiplier, c=color, cmap=shotchart.cmap, norm=norm, linewidths=1.0,
+                       zorder=1)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.set_xlim(-252, 252)
+        ax.set_ylim(-65, 424)
+        ax.set_title(panel.title, size=self.panel_size * 3)
+        return ax
+
+    def create_figure(self, title=None):
+        """
+        Creates the grid on a new figure without using pyplot, see Shotchart.create_figure.
+
+        :param title: Title of the whole figure.
+        :return: matplotlib Figure object
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.cm import ScalarMappable
+        from matplotlib.colors import Normalize
+        from matplotlib.figure import Figure
+
+        bin_tables = self.create_bin_tables()
+        with measure_stage(self.instrumentation, "draw", len(self.panels)):
+            figure = Figure(figsize=(self.columns * self.panel_size, self.rows * self.panel_size + 1), dpi=80)
+            FigureCanvasAgg(figure)
+            figure.set_facecolor(self.shotchart.court_color)
+            axes = figure.subplots(self.rows, self.columns, squeeze=False, sharex=True, sharey=True)
+            norm = Normalize(*COMPARISON_RANGE)
+            # Markers keep their size relative to the court
+            multiplier = (self.panel_size / BASE_PANEL_SIZE) ** 2
+            for index, ax in enumerate(axes.flat):
+                if index < len(self.panels):
+                    self.draw_panel(ax, self.panels[index], bin_tables[index], norm, multiplier)
+                    ax.title.set_color(self.shotchart.text_color)
+                else:
+                    ax.set_visible(False)
+
+            color_bar = figure.colorbar(ScalarMappable(norm=norm, cmap=self.shotchart.cmap), ax=axes.ravel().tolist(),
+                                        orientation="horizontal", fraction=0.03, pad=0.02)
+            color_bar.set_label("Comparison with league average percentage", color=self.shotchart.text_color)
+            color_bar.ax.tick_params(colors=self.shotchart.text_color)
+            if title:
+                figure.suptitle(title, size=self.panel_size * 5, color=self.shotchart.text_color)
+            figure.text(0.01, 0.005, "github.com/danchyy/Basketball_Analytics", color=self.shotchart.text_color)
+            figure.text(0.99, 0.005, "Data: nba.com", color=self.shotchart.text_color, ha="right")
+        return figure
+
+    def render(self, image_path, title=None, image_format=None):
+        """
+        Draws the grid and saves it.
+
+        :param image_path: Path of the file or file like object.
+        :param title: Title of the whole figure.
+        :param image_format: Format of the image, if None it is deduced from the path.
+        """
+        Shotchart.save_figure(self.create_figure(title), image_path, image_format, self.instrumentation)
@@ -0,0 +1,144 @@
+from functools import lru_cache
+
+import numpy as np
+
+from nba_shotcharts.shotcharts.binning import compute_bin_indices, bin_number_y_for, max_size_for_bins, \
+    COURT_WIDTH, COURT_HEIGHT, NORM_X, NORM_Y
+
+BIN_SHAPES = ("square", "hexagon")
+# Integer coordinates this far outside of the binned area are still mapped with lookup tables
+LOOKUP_MARGIN = 64
+
+
+class BinGrid:
+
+    def __init__(self, bin_number_x, width=COURT_WIDTH, height=COURT_HEIGHT, norm_x=NORM_X, norm_y=NORM_Y,
+                 shape="square"):
+        """
+        Geometry of bins for one resolution and court extent. Bins of every integer coordinate on the court are
+        precomputed once, so shots (whose coordinates are integers in nba.com data) are mapped to bins with a single
+        table lookup. Grids are immutable and should be shared, see get_bin_grid.
+
+        Square bins are the same as the ones computed by compute_bin_indices. Hexagonal bins are pointy topped
+        hexagons whose centers lie on two square lattices offset by half of a bin, BIN_Y of a hexagon is its row
+        and rows are half of the lattice height apart.
+
+        :param bin_number_x: Number of bins on x axis.
+        :param width: Width of the area that is binned.
+        :param height: Height of the area that is binned.
+        :param norm_x: Value which is added to x coordinates so that minimum is zero.
+        :param norm_y: Value which is added to y coordinates so that minimum is zero.
+        :param shape: Shape of bins, square or hexagon.
+        """
+        if shape not in BIN_SHAPES:
+            raise ValueError('Invalid bin shape: {}, must be one of {}'.format(shape, ", ".join(BIN_SHAPES)))
+        self.shape = shape
+        self.bin_number_x = bin_number_x
+        self.width = width
+        self.height = height
+        self.norm_x = norm_x
+        self.norm_y = norm_y
+        self.bin_size_x = float(width) / float(bin_number_x)
+        if shape == "square":
+            self.bin_number_y = bin_number_y_for(bin_number_x, width, height)
+            self.bin_size_y = float(height) / float(self.bin_number_y)
+            self.max_size = max_size_for_bins(width, height, bin_number_x, self.bin_number_y)
+        else:
+            # Distance between rows of hexagons
+            self.bin_size_y = self.bin_size_x * np.sqrt(3) / 2
+            self.bin_number_y = float(height) / self.bin_size_y
+            self.max_size = int((int(self.bin_size_x) - 1) * (int(self.bin_size_y) - 1))
+
+        # Edges of square bins in court coordinates, hexagons share the edges of their lattice cells
+        self.x_edges = np.arange(int(np.ceil(bin_number_x)) + 1) * self.bin_size_x - norm_x
+        self.y_edges = np.arange(int(np.ceil(self.bin_number_y)) + 1) * self.bin_size_y - norm_y
+
+        self.x_start = int(np.floor(-norm_x)) - LOOKUP_MARGIN
+        self.y_start = int(np.floor(-norm_y)) - LOOKUP_MARGIN
+        xs = np.arange(self.x_start, int(np.ceil(width - norm_x)) + LOOKUP_MARGIN + 1)
+        ys = np.arange(self.y_start, int(np.ceil(height - norm_y)) + LOOKUP_MARGIN + 1)
+        if shape == "square":
+            # Square bins are separable, so one table per axis is enough
+            self.x_lookup, _ = self._compute_indices(xs, np.zeros_like(xs))
+            _, self.y_lookup = self._compute_indices(np.zeros_like(ys), ys)
+        else:
+            grid_x, grid_y = np.meshgrid(xs, ys, indexing="ij")
+            self.x_lookup, self.y_lookup = self._compute_indices(grid_x, grid_y)
+        self.x_lookup.flags.writeable = False
+        self.y_lookup.flags.writeable = False
+
+    def _compute_indices(self, loc_x, loc_y):
+        if self.shape == "square":
+            return compute_bin_indices(loc_x, loc_y, self.bin_number_x, self.bin_number_y, self.width, self.height,
+                                       self.norm_x, self.norm_y)
+        x_shot = (np.asarray(loc_x, dtype=np.float64) + self.norm_x) / self.bin_size_x
+        y_shot = (np.asarray(loc_y, dtype=np.float64) + self.norm_y) / (2 * self.bin_size_y)
+        # Nearest center on the lattice of even rows and on the lattice of odd rows
+        even_x, even_y = np.round(x_shot), np.round(y_shot)
+        odd_x, odd_y = np.floor(x_shot), np.floor(y_shot)
+        # Rows are sqrt(3) times higher than columns are wide, distances are compared in the units of columns
+        even_distance = (x_shot - even_x) ** 2 + 3 * (y_shot - even_y) ** 2
+        odd_distance = (x_shot - odd_x - 0.5) ** 2 + 3 * (y_shot - odd_y - 0.5) ** 2
+        is_even = even_distance <= odd_distance
+        x_bins = np.where(is_even, even_x, odd_x).astype(np.int64)
+        y_bins = np.where(is_even, 2 * even_y, 2 * odd_y + 1).astype(np.int64)
+        return x_bins, y_bins
+
+    def bin_indices(self, loc_x, loc_y):
+        """
+        Maps shot locations to bin indices. Integer coordinates are looked up in precomputed tables, other
+        coordinates are computed.
+
+        :param loc_x: Array of x coordinates of shots.
+        :param loc_y: Array of y coordinates of shots.
+        :return: Tuple of integer arrays (x_bins, y_bins)
+        """
+        loc_x, loc_y = np.asarray(loc_x), np.asarray(loc_y)
+        if not (np.issubdtype(loc_x.dtype, np.integer) and np.issubdtype(loc_y.dtype, np.integer)):
+            return self._compute_indices(loc_x, loc_y)
+        x_positions = loc_x.astype(np.int64, copy=False) - self.x_start
+        y_positions = loc_y.astype(np.int64, copy=False) - self.y_start
+        if self.shape == "square":
+            x_shape, y_shape = len(self.x_lookup), len(self.y_lookup)
+        else:
+            x_shape, y_shape = self.x_lookup.shape
+        if len(loc_x) and (x_positions.min() < 0 or x_positions.max() >= x_shape or y_positions.min() < 0 or
+                           y_positions.max() >= y_shape):
+            # Few shots outside of the tables are computed
+            inside = (x_positions >= 0) & (x_positions < x_shape) & (y_positions >= 0) & (y_positions < y_shape)
+            x_bins, y_bins = self._compute_indices(loc_x, loc_y)
+            x_bins[inside], y_bins[inside] = self.bin_indices(loc_x[inside], loc_y[inside])
+            return x_bins, y_bins
+        if self.shape == "square":
+            return self.x_lookup.take(x_positions), self.y_lookup.take(y_positions)
+        positions = x_positions * y_shape + y_positions
+        return self.x_lookup.take(positions), self.y_lookup.take(positions)
+
+    def centers(self, x_bins, y_bins):
+        """
+        Centers of bins in court coordinates, this is where markers are drawn.
+
+        :return: Tuple of float arrays (x, y)
+        """
+        x_bins, y_bins = np.asarray(x_bins), np.asarray(y_bins)
+        if self.shape == "square":
+            # Middle of current and next bin, computed the same way as it was per shot
+            x = ((x_bins * float(self.width)) / self.bin_number_x +
+                 ((x_bins + 1) * float(self.width)) / self.bin_number_x) / 2 - self.norm_x
+            y = ((y_bins * float(self.height)) / self.bin_number_y +
+                 ((y_bins + 1) * float(self.height)) / self.bin_number_y) / 2 - self.norm_y
+            return x, y
+        x = (x_bins + 0.5 * (y_bins % 2)) * self.bin_size_x - self.norm_x
+        y = y_bins * self.bin_size_y - self.norm_y
+        return x, y
+
+
+@lru_cache(maxsize=None)
+def get_bin_grid(bin_number_x, width=COURT_WIDTH, height=COURT_HEIGHT, norm_x=NORM_X, norm_y=NORM_Y,
+                 shape="square"):
+    """
+    Grid for the resolution and court extent, created only the first time and shared by all charts.
+
+    :return: BinGrid object
+    """
+    return BinGrid(bin_number_x, width, height, norm_x, norm_y, shape)
@@ -0,0 +1,151 @@
+import logging
+import time
+import tracemalloc
+from collections import namedtuple, Counter, OrderedDict
+from contextlib import contextmanager, nullcontext
+
+# One measured stage: wall time in seconds, number of rows it produced (None if unknown) and peak of memory allocated
+# during the stage in bytes (None if memory isn't traced)
+StageRecord = namedtuple("StageRecord", ["stage", "seconds", "rows", "peak_bytes"])
+
+
+class Instrumentation:
+
+    def __init__(self, callback=None, trace_memory=False, clock=time.perf_counter):
+        """
+        Collects timings of pipeline stages. It is opt-in, DataRetrieverFactory and Shotchart measure their stages
+        only if instrumentation object is given to them.
+
+        :param callback: Function which is called with every StageRecord as soon as the stage ends.
+        :param trace_memory: If True, peak allocations of every stage are measured with tracemalloc. Tracing slows
+        down the pipeline, so it should be used only when memory is investigated.
+        :param clock: Function which returns current time in seconds.
+        """
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.clock = clock
+        self.records = []
+        self.counters = Counter()
+        # Allocations peaks of stages which are in progress, outer stages are first
+        self._memory_stack = []
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Context manager which measures the stage. It yields a dictionary in which the number of rows can be set
+        when it is known only at the end of the stage.
+
+        :param name: Name of the stage.
+        :param rows: Number of rows which the stage processes.
+        """
+        info = {"rows": rows}
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._memory_stack:
+                # Peak is reset for this stage, so the outer stage keeps its peak so far
+                self._memory_stack[-1][1] = max(self._memory_stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            self._memory_stack.append([current, current])
+        start = self.clock()
+        try:
+            yield info
+        finally:
+            seconds = self.clock() - start
+            peak_bytes = None
+            if self.trace_memory:
+                start_memory, peak = self._memory_stack.pop()
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                peak_bytes = peak - start_memory
+                if self._memory_stack:
+                    self._memory_stack[-1][1] = max(self._memory_stack[-1][1], peak)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.add_record(StageRecord(name, seconds, info["rows"], peak_bytes))
+
+    def add_record(self, record):
+        """
+        Stores the record and passes it to the callback.
+        """
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def count(self, name, value=1):
+        """
+        Increments the counter (e.g. cache_hits).
+        """
+        self.counters[name] += value
+
+    def summary(self):
+        """
+        Totals of all records per stage, in order in which stages were first recorded.
+
+        :return: Dictionary which maps stage name to dictionary with calls, seconds, rows and peak_bytes.
+        """
+        totals = OrderedDict()
+        for record in self.records:
+            total = totals.setdefault(record.stage, {"calls": 0, "seconds": 0.0, "rows": 0, "peak_bytes": None})
+            total["calls"] += 1
+            total["seconds"] += record.seconds
+            total["rows"] += record.rows or 0
+            if record.peak_bytes is not None:
+                total["peak_bytes"] = max(total["peak_bytes"] or 0, record.peak_bytes)
+        return totals
+
+    def log(self, logger=None, level=logging.INFO):
+        """
+        Writes every record and counters to the logger. Values are also given as extra attributes of log records, so
+        structured log formatters can output them as separate fields.
+        """
+        logger = logger or logging.getLogger(__name__)
+        for record in self.records:
+            logger.log(level, "stage=%s seconds=%.6f rows=%s peak_bytes=%s", record.stage, record.seconds,
+                       record.rows, record.peak_bytes, extra=record._asdict())
+        for name, value in self.counters.items():
+            logger.log(level, "counter=%s value=%d", name, value, extra={"counter": name, "value": value})
+
+    def prometheus_text(self, prefix="nba_shotcharts"):
+        """
+        Summary and counters in the Prometheus text exposition format.
+
+        :param prefix: Prefix of metric names.
+        :return: string
+        """
+        summary = self.summary()
+        metrics = [
+            ("stage_calls_total", "counter", "Number of times the stage was run.", "calls"),
+            ("stage_seconds_total", "counter", "Wall time spent in the stage.", "seconds"),
+            ("stage_rows_total", "counter", "Rows processed by the stage.", "rows"),
+            ("stage_peak_bytes", "gauge", "Largest peak of memory allocated during the stage.", "peak_bytes")
+        ]
+        lines = []
+        for metric, metric_type, description, field in metrics:
+            name = "{}_{}".format(prefix, metric)
+            values = [(stage, total[field]) for stage, total in summary.items() if total[field] is not None]
+            if not values:
+                continue
+            lines.append("# HELP {} {}".format(name, description))
+            lines.append("# TYPE {} {}".format(name, metric_type))
+            for stage, value in values:
+                lines.append('{}{{stage="{}"}} {}'.format(name, stage, _prometheus_value(value)))
+        for counter, value in self.counters.items():
+            name = "{}_{}_total".format(prefix, counter)
+            lines.append("# TYPE {} counter".format(name))
+            lines.append("{} {}".format(name, value))
+        return "\n".join(lines) + "\n"
+
+
+def _prometheus_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def measure_stage(instrumentation, name, rows=None):
+    """
+    Stage of given instrumentation or context manager which does nothing if instrumentation is None.
+    """
+    if instrumentation is None:
+        return nullcontext({"rows": rows})
+    return instrumentation.stage(name, rows)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.utils.shotchart_constants import SHOT_ZONE_BASIC, SHOT_ZONE_AREAS, SHOT_ZONE_RANGES
+
+
+class LeagueAverageLookup:
+
+    def __init__(self, league_average_data, fallback=None):
+        """
+        Compiles league averages data frame into integer coded zone table. Each zone column is encoded with
+        enumerations from shotchart_constants (zones which aren't in enumerations are appended to them), so the
+        percentage for any zone is retrieved by indexing into the table. Lookup can be built once per season and
+        passed to many Shotchart objects.
+
+        :param league_average_data: Data frame object which contains league average percentages per zone.
+        :param fallback: Percentage used for zones which aren't in league averages. If None, the percentage of same
+        basic zone is used and if basic zone isn't there either, the overall league percentage.
+        """
+        self.frame = league_average_data
+        self.basic_zones = self._vocabulary(SHOT_ZONE_BASIC, league_average_data.SHOT_ZONE_BASIC)
+        self.areas = self._vocabulary(SHOT_ZONE_AREAS, league_average_data.SHOT_ZONE_AREA)
+        self.ranges = self._vocabulary(SHOT_ZONE_RANGES, league_average_data.SHOT_ZONE_RANGE)
+
+        basic_codes, area_codes, range_codes = self.encode(league_average_data.SHOT_ZONE_BASIC,
+                                                           league_average_data.SHOT_ZONE_AREA,
+                                                           league_average_data.SHOT_ZONE_RANGE)
+        fg_pct = league_average_data.FG_PCT.to_numpy(dtype=np.float64)
+        if "FGA" in league_average_data and "FGM" in league_average_data:
+            attempts = league_average_data.FGA.to_numpy(dtype=np.float64)
+            made = league_average_data.FGM.to_numpy(dtype=np.float64)
+        else:
+            attempts, made = np.ones(len(fg_pct)), fg_pct
+
+        # Percentage for the whole basic zone and the whole league, used for missing zones
+        basic_attempts = np.bincount(basic_codes, weights=attempts, minlength=len(self.basic_zones))
+        basic_made = np.bincount(basic_codes, weights=made, minlength=len(self.basic_zones))
+        if fallback is not None:
+            overall = float(fallback)
+            basic_fallback = np.full(len(self.basic_zones), overall)
+        else:
+            overall = made.sum() / attempts.sum() if attempts.sum() else np.nan
+            with np.errstate(invalid="ignore", divide="ignore"):
+                basic_fallback = np.where(basic_attempts > 0, basic_made / basic_attempts, overall)
+
+        shape = (len(self.basic_zones), len(self.areas), len(self.ranges))
+        self.table = np.repeat(basic_fallback, shape[1] * shape[2]).reshape(shape)
+        # Only the first row is used for duplicated zones
+        first = ~pd.DataFrame({"b": basic_codes, "a": area_codes, "r": range_codes}).duplicated().to_numpy()
+        self.table[basic_codes[first], area_codes[first], range_codes[first]] = fg_pct[first]
+        self.basic_fallback = basic_fallback
+        self.missing_percentage = overall
+
+    @staticmethod
+    def from_arrays(table, basic_zones, areas, ranges, basic_fallback, missing_percentage):
+        """
+        Lookup from already compiled arrays (e.g. views into shared memory), nothing is copied. It has no frame.
+
+        :param table: Array of percentages indexed by (basic_code, area_code, range_code).
+        :param basic_zones: Vocabulary of basic zones.
+        :param areas: Vocabulary of areas.
+        :param ranges: Vocabulary of ranges.
+        :param basic_fallback: Array of percentages of whole basic zones.
+        :param missing_percentage: Percentage of zones whose basic zone is unknown.
+        :return: LeagueAverageLookup object
+        """
+        lookup = LeagueAverageLookup.__new__(LeagueAverageLookup)
+        lookup.frame = None
+        lookup.basic_zones, lookup.areas, lookup.ranges = list(basic_zones), list(areas), list(ranges)
+        lookup.table = table
+        lookup.basic_fallback = basic_fallback
+        lookup.missing_percentage = missing_percentage
+        return lookup
+
+    @staticmethod
+    def _vocabulary(enumeration, values):
+        vocabulary = list(enumeration)
+        for value in pd.unique(values):
+            if value not in vocabulary:
+                vocabulary.append(value)
+        return vocabulary
+
+    def encode(self, basic_zones, areas, ranges):
+        """
+        Encodes zone columns into integer codes, unknown zones get code -1.
+
+        :return: Tuple of integer arrays (basic_codes, area_codes, range_codes)
+        """
+        return (self._codes(self.basic_zones, basic_zones), self._codes(self.areas, areas),
+                self._codes(self.ranges, ranges))
+
+    @staticmethod
+    def _codes(vocabulary, values):
+        # Only distinct values are searched in vocabulary, which is much faster for columns with a value per shot
+        value_codes, uniques = pd.factorize(pd.Series(values, copy=False), use_na_sentinel=False)
+        unique_codes = pd.Index(vocabulary).get_indexer(np.asarray(uniques, dtype=object))
+        return unique_codes[value_codes]
+
+    def lookup(self, basic_zones, areas, ranges):
+        """
+        Retrieves league average percentage for each given zone.
+
+        :param basic_zones: Array of SHOT_ZONE_BASIC values.
+        :param areas: Array of SHOT_ZONE_AREA values.
+        :param ranges: Array of SHOT_ZONE_RANGE values.
+        :return: Numpy array of league average percentages.
+        """
+        basic_codes, area_codes, range_codes = self.encode(basic_zones, areas, ranges)
+        percentages = np.full(len(basic_codes), self.missing_percentage, dtype=np.float64)
+        known_basic = basic_codes >= 0
+        percentages[known_basic] = self.basic_fallback[basic_codes[known_basic]]
+        known = known_basic & (area_codes >= 0) & (range_codes >= 0)
+        percentages[known] = self.table[basic_codes[known], area_codes[known], range_codes[known]]
+        return percentages
+
+    def get(self, basic_zone, area, zone_range):
+        """
+        Retrieves league average percentage for single zone.
+        """
+        return float(self.lookup([basic_zone], [area], [zone_range])[0])
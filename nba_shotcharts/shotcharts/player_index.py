@@ -0,0 +1,165 @@
+import bisect
+import difflib
+import re
+import threading
+import unicodedata
+
+from nba_api.stats.static import players as static_players
+
+from nba_shotcharts.utils.data_constants import CURRENT_SEASON
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def normalize_name(name):
+    """
+    Folds the name for lookup: accents are removed, letters are lowercase, punctuation is dropped (J.J. -> jj,
+    O'Neal -> oneal), hyphens become spaces and whitespace is collapsed.
+    """
+    decomposed = unicodedata.normalize("NFKD", str(name))
+    folded = "".join(char for char in decomposed if unicodedata.category(char) != "Mn").lower()
+    folded = re.sub(r"[-_]", " ", folded)
+    folded = re.sub(r"[^\w\s]", "", folded)
+    return " ".join(folded.split())
+
+
+def team_roster(team_id, season):
+    """
+    Ids of players who were on the team in the season, retrieved from CommonTeamRoster endpoint.
+    """
+    from nba_api.stats.endpoints.commonteamroster import CommonTeamRoster
+
+    roster = CommonTeamRoster(team_id=team_id, season=season).get_data_frames()[0]
+    return set(int(player_id) for player_id in roster.PLAYER_ID)
+
+
+class PlayerIndex:
+
+    def __init__(self, players=None, roster_lookup=team_roster):
+        """
+        Index of players by normalized full name, last name and id, built once and shared by all lookups. Exact
+        lookups are dictionary lookups, prefix search uses binary search over sorted names.
+
+        :param players: List of player dictionaries (id, full_name, first_name, last_name, is_active), defaults to
+        the static players of nba_api.
+        :param roster_lookup: Function (team_id, season) -> set of player ids, used to tell apart players with the
+        same name. Rosters are memoized, so it is called at most once per team and season.
+        """
+        self.players = list(static_players.get_players() if players is None else players)
+        self.roster_lookup = roster_lookup
+        self.by_id = {}
+        self.by_full_name = {}
+        self.by_last_name = {}
+        names = []
+        for player in self.players:
+            self.by_id[int(player["id"])] = player
+            full_name = normalize_name(player["full_name"])
+            last_name = normalize_name(player.get("last_name") or full_name.split(" ")[-1])
+            self.by_full_name.setdefault(full_name, []).append(player)
+            self.by_last_name.setdefault(last_name, []).append(player)
+            names.append((full_name, player["id"]))
+            if last_name != full_name:
+                names.append((last_name, player["id"]))
+        # Sorted (name, id) pairs, players are found by the prefix of their full or last name
+        self.names = sorted(set(names))
+        self.name_keys = [name for name, _ in self.names]
+        self.full_names = list(self.by_full_name)
+        self._rosters = {}
+        self._rosters_lock = threading.Lock()
+
+    def get(self, player_id):
+        """
+        Player with given id or None.
+        """
+        return self.by_id.get(int(player_id))
+
+    def find(self, name):
+        """
+        Players whose full name is the given name. If there are none, players with that last name are returned and
+        if there are still none, players whose full name contains the name (same as nba_api's search by full name).
+
+        :return: List of player dictionaries.
+        """
+        key = normalize_name(name)
+        if not key:
+            return []
+        found = self.by_full_name.get(key) or self.by_last_name.get(key)
+        if found:
+            return list(found)
+        return [player for full_name in self.full_names if key in full_name for player in self.by_full_name[full_name]]
+
+    def search(self, prefix, limit=10):
+        """
+        Players whose full name or last name starts with the prefix, for typeahead. Active players come first.
+
+        :return: List of player dictionaries.
+        """
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        start = bisect.bisect_left(self.name_keys, key)
+        found = {}
+        for name, player_id in self.names[start:]:
+            if not name.startswith(key):
+                break
+            found.setdefault(player_id, self.by_id[player_id])
+        ordered = sorted(found.values(), key=lambda player: (not player.get("is_active", False),
+                                                             normalize_name(player["full_name"])))
+        return ordered[:limit]
+
+    def fuzzy_search(self, name, limit=5, cutoff=0.75):
+        """
+        Players whose full names are similar to the name, for misspelled names.
+
+        :return: List of player dictionaries, the most similar first.
+        """
+        matches = difflib.get_close_matches(normalize_name(name), self.full_names, n=limit, cutoff=cutoff)
+        return [player for full_name in matches for player in self.by_full_name[full_name]][:limit]
+
+    def roster(self, team_id, season):
+        key = (int(team_id), season)
+        with self._rosters_lock:
+            if key in self._rosters:
+                return self._rosters[key]
+        roster = self.roster_lookup(int(team_id), season)
+        with self._rosters_lock:
+            self._rosters[key] = roster
+        return roster
+
+    def resolve(self, name, team_id=None, season=None):
+        """
+        Finds exactly one player for the name. If more players have the name, the one who was on the team in the
+        season is chosen (season defaults to the current one). Without team, active players are preferred for the
+        current season. If the name is still ambiguous the first player is chosen, as before.
+
+        :param name: Player's full name, last name or id.
+        :param team_id: Team id which is used only if multiple players are found.
+        :param season: Season which is used only if multiple players are found.
+        :return: Dictionary with player's info
+        """
+        if str(name).strip().isdigit() and self.get(name) is not None:
+            return self.get(name)
+        candidates = self.find(name)
+        if not candidates:
+            raise ValueError('Invalid player name given, no players found')
+        if len(candidates) > 1 and team_id is not None and self.roster_lookup is not None:
+            roster = self.roster(team_id, season or CURRENT_SEASON)
+            candidates = [player for player in candidates if int(player["id"]) in roster] or candidates
+        if len(candidates) > 1 and (season is None or season == CURRENT_SEASON):
+            candidates = [player for player in candidates if player.get("is_active")] or candidates
+        return candidates[0]
+
+
+def get_player_index():
+    """
+    Index of nba_api's static players, built on the first call and shared afterwards.
+
+    :return: PlayerIndex object
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = PlayerIndex()
+    return _index
@@ -0,0 +1,275 @@
+"""
+Cache of rendered charts keyed by the content of their data and by every parameter which changes how they look. Keys
+are hashes, so when the shots change the key changes too and stale images are never served.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.binning import ZONE_COLUMNS
+from nba_shotcharts.shotcharts.compact import CompactShotTable
+
+# Changed whenever drawing changes, so images rendered by older code aren't served
+RENDER_CACHE_VERSION = 1
+# Columns of shots which are drawn, other columns don't change the chart
+FINGERPRINT_COLUMNS = ["LOC_X", "LOC_Y", "SHOT_MADE_FLAG"] + ZONE_COLUMNS
+IMAGE_EXTENSION = ".png"
+# Number of writes after which the disk tier is scanned again to count images written by other caches
+RESCAN_INTERVAL = 64
+
+
+def _hash_frame(digest, frame, columns=None):
+    for column in columns or list(frame.columns):
+        if column not in frame:
+            continue
+        digest.update(column.encode())
+        values = frame[column]
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            array = values.to_numpy()
+            digest.update(array.dtype.str.encode())
+            digest.update(np.ascontiguousarray(array).tobytes())
+        else:
+            # Strings are hashed as codes and the vocabulary, which is faster than hashing every value
+            codes, uniques = pd.factorize(values, use_na_sentinel=False)
+            digest.update(codes.astype(np.int64).tobytes())
+            digest.update(json.dumps([None if value != value else value for value in uniques], default=str).encode())
+
+
+def data_fingerprint(shotchart):
+    """
+    Hash of everything the chart is computed from: shots (or precomputed counts) and league averages.
+
+    :param shotchart: Shotchart object.
+    :return: Hexadecimal string
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    shots = shotchart.shotchart_data
+    if isinstance(shots, CompactShotTable):
+        digest.update(b"compact")
+        for column in FINGERPRINT_COLUMNS:
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(shots.columns[column]).tobytes())
+        digest.update(json.dumps({column: list(shots.vocabularies[column]) for column in ZONE_COLUMNS},
+                                 default=str).encode())
+    elif shots is not None:
+        digest.update(b"frame")
+        _hash_frame(digest, shots, FINGERPRINT_COLUMNS)
+    else:
+        digest.update(b"aggregate")
+        _hash_frame(digest, shotchart.bin_aggregate)
+
+    lookup = shotchart.league_average_lookup
+    if lookup is not None:
+        digest.update(b"league_averages")
+        digest.update(np.ascontiguousarray(lookup.table).tobytes())
+        digest.update(np.ascontiguousarray(lookup.basic_fallback).tobytes())
+        digest.update(json.dumps([lookup.basic_zones, lookup.areas, lookup.ranges, lookup.missing_percentage],
+                                 default=str).encode())
+    return digest.hexdigest()
+
+
+def style_fingerprint(shotchart):
+    """
+    Every parameter of the shotchart which changes how the chart looks, besides its data.
+
+    :return: List of JSON serializable values
+    """
+    marker = shotchart.marker_name
+    if not isinstance(marker, str):
+        # Custom markers are paths, they are identified by their vertices
+        marker = hashlib.blake2b(np.asarray(marker.vertices, dtype=np.float64).tobytes(), digest_size=8).hexdigest()
+    return [shotchart.court_color, shotchart.text_color, shotchart.lines_color, shotchart.lw, shotchart.outer_lines,
+            shotchart.image_size, shotchart.should_save_image, marker, shotchart.bin_number_x, shotchart.grid.shape,
+            shotchart.marker_scaling, shotchart.multiplier, shotchart.figure_size, shotchart.font_size,
+            shotchart.title_font]
+
+
+def render_key(shotchart, title):
+    """
+    Key of the chart in the render cache.
+
+    :param shotchart: Shotchart object.
+    :param title: Title of the chart.
+    :return: Hexadecimal string
+    """
+    description = json.dumps([RENDER_CACHE_VERSION, data_fingerprint(shotchart), style_fingerprint(shotchart), title],
+                             default=str)
+    return hashlib.blake2b(description.encode(), digest_size=20).hexdigest()
+
+
+def _render_png(shotchart, title):
+    return shotchart.render_png(title)
+
+
+class RenderCache:
+
+    def __init__(self, directory=None, max_memory_items=256, max_memory_bytes=64 * 1024 * 1024,
+                 max_disk_bytes=512 * 1024 * 1024, render=_render_png, rescan_interval=RESCAN_INTERVAL):
+        """
+        Two tier cache of PNG images: least recently used images in memory and more of them on disk. Images which are
+        only on disk are moved to memory when they are requested.
+
+        :param directory: Directory of the disk tier, if None there is only the memory tier.
+        :param max_memory_items: Maximum number of images in memory.
+        :param max_memory_bytes: Maximum size of images in memory.
+        :param max_disk_bytes: Maximum size of images on disk, least recently used files are removed above it.
+        :param render: Function (shotchart, title) -> PNG bytes used on misses, e.g. ShotchartRenderer.render.
+        Defaults to Shotchart.render_png.
+        :param rescan_interval: Size of the disk tier is counted from writes of this cache and the directory is
+        scanned only when the count exceeds max_disk_bytes or after this number of writes, so that images written by
+        other caches sharing the directory are counted too.
+        """
+        self.directory = directory
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.render_function = render
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.rescan_interval = rescan_interval
+        self._lock = threading.Lock()
+        # Size of the disk tier at the last scan plus images written since then
+        self.disk_bytes = 0
+        self._writes_since_scan = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.evict()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + IMAGE_EXTENSION)
+
+    def _remember(self, key, image):
+        with self._lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return
+            self.memory[key] = image
+            self.memory_bytes += len(image)
+            while self.memory and (len(self.memory) > self.max_memory_items or
+                                   self.memory_bytes > self.max_memory_bytes):
+                _, removed = self.memory.popitem(last=False)
+                self.memory_bytes -= len(removed)
+
+    def get(self, key):
+        """
+        Cached image, from memory or from disk.
+
+        :return: PNG bytes or None if the image isn't cached.
+        """
+        with self._lock:
+            image = self.memory.get(key)
+            if image is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return image
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as image_file:
+                    image = image_file.read()
+                # Modification time is used as the last access time for LRU eviction
+                os.utime(path)
+            except OSError:
+                image = None
+            if image is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, image)
+                return image
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, image):
+        """
+        Stores image in both tiers and evicts least recently used images if tiers are too large.
+        """
+        self._remember(key, image)
+        if self.directory is None:
+            return
+        # File is written under temporary name first, so readers never see incomplete image
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix=".tmp_")
+        with os.fdopen(descriptor, "wb") as image_file:
+            image_file.write(image)
+        os.replace(temporary, self._path(key))
+        with self._lock:
+            self.disk_bytes += len(image)
+            self._writes_since_scan += 1
+            should_scan = ((self.max_disk_bytes is not None and self.disk_bytes > self.max_disk_bytes) or
+                           self._writes_since_scan >= self.rescan_interval)
+        if should_scan:
+            self.evict()
+
+    def render(self, shotchart, title):
+        """
+        PNG image of the chart, rendered only if the same chart isn't cached.
+
+        :param shotchart: Shotchart object.
+        :param title: Title of the chart.
+        :return: PNG bytes
+        """
+        key = render_key(shotchart, title)
+        image = self.get(key)
+        if image is None:
+            image = self.render_function(shotchart, title)
+            self.put(key, image)
+        return image
+
+    def disk_entries(self):
+        """
+        Images on disk.
+
+        :return: List of tuples (path, size_in_bytes, last_access)
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith(".") or not name.endswith(IMAGE_EXTENSION):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((path, os.path.getsize(path), os.path.getmtime(path)))
+            except OSError:
+                continue
+        return entries
+
+    def evict(self):
+        """
+        Scans the directory and removes least recently used images until the disk tier is under max_disk_bytes.
+        Images written by other caches sharing the directory are counted too.
+        """
+        if self.directory is None:
+            return
+        entries = sorted(self.disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self.max_disk_bytes is None or total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        with self._lock:
+            self.disk_bytes = total
+            self._writes_since_scan = 0
+
+    def clear(self):
+        """
+        Removes all images from both tiers.
+        """
+        with self._lock:
+            self.memory.clear()
+            self.memory_bytes = 0
+        if self.directory is not None:
+            for path, _, _ in self.disk_entries():
+                os.remove(path)
+            self.disk_bytes = 0
@@ -0,0 +1,121 @@
+import threading
+from collections import deque
+
+from nba_shotcharts.shotcharts.court_template import CourtTemplate
+
+
+class _FigurePool:
+    """
+    Figures of one style. When all figures are busy, released figures are handed to waiting requests in order of
+    their arrival, so new requests can't overtake the waiting ones and tail latency stays bounded.
+    """
+
+    def __init__(self):
+        self.free = []
+        self.waiting = deque()
+        self.created = 0
+
+
+class ShotchartRenderer:
+
+    def __init__(self, pool_size=4):
+        """
+        Long lived renderer for serving PNG shotcharts, e.g. from a web endpoint. For every style it keeps a pool of
+        figures with court and legends already drawn (court templates). A request only updates offsets, sizes and
+        colors of the scatter on one free figure and encodes the image to bytes, so figures are never created or
+        leaked per request and concurrent requests don't wait for each other while free figures exist.
+
+        :param pool_size: Maximal number of figures per style, requests wait for a free figure when all are busy.
+        """
+        if pool_size < 1:
+            raise ValueError('Pool size must be at least 1')
+        self.pool_size = pool_size
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, shotchart):
+        """
+        Takes free figure for the style of the shotchart, new figure is built if the pool isn't full.
+        """
+        with self._lock:
+            pool = self._pools.setdefault(shotchart.style_key(), _FigurePool())
+            if pool.free:
+                return pool.free.pop()
+            should_create = pool.created < self.pool_size
+            if should_create:
+                pool.created += 1
+            else:
+                slot = [threading.Event(), None]
+                pool.waiting.append(slot)
+        if not should_create:
+            slot[0].wait()
+            if slot[1] is not None:
+                return slot[1]
+            # Building of a figure failed while this request was waiting, it builds the figure instead
+        try:
+            return CourtTemplate(shotchart)
+        except Exception:
+            with self._lock:
+                # The next waiting request takes over the figure which wasn't built, otherwise it would wait forever
+                slot = pool.waiting.popleft() if pool.waiting else None
+                if slot is None:
+                    pool.created -= 1
+            if slot is not None:
+                slot[0].set()
+            raise
+
+    def _release(self, shotchart, template):
+        with self._lock:
+            pool = self._pools.get(shotchart.style_key())
+            # Pool doesn't exist if the renderer was cleared while the figure was in use
+            if pool is None:
+                return
+            if not pool.waiting:
+                pool.free.append(template)
+                return
+            slot = pool.waiting.popleft()
+        slot[1] = template
+        slot[0].set()
+
+    def warm_up(self, shotchart, count=None):
+        """
+        Builds figures for the style of given shotchart ahead of the first requests.
+
+        :param shotchart: Shotchart object with the style which will be served.
+        :param count: Number of figures, defaults to the pool size.
+        """
+        count = self.pool_size if count is None else min(count, self.pool_size)
+        templates = [self._acquire(shotchart) for _ in range(count)]
+        for template in templates:
+            self._release(shotchart, template)
+
+    def figures(self):
+        """
+        Number of figures built so far per style key.
+        """
+        with self._lock:
+            return {key: pool.created for key, pool in self._pools.items()}
+
+    def render(self, shotchart, title, binned_df=None):
+        """
+        Renders the shotchart to PNG bytes.
+
+        :param shotchart: Shotchart object.
+        :param title: Title of the chart.
+        :param binned_df: Data frame returned by create_bins, if None it is created.
+        :return: PNG image as bytes
+        """
+        if binned_df is None:
+            binned_df = shotchart.binned_for_drawing()
+        template = self._acquire(shotchart)
+        try:
+            return template.render_png(binned_df, title, shotchart.multiplier)
+        finally:
+            self._release(shotchart, template)
+
+    def clear(self):
+        """
+        Drops all figures, it should be called only while there are no requests in progress.
+        """
+        with self._lock:
+            self._pools.clear()
@@ -0,0 +1,229 @@
+"""
+Season wide data published once into shared memory for worker processes. Shots are stored as arrays of
+CompactShotTable sorted by player and league averages as the arrays of LeagueAverageLookup. Workers attach to the
+block by its name and use views of the arrays, so nothing is pickled or copied besides a small handle and the row
+range of every job.
+"""
+from collections import namedtuple
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from nba_shotcharts.shotcharts.compact import CompactShotTable
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup
+
+# Arrays in the block start at multiples of this number of bytes
+ALIGNMENT = 64
+
+# Everything a worker needs to attach: name of the block, (offset, dtype, shape) of every array, vocabularies of
+# coded columns and league average vocabularies with the missing percentage (None if there are no league averages)
+SharedDatasetHandle = namedtuple("SharedDatasetHandle", ["name", "layout", "vocabularies", "league_averages"])
+
+# Datasets to which this process is attached, by name of the block
+_attached = {}
+
+
+def _attach_memory(name):
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching always registers the block with resource tracker. Workers share the tracker
+        # of the publishing process, so the block is still unlinked only once.
+        return SharedMemory(name=name)
+
+
+def _block_exists(name):
+    try:
+        memory = _attach_memory(name)
+    except FileNotFoundError:
+        return False
+    memory.close()
+    return True
+
+
+def detach_unlinked():
+    """
+    Closes datasets attached by this process whose blocks were unlinked by the publishing process, so that their
+    memory can be freed. It is called whenever a new dataset is attached, so long lived workers don't keep every
+    dataset they have seen.
+
+    :return: Number of detached datasets
+    """
+    stale = [dataset for name, dataset in list(_attached.items()) if not _block_exists(name)]
+    for dataset in stale:
+        dataset.close()
+    return len(stale)
+
+
+class SharedSelection(namedtuple("SharedSelection", ["handle", "start", "stop"])):
+    """
+    Rows start:stop of a published dataset, it can be given to RenderJob instead of a data frame.
+    """
+
+    def resolve(self):
+        """
+        Attaches to the dataset (once per process) and selects the rows.
+
+        :return: Tuple (CompactShotTable with views of the rows, LeagueAverageLookup or None)
+        """
+        dataset = SharedDataset.attach(self.handle)
+        return dataset.take(self.start, self.stop), dataset.league_average_lookup
+
+
+class SharedDataset:
+
+    def __init__(self, memory, handle, ranges=None, owner=False):
+        """
+        Shots and league averages in a shared memory block, use publish or attach to create it.
+
+        :param memory: SharedMemory block.
+        :param handle: SharedDatasetHandle of the block.
+        :param ranges: Dictionary which maps keys (e.g. player ids) to (start, stop) row ranges, only the publishing
+        process has it.
+        :param owner: Whether this process created the block and unlinks it.
+        """
+        self.memory = memory
+        self.handle = handle
+        self.ranges = ranges or {}
+        self.owner = owner
+        arrays = {}
+        for column, (offset, dtype, shape) in handle.layout.items():
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf, offset=offset)
+            array.flags.writeable = False
+            arrays[column] = array
+        self.table = CompactShotTable({column: arrays[column] for column in arrays if not column.startswith("_")},
+                                      handle.vocabularies)
+        self.league_average_lookup = None
+        if handle.league_averages is not None:
+            basic_zones, areas, ranges, missing_percentage = handle.league_averages
+            self.league_average_lookup = LeagueAverageLookup.from_arrays(
+                arrays["_league_table"], basic_zones, areas, ranges, arrays["_basic_fallback"], missing_percentage)
+
+    @staticmethod
+    def publish(shots, league_average_data=None, group_by="PLAYER_ID"):
+        """
+        Copies shots and league averages into a new shared memory block. Shots are sorted by group_by (order of
+        shots of one group is kept), so rows of every group are one contiguous range.
+
+        :param shots: Data frame with shots or CompactShotTable.
+        :param league_average_data: League averages data frame, LeagueAverageLookup or None.
+        :param group_by: Column whose values select rows of workers, if None shots aren't sorted.
+        :return: SharedDataset which owns the block, it must be unlinked (or used as context manager).
+        """
+        table = shots if isinstance(shots, CompactShotTable) else CompactShotTable.from_frame(shots)
+        ranges = {}
+        if group_by is not None:
+            keys = table.columns[group_by]
+            order = np.argsort(keys, kind="stable")
+            table = table.take(order)
+            keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.array([], np.int64)
+            stops = np.r_[starts[1:], len(keys)]
+            ranges = {key.item(): (int(start), int(stop)) for key, start, stop in zip(keys[starts], starts, stops)}
+
+        arrays = dict(table.columns)
+        league_averages = None
+        if league_average_data is not None:
+            lookup = league_average_data if isinstance(league_average_data, LeagueAverageLookup) else \
+                LeagueAverageLookup(league_average_data)
+            arrays["_league_table"] = lookup.table
+            arrays["_basic_fallback"] = lookup.basic_fallback
+            league_averages = (lookup.basic_zones, lookup.areas, lookup.ranges, lookup.missing_percentage)
+
+        layout, size = {}, 0
+        for column, array in arrays.items():
+            layout[column] = (size, array.dtype.str, array.shape)
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        memory = SharedMemory(create=True, size=max(size, 1))
+        for column, array in arrays.items():
+            offset, dtype, shape = layout[column]
+            np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf, offset=offset)[...] = array
+        handle = SharedDatasetHandle(memory.name, layout, table.vocabularies, league_averages)
+        return SharedDataset(memory, handle, ranges, owner=True)
+
+    @staticmethod
+    def attach(handle):
+        """
+        Attaches to a published dataset, every process attaches only once per dataset. Datasets which were unlinked
+        since the last attach are detached first.
+
+        :param handle: SharedDatasetHandle of the published dataset.
+        :return: SharedDataset
+        """
+        dataset = _attached.get(handle.name)
+        if dataset is None:
+            detach_unlinked()
+            dataset = SharedDataset(_attach_memory(handle.name), handle)
+            _attached[handle.name] = dataset
+        return dataset
+
+    @staticmethod
+    def detach(handle):
+        """
+        Closes the dataset if this process is attached to it, e.g. when a worker won't get more of its jobs.
+
+        :param handle: SharedDatasetHandle of the published dataset.
+        :return: Whether the process was attached.
+        """
+        dataset = _attached.get(handle.name)
+        if dataset is None:
+            return False
+        dataset.close()
+        return True
+
+    def __len__(self):
+        return len(self.table)
+
+    def take(self, start, stop):
+        """
+        Rows start:stop as CompactShotTable whose arrays are views of shared memory.
+        """
+        return self.table.take(slice(start, stop))
+
+    def select(self, key):
+        """
+        Selection of rows of one group (e.g. one player) which can be sent to workers.
+
+        :param key: Value of group_by column.
+        :return: SharedSelection
+        """
+        if key not in self.ranges:
+            raise ValueError('No shots for ' + str(key))
+        start, stop = self.ranges[key]
+        return SharedSelection(self.handle, start, stop)
+
+    def shotchart(self, key, **options):
+        """
+        Shotchart of one group which uses shared arrays, in the publishing process.
+
+        :param key: Value of group_by column.
+        :param options: Other arguments of Shotchart constructor.
+        :return: Shotchart object
+        """
+        from nba_shotcharts.shotcharts.shotchart import Shotchart
+
+        selection = self.select(key)
+        return Shotchart(shotchart_data=self.take(selection.start, selection.stop),
+                         league_average_data=self.league_average_lookup, **options)
+
+    def close(self):
+        """
+        Detaches from the block, the publishing process also unlinks it. Arrays of this dataset can't be used after.
+        """
+        _attached.pop(self.handle.name, None)
+        self.table = None
+        self.league_average_lookup = None
+        if self.owner:
+            self.memory.unlink()
+            self.owner = False
+        try:
+            self.memory.close()
+        except BufferError:
+            # Views which are still referenced keep the mapping until they are released
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,24 +1,61 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from collections import Counter
-import seaborn as sns
-from matplotlib.patches import Circle, Rectangle, Arc
-import operator
+"""
+Shotchart binning and drawing. Matplotlib, pyplot and seaborn are imported only when a chart is drawn, so data only
+users (aggregation, export, command line startup) don't pay for loading them.
+"""
 import io
+from functools import lru_cache
+
+import numpy as np
 from nba_shotcharts.utils.custom_marker import get_smooth_square
+from nba_shotcharts.shotcharts.binning import aggregate_bin_zones, compute_bin_statistics, bin_indexer, \
+    scale_marker_sizes, ZONE_COLUMNS, NUMBER_OF_MARKERS, MARKER_SCALING, COMPARISON_RANGE, COURT_WIDTH, COURT_HEIGHT, \
+    NORM_X, NORM_Y
+from nba_shotcharts.shotcharts.grid import get_bin_grid
+from nba_shotcharts.shotcharts.surfaces import compute_surfaces, SURFACE_RESOLUTION, SURFACE_BANDWIDTH
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup
+from nba_shotcharts.shotcharts.compact import CompactShotTable
+from nba_shotcharts.shotcharts.instrumentation import measure_stage
+
+# Columns which are added to each shot by create_bins, in order in which they are added
+SHOT_BIN_COLUMNS = [
+    'BIN_LOC_X',  # Binned locations
+    'BIN_LOC_Y',
+    'PCT_LEAGUE_AVG_COMPARISON',  # Comparison of each shot with league average for that zone
+    'PCT_LEAGUE_COMPARISON_ZONE',  # Comparison of each zone with league average for that zone
+    'LOC_PERCENTAGE',  # Percentage of shots for that location
+    'LOC_ZONE_PERCENTAGE',  # Percentage of whole zone (not in comparison with league average)
+    'LOC_COUNTS',  # Scaled count of shots and count of shots per bin
+    'LOC_RAW_COUNTS'
+]
+# Colors of the color map for comparing percentages of shots, from below to above league average
+CMAP_COLORS = ["#4159E1", "#B0E0E6", "#FFFF99", "#EF3330", "#AB2020"]
+
+
+@lru_cache(maxsize=None)
+def get_cmap():
+    """
+    Color map for comparing percentages of shots. It is built once on the first render and shared by all charts.
+
+    :return: matplotlib Colormap
+    """
+    import seaborn as sns
+
+    return sns.blend_palette(colors=CMAP_COLORS, as_cmap=True)
 
 
 class Shotchart:
 
     def __init__(self, shotchart_data, league_average_data, lines_color="black", lw=2,
                  outer_lines=True, marker="ss", number_of_markers="medium", image_size="large", court_color="dark",
-                 should_save_image=False):
+                 should_save_image=False, bin_aggregate=None, instrumentation=None, bin_shape="square",
+                 marker_scaling="linear"):
         """
         Constructor of Shotchart object. It takes several arguments which will be used later to modify the
         look of final plot.
 
-        :param shotchart_data: Data frame object
-        :param league_average_data: Data frame object which contains league average percentages per zone.
+        :param shotchart_data: Data frame object or CompactShotTable
+        :param league_average_data: Data frame object which contains league average percentages per zone or
+        LeagueAverageLookup built from it, which can be shared between many shotcharts of the same season.
         :param lines_color: Color of the court lines.
         :param lw: Widht of the court lines.
         :param outer_lines: Whether outer lines of the court should be plotted
@@ -27,28 +64,44 @@ class Shotchart:
         :param image_size: Size of image, can be small, medium and large.
         :param court_color: Color of the court, can be dark or light.
         :param should_save_image: If shotchart wants to be saved or created for web interface, this flag must be set to True so that image can be properly processed.
+        :param bin_aggregate: Precomputed counts of shots per bin and zone (e.g. from BinAggregateCube), if given the
+        shotchart can be drawn without shotchart_data.
+        :param instrumentation: Instrumentation object, if given binning and drawing stages are measured.
+        :param bin_shape: Shape of bins, square or hexagon. Precomputed bin_aggregate must have the same shape.
+        :param marker_scaling: Scaling of counts of shots to marker sizes: linear, sqrt, log or percentile.
         """
+        if marker_scaling not in MARKER_SCALING:
+            raise ValueError('Invalid marker scaling: ' + str(marker_scaling))
+        self.instrumentation = instrumentation
         self.shotchart_data = shotchart_data
+        self.bin_aggregate = bin_aggregate
         self.league_average = league_average_data
+        self.league_average_lookup = None
+        if isinstance(league_average_data, LeagueAverageLookup):
+            self.league_average = league_average_data.frame
+            self.league_average_lookup = league_average_data
+        elif league_average_data is not None:
+            with measure_stage(instrumentation, "league_average_build", len(league_average_data)):
+                self.league_average_lookup = LeagueAverageLookup(league_average_data)
         self.should_save_image = should_save_image
         self.lines_color = lines_color
         self.outer_lines = outer_lines
-        self.bin_number_x = 30.0
-        if number_of_markers == "small":
-            self.bin_number_x = 20.0
-        elif number_of_markers == "large":
-            self.bin_number_x = 40.0
-        self.width = 500.0  # Width of the area that will be binned
-        self.height = 470.0  # Height of the area that will be binned, these numbers are equivalent to plot range
-        self.bin_number_y = self.height / (self.width / self.bin_number_x)
-        self.norm_x = 250  # Shots can go left and right of basket at most to -250 and +250
-        self.norm_y = 48.5  # Minimal range of shots is -48.5
+        self.bin_number_x = NUMBER_OF_MARKERS.get(number_of_markers, NUMBER_OF_MARKERS["medium"])
+        self.width = COURT_WIDTH  # Width of the area that will be binned
+        self.height = COURT_HEIGHT  # Height of the area that will be binned
+        self.norm_x = NORM_X  # Shots can go left and right of basket at most to -250 and +250
+        self.norm_y = NORM_Y  # Minimal range of shots is -48.5
+        # Bin geometry is shared by all charts with the same resolution and shape
+        self.grid = get_bin_grid(self.bin_number_x, self.width, self.height, self.norm_x, self.norm_y, bin_shape)
+        self.bin_number_y = self.grid.bin_number_y
+        # Smoothed surfaces by (resolution, bandwidth)
+        self.surfaces = {}
+        self.marker_scaling = marker_scaling
+        # Binned data which is drawn, its bin table and positions of shots' bins, computed once per shotchart
+        self.drawing_data = None
         self.lw = lw  # Width of the lines on the court
         self.outer_lines = outer_lines  # Whether the outer lines will be plotted
 
-        # Color map for comparing percentages of shots
-        self.cmap = sns.blend_palette(colors=["#4159E1", "#B0E0E6", "#FFFF99", "#EF3330", "#AB2020"], as_cmap=True)
-
         # Combination for dark court color
         self.court_color = '#36383F'
         self.text_color = "#E8E8FF"
@@ -58,34 +111,10 @@ class Shotchart:
             self.court_color = '#AEAEAE'
             self.text_color = '#353638'
 
-        self.marker = marker  # Marker for plot
-        if self.marker == "ss":
-            self.marker = get_smooth_square()
+        self.marker_name = marker  # Marker for plot, see marker property
 
         self.base_figure_size = 8  # size of figure in inches, DPI is set to 80
-        self.figure_size = self.base_figure_size
-        self.font_size = 8.5  # font for text that depicts legend
-        self.multiplier = 1  # Multiplier for markers
-        self.title_font = 16  # Font of title is a bit bigger than regular text font
-        if self.should_save_image:
-            self.font_size = 7
-            self.multiplier = 0.75
-        if image_size == "medium":  # Based on image size, the parameters are increased accordingly to the size
-            self.figure_size = 12
-            self.font_size = self.figure_size + 1
-            self.multiplier = 2.5
-            self.title_font = 24
-            if self.should_save_image:
-                self.font_size = self.figure_size - 2
-                self.multiplier = 1.75
-        elif image_size == "large":
-            self.figure_size = 16
-            self.font_size = self.figure_size + 1
-            self.multiplier = 5
-            self.title_font = 32
-            if self.should_save_image:
-                self.font_size = self.figure_size - 2
-                self.multiplier = 3.25
+        self.set_image_size(image_size)
 
         # List for markers which will display legend for marker size that explains shot frequency
         # List contains tuple that represent (x, y, marker_size_modifier)
@@ -118,6 +147,54 @@ class Shotchart:
         self.below_average_string = (75, 345, "Below\nAverage\n  (-10%)", 0)
         self.above_average_string = (205, 375, "Above\nAverage\n  (+10%)", 0)
 
+    def set_image_size(self, image_size):
+        """
+        Sets size of the image along with font sizes and multiplier for markers. Markers are scaled when they are
+        drawn, so binned data doesn't have to be computed again.
+
+        :param image_size: Size of image, can be small, medium and large.
+        """
+        self.image_size = image_size
+        self.figure_size = self.base_figure_size
+        self.font_size = 8.5  # font for text that depicts legend
+        self.multiplier = 1  # Multiplier for markers
+        self.title_font = 16  # Font of title is a bit bigger than regular text font
+        if self.should_save_image:
+            self.font_size = 7
+            self.multiplier = 0.75
+        if image_size == "medium":  # Based on image size, the parameters are increased accordingly to the size
+            self.figure_size = 12
+            self.font_size = self.figure_size + 1
+            self.multiplier = 2.5
+            self.title_font = 24
+            if self.should_save_image:
+                self.font_size = self.figure_size - 2
+                self.multiplier = 1.75
+        elif image_size == "large":
+            self.figure_size = 16
+            self.font_size = self.figure_size + 1
+            self.multiplier = 5
+            self.title_font = 32
+            if self.should_save_image:
+                self.font_size = self.figure_size - 2
+                self.multiplier = 3.25
+
+    @property
+    def cmap(self):
+        """
+        Color map for comparing percentages of shots, shared by all charts.
+        """
+        return get_cmap()
+
+    @property
+    def marker(self):
+        """
+        Marker for plot, the smooth square path is created once and shared by all charts.
+        """
+        if self.marker_name == "ss":
+            return get_smooth_square()
+        return self.marker_name
+
     # Amazing function by Bradley Fay for plotting the nba court
     # source: https://github.com/bradleyfay/py-Goldsberry/blob/master/docs/
     # Visualizing%20NBA%20Shots%20with%20py-Goldsberry.ipynb
@@ -128,8 +205,12 @@ class Shotchart:
         :param ax: Ax of the plot, not necessary
         :return: axes
         """
+        from matplotlib.patches import Circle, Rectangle, Arc
+
         # If an axes object isn't provided to plot onto, just get current one
         if ax is None:
+            import matplotlib.pyplot as plt
+
             ax = plt.gca()
 
         # Create the various parts of an NBA basketball court
@@ -203,260 +284,207 @@ class Shotchart:
 
         :return: Returns the copied  self.shotchart_data pandas DataFrame object with additional info about the shots.
         """
-        # Binned x and y coordinates
-        x_bins, y_bins = [], []
-        # Copying the dataset to add more data
-        copied_df = self.shotchart_data.copy()
-        # Keys are basically x_bin and y_bin
-        keys = []
-        # Counter of shots and shots made per locations
-        location_counts, location_made = Counter(), Counter()
-        # be found
-
-        # Size of elements in bin, they should be the same
-        bin_size_x = float(self.width) / float(self.bin_number_x)
-        bin_size_y = float(self.height) / float(self.bin_number_y)
-        # List for locations of shots
-        locations_annotated = []
-        # Counter of shots and shots made per zone
-        zones_counts, zones_made = Counter(), Counter()
-
-        # Maximum size of an element in one bin
-        max_size = int((int(bin_size_x) - 1) * (int(bin_size_y) - 1))
-
-        # Keys that are in restricted area will be stored here, this will be used for finding maximum number of shots
-        restricted_area_keys = []
-
-        # Dictionary which will determine the color of marker in bin
-        percentage_color_dict = {}
-
-        for i in range(len(self.shotchart_data)):
-
-            # Row from data frame
-            row = self.shotchart_data.iloc[i]
-
-            x_shot_orig, y_shot_orig = row.LOC_X, row.LOC_Y
-
-            # Normalize
-            x_shot = x_shot_orig + self.norm_x  # to put minimum to zero
-            y_shot = y_shot_orig + self.norm_y  # to put minimum to zero
-
-            # bin_index = (x_shot / w) * bin_size
-            curr_x_bin = 0 if x_shot == 0 else int((x_shot / float(self.width)) * self.bin_number_x)
-            curr_y_bin = 0 if y_shot == 0 else int((y_shot / float(self.height)) * self.bin_number_y)
-
-            # Key for dicts
-            key = (curr_x_bin, curr_y_bin)
-
-            if row.SHOT_ZONE_BASIC == "Restricted Area":
-                restricted_area_keys.append(key)
-
-            # Counting number of shots made and shots shot
-            keys.append(key)
-            location_counts[key] += 1
-            location_made[key] += row.SHOT_MADE_FLAG
-
-            basic_shot_zone, shot_zone_area = row.SHOT_ZONE_BASIC, row.SHOT_ZONE_AREA
-            zone_dist = row.SHOT_ZONE_RANGE
-
-            area_code = shot_zone_area.split("(")[1].split(")")[0]
-            if "3" in basic_shot_zone:
-                locations_annotated.append("3" + area_code)
-            elif "Paint" in basic_shot_zone:
-                locations_annotated.append("P" + area_code + zone_dist[0])
-            elif "Mid" in basic_shot_zone:
-                locations_annotated.append("M" + area_code + zone_dist[0])
+        return self.bin_shots()[0]
+
+    def bin_shots(self):
+        """
+        Bins shots like create_bins does and keeps the bin table and positions of shots' bins, so markers can be
+        scaled again without binning.
+
+        :return: Tuple (binned shots data frame, bin table, integer array with position of every shot's bin)
+        """
+        shots = self.shotchart_data
+        with measure_stage(self.instrumentation, "create_bins", len(shots)):
+            if isinstance(shots, CompactShotTable):
+                shots = shots.to_frame()
+            # Copying the dataset to add more data
+            copied_df = shots.copy()
+            x_bins, y_bins = self.compute_bin_indices()
+            with measure_stage(self.instrumentation, "aggregate_bins", len(shots)) as stage:
+                aggregate = aggregate_bin_zones(x_bins, y_bins, shots)
+                stage["rows"] = len(aggregate)
+            bins = self.create_bin_table(aggregate)
+            # Every shot takes statistics of the bin it belongs to
+            indexer = bin_indexer(bins, x_bins, y_bins)
+            for column in SHOT_BIN_COLUMNS:
+                if column in bins:
+                    copied_df[column] = bins[column].to_numpy()[indexer]
+
+        return copied_df, bins, indexer
+
+    def compute_bin_indices(self):
+        """
+        Bin indices of every shot in self.shotchart_data.
+
+        :return: Tuple of integer arrays (x_bins, y_bins)
+        """
+        if isinstance(self.shotchart_data, CompactShotTable):
+            loc_x, loc_y = self.shotchart_data.columns["LOC_X"], self.shotchart_data.columns["LOC_Y"]
+        else:
+            loc_x, loc_y = self.shotchart_data.LOC_X.to_numpy(), self.shotchart_data.LOC_Y.to_numpy()
+        return self.grid.bin_indices(loc_x, loc_y)
+
+    def aggregate_bins(self):
+        """
+        Counts of shots per bin and zone, taken from bin_aggregate if it was given.
+
+        :return: Data frame with BIN_X, BIN_Y, zone columns, ATTEMPTS, MADE and FIRST_SEEN columns.
+        """
+        if self.bin_aggregate is not None:
+            return self.bin_aggregate
+        with measure_stage(self.instrumentation, "aggregate_bins", len(self.shotchart_data)) as stage:
+            if isinstance(self.shotchart_data, CompactShotTable):
+                aggregate = self.shotchart_data.aggregate_bins(self.bin_number_x, self.bin_number_y, self.width,
+                                                               self.height, self.norm_x, self.norm_y, self.grid)
             else:
-                locations_annotated.append("R" + area_code)
+                x_bins, y_bins = self.compute_bin_indices()
+                aggregate = aggregate_bin_zones(x_bins, y_bins, self.shotchart_data)
+            stage["rows"] = len(aggregate)
+        return aggregate
 
-            # Creating key for zones
-            zone_key = (basic_shot_zone, shot_zone_area, zone_dist)
+    def create_bin_table(self, aggregate=None):
+        """
+        Statistics of each bin, one row per bin with the same columns that create_bins adds to every shot.
 
-            # Counting the occurences based on both bin_key and zone_key, because of that we have dict in dict
-            if key in percentage_color_dict:
-                if zone_key in percentage_color_dict[key]:
-                    percentage_color_dict[key][zone_key] = percentage_color_dict[key][zone_key] + 1
-                else:
-                    percentage_color_dict[key][zone_key] = 1
+        :param aggregate: Counts of shots per bin and zone, if None they are computed with aggregate_bins.
+        :return: pandas DataFrame
+        """
+        if aggregate is None:
+            aggregate = self.aggregate_bins()
+        # Bin percentages are compared with league averages of their zones here
+        with measure_stage(self.instrumentation, "bin_statistics", len(aggregate)) as stage:
+            bins = compute_bin_statistics(aggregate, self.league_average_lookup, self.bin_number_x,
+                                          self.bin_number_y, self.width, self.height, self.norm_x, self.norm_y,
+                                          self.grid, self.marker_scaling, self.instrumentation)
+            stage["rows"] = len(bins)
+        return bins
+
+    def binned_for_drawing(self):
+        """
+        Data which is drawn, binned shots or the bin table if there are no raw shots (one marker per bin). It is
+        computed on the first call and reused by later calls, e.g. when the chart is drawn in another image size.
+
+        :return: pandas DataFrame
+        """
+        if self.drawing_data is None:
+            if self.shotchart_data is None or isinstance(self.shotchart_data, CompactShotTable):
+                bins = self.create_bin_table()
+                self.drawing_data = (bins, bins, None)
             else:
-                percentage_color_dict[key] = {}
-                percentage_color_dict[key][zone_key] = 1
-
-            zones_counts[zone_key] += 1
-
-            if row.SHOT_MADE_FLAG:
-                zones_made[zone_key] += 1
-
-        shot_locations_percentage = []  # percentage in given bin
-        shot_locations_counts = []
-        raw_counts = []
-        # List which contains comparison for each shot with league average in that zone
-        shot_comparison = []
-        # List which contains comparison of player's shooting in zone vs league average
-        per_zone_comparison = []
-        per_zone_percentage = []
-
-        # Finding the maximal number of shots from data
-        non_ra = []
-        for key in location_counts:
-            if key not in restricted_area_keys:
-                if location_counts[key] not in non_ra:
-                    non_ra.append(location_counts[key])
-
-        sorted_non_ra = sorted(non_ra)
-        max_out_of_restricted = float(sorted_non_ra[-1])
-
-        for j in range(len(self.shotchart_data)):
-            key = keys[j]
-            x_bin, y_bin = key[0], key[1]
-            shot_percent = float(location_made[key]) / location_counts[key]
-            # shot_percent = np.clip(shot_percent, 0.3, 0.7)
-            shot_locations_percentage.append(shot_percent * 100)
-            if self.league_average is not None:
-                # Getting info about zone
-                # We are getting that info from
-                per_zone_counter_from_percentage_color_dict = percentage_color_dict[key]
-                zone_key = max(per_zone_counter_from_percentage_color_dict.items(),
-                               key=operator.itemgetter(1))[0]
-
-                shot_zone_basic = zone_key[0]
-                shot_zone_area = zone_key[1]
-                distance = zone_key[2]
-
-                # Calculating the percentage in current zone
-                zone_percent = 0.0 if zone_key not in zones_made else float(zones_made[zone_key]) / \
-                                                                      float(zones_counts[zone_key])
-
-                # Retrieving league average percentage for current zone
-                avg_percentage = self.league_average.loc[
-                    (self.league_average.SHOT_ZONE_BASIC == shot_zone_basic) &
-                    (self.league_average.SHOT_ZONE_AREA == shot_zone_area) &
-                    (self.league_average.SHOT_ZONE_RANGE == distance)].FG_PCT.iloc[
-                    0
-                ]
-                # Comparison of league average and each shot
-                shot_comparison.append(np.clip((shot_percent - avg_percentage) * 100, -10, 10))
-                # Comparison of zone and league average
-                per_zone_comparison.append(np.clip((zone_percent - avg_percentage) * 100, -10, 10))
-                # Percentage of shot in current zone, kinda inaccurate info, good for some other type of plot
-                per_zone_percentage.append(np.clip(zone_percent * 100, 35, 65))
-
-            # Calculating value to which the markers will be scaled later on
-            # The data in restricted is scaled to maximum out of restricted area, because players usually have a lot
-            # more shots in restricted area
-            value_to_scale = max_out_of_restricted if location_counts[key] > max_out_of_restricted else \
-                location_counts[key]
-            # Storing the data into a list
-            shot_locations_counts.append((float(value_to_scale) / max_out_of_restricted) * max_size)
-
-            # Count of shots per bin
-            raw_counts.append(location_counts[key])
-
-            # Middle of current and next bin is where we will place the marker in real coordinates
-            unbinned_x = ((x_bin * float(self.width)) / self.bin_number_x + (
-                    (x_bin + 1) * float(self.width)) / self.bin_number_x) / 2 - self.norm_x
-            unbinned_y = ((y_bin * float(self.height)) / self.bin_number_y + (
-                    (y_bin + 1) * float(self.height)) / self.bin_number_y) / 2 - self.norm_y
-
-            # Adding binned locations
-            x_bins.append(unbinned_x)
-            y_bins.append(unbinned_y)
-
-        # Binned locations
-        copied_df['BIN_LOC_X'] = x_bins
-        copied_df['BIN_LOC_Y'] = y_bins
-        # Percentage comparison with league averages
-        if self.league_average is not None:
-            # Comparison of each shot with league average for that zone
-            copied_df['PCT_LEAGUE_AVG_COMPARISON'] = shot_comparison
-            # Comparison of each zone with league average for that zone
-            copied_df['PCT_LEAGUE_COMPARISON_ZONE'] = per_zone_comparison
-        # Percentage of shots for that location
-        copied_df['LOC_PERCENTAGE'] = shot_locations_percentage
-        # Percentage of whole zone (not in comparison with league average)
-        copied_df['LOC_ZONE_PERCENTAGE'] = per_zone_percentage
-        # Scaled count of shots and count of shots per bin
-        copied_df['LOC_COUNTS'] = shot_locations_counts
-        copied_df['LOC_RAW_COUNTS'] = raw_counts
-
-        return copied_df
-
-    def plot_frequency_legend(self):
+                self.drawing_data = self.bin_shots()
+        return self.drawing_data[0]
+
+    def set_marker_scaling(self, marker_scaling):
+        """
+        Changes scaling of counts of shots to marker sizes. Binned data which was already computed for drawing is
+        only scaled again, shots aren't binned again.
+
+        :param marker_scaling: linear, sqrt, log or percentile, see scale_marker_sizes.
+        """
+        if marker_scaling not in MARKER_SCALING:
+            raise ValueError('Invalid marker scaling: ' + str(marker_scaling))
+        self.marker_scaling = marker_scaling
+        if self.drawing_data is None:
+            return
+        binned_df, bins, indexer = self.drawing_data
+        with measure_stage(self.instrumentation, "scale_markers", len(bins)):
+            bins["LOC_COUNTS"] = scale_marker_sizes(bins.LOC_RAW_COUNTS.to_numpy(), bins.IN_RESTRICTED.to_numpy(),
+                                                    self.grid.max_size, marker_scaling)
+            if indexer is not None:
+                binned_df["LOC_COUNTS"] = bins.LOC_COUNTS.to_numpy()[indexer]
+
+    def plot_frequency_legend(self, ax=None):
         """
         Method which is in charge of plotting the frequency
+
+        :param ax: Ax of the plot, not necessary
         """
+        if ax is None:
+            import matplotlib.pyplot as plt
+
+            ax = plt.gca()
         # Frequency
-        plt.text(x=self.less_frequent_string[0], y=self.less_frequent_string[1], s=self.less_frequent_string[2],
-                 rotation=self.less_frequent_string[3], color=self.text_color, fontsize=self.font_size)
+        ax.text(x=self.less_frequent_string[0], y=self.less_frequent_string[1], s=self.less_frequent_string[2],
+                rotation=self.less_frequent_string[3], color=self.text_color, fontsize=self.font_size)
         for size_item in self.size_legend:
-            plt.scatter(x=size_item[0], y=size_item[1], s=self.marker_size_legend * self.multiplier *
-                                                          size_item[2], c=self.text_color, marker=self.marker)
-        plt.text(x=self.more_frequent_string[0], y=self.more_frequent_string[1], s=self.more_frequent_string[2],
-                 rotation=self.more_frequent_string[3], color=self.text_color, fontsize=self.font_size)
+            ax.scatter(x=size_item[0], y=size_item[1], s=self.marker_size_legend * self.multiplier *
+                                                         size_item[2], c=self.text_color, marker=self.marker)
+        ax.text(x=self.more_frequent_string[0], y=self.more_frequent_string[1], s=self.more_frequent_string[2],
+                rotation=self.more_frequent_string[3], color=self.text_color, fontsize=self.font_size)
 
-    def plot_efficiency_legend(self):
+    def plot_efficiency_legend(self, ax=None):
         """
         Method which is in charge of plotting the efficiency legend on the shotchart for some NBA player.
+
+        :param ax: Ax of the plot, not necessary
         """
+        if ax is None:
+            import matplotlib.pyplot as plt
+
+            ax = plt.gca()
         # Efficiency
-        plt.text(x=self.comparison_string[0], y=self.comparison_string[1], s=self.comparison_string[2],
-                 color=self.text_color, fontsize=self.font_size)
-        plt.text(x=self.below_average_string[0], y=self.below_average_string[1], s=self.below_average_string[2],
-                 rotation=self.below_average_string[3], color=self.text_color, fontsize=self.font_size)
+        ax.text(x=self.comparison_string[0], y=self.comparison_string[1], s=self.comparison_string[2],
+                color=self.text_color, fontsize=self.font_size)
+        ax.text(x=self.below_average_string[0], y=self.below_average_string[1], s=self.below_average_string[2],
+                rotation=self.below_average_string[3], color=self.text_color, fontsize=self.font_size)
         for color_item in self.color_legend:
-            plt.scatter(x=color_item[0], y=color_item[1], s=self.marker_color_legend * self.multiplier,
-                        c=color_item[2], marker=self.marker)
-        plt.text(x=self.above_average_string[0], y=self.above_average_string[1], s=self.above_average_string[2],
-                 rotation=self.above_average_string[3], color=self.text_color, fontsize=self.font_size)
+            ax.scatter(x=color_item[0], y=color_item[1], s=self.marker_color_legend * self.multiplier,
+                       c=color_item[2], marker=self.marker)
+        ax.text(x=self.above_average_string[0], y=self.above_average_string[1], s=self.above_average_string[2],
+                rotation=self.above_average_string[3], color=self.text_color, fontsize=self.font_size)
 
-    def plot_shotchart(self, title, image_path=None, is_plot_for_response=False):
+    def draw_shots(self, ax, binned_df):
         """
-        Method which is in charge of plotting the shotchart. It creates the binned data first and plots that data.
+        Method which draws binned shots on given axes.
 
-        :param title: Title of the chart.
-        :param image_path: Path of the file, used to save the shot chart.
-        :param is_plot_for_response: If image should be plotted to response then the buffer is returned.
-        :return Returns nothing, but if is_plot_for_response set to True returns buffer with plot which can be used
-        for plotting to response
+        :param ax: Ax of the plot.
+        :param binned_df: Data frame returned by create_bins.
+        :return: PathCollection with shot markers
         """
-        binned_df = self.create_bins()
-        plt.figure(figsize=(self.figure_size, self.figure_size), dpi=80)
-        # colors_dict = {0:'red', 1:'green'}
-
         # LOC_PERCENTAGE -> total perc
         # PCT_LEAGUE_AVG_COMPARISON -> comparison per bins
         # PCT_LEAGUE_COMPARISON_ZONE -> comparison per zones only
         # LOC_X, LOC_Y -> real locs
         # BIN_LOC_X, BIN_LOC_Y -> binned locations
-        plt.scatter(x=binned_df.BIN_LOC_X, y=binned_df.BIN_LOC_Y, marker=self.marker,
-                    s=binned_df.LOC_COUNTS * self.multiplier, c=binned_df.PCT_LEAGUE_COMPARISON_ZONE,
-                    cmap=self.cmap, linewidths=1.0)
+        return ax.scatter(x=binned_df.BIN_LOC_X, y=binned_df.BIN_LOC_Y, marker=self.marker,
+                          s=binned_df.LOC_COUNTS * self.multiplier, c=binned_df.PCT_LEAGUE_COMPARISON_ZONE,
+                          cmap=self.cmap, linewidths=1.0)
+
+    def draw_static(self, ax):
+        """
+        Method which draws everything on shotchart that doesn't depend on the data: legends, court and texts.
+
+        :param ax: Ax of the plot.
+        :return: axes
+        """
         # Plotting frequency
-        self.plot_frequency_legend()
+        self.plot_frequency_legend(ax)
 
         # Plotting efficiency
-        self.plot_efficiency_legend()
+        self.plot_efficiency_legend(ax)
 
         # Changing court color
-        plt.gca().set_facecolor(self.court_color)
-        self.draw_court()
+        ax.set_facecolor(self.court_color)
+        self.draw_court(ax)
 
-        # plt.xticks(np.arange(-250, 252, 16.6667))  # for sanity check
-        # plt.yticks(np.arange(-48.5, 490, 16.6667))
         # Removing ticks
-        plt.xticks([])
-        plt.yticks([])
+        ax.set_xticks([])
+        ax.set_yticks([])
 
-        # Title
-        plt.title(title, size=self.title_font)
+        ax.set_xlim(-252, 252)
+        ax.set_ylim(-65, 424)
 
-        # Drawing court
+        self.draw_credits(ax)
+        return ax
 
-        plt.xlim(-252, 252)
-        plt.ylim(-65, 424)
+    def draw_credits(self, ax):
+        """
+        Draws the source of the chart and of the data below the court.
 
+        :param ax: Ax of the plot.
+        """
         # Plotting bragging rights
-        plt.text(
+        ax.text(
             x=-220,
             y=-58,
             s="github.com/danchyy/Basketball_Analytics",
@@ -464,18 +492,234 @@ class Shotchart:
             fontsize=self.font_size
         )
         # Plotting the data owner
-        plt.text(x=170, y=-58, s="Data: nba.com", color=self.text_color, fontsize=self.font_size)
+        ax.text(x=170, y=-58, s="Data: nba.com", color=self.text_color, fontsize=self.font_size)
+
+    def create_surfaces(self, resolution=SURFACE_RESOLUTION, bandwidth=SURFACE_BANDWIDTH):
+        """
+        Smoothed density and efficiency surfaces of shots, computed once per resolution and bandwidth.
 
-        plt.draw()
+        :param resolution: Number of cells of the grid on x axis.
+        :param bandwidth: Standard deviation of the Gaussian kernel in court units.
+        :return: ShotSurfaces
+        """
+        key = (resolution, bandwidth)
+        if key in self.surfaces:
+            return self.surfaces[key]
+        shots = self.shotchart_data
+        if shots is None:
+            raise ValueError('Smoothed surfaces need shots, shotchart has only counts of shots per bin')
+        if isinstance(shots, CompactShotTable):
+            loc_x, loc_y, made = shots.columns["LOC_X"], shots.columns["LOC_Y"], shots.columns["SHOT_MADE_FLAG"]
+            zones = [shots.decode(column) for column in ZONE_COLUMNS]
+        else:
+            loc_x, loc_y, made = shots.LOC_X.to_numpy(), shots.LOC_Y.to_numpy(), shots.SHOT_MADE_FLAG.to_numpy()
+            zones = [shots[column] for column in ZONE_COLUMNS]
+        with measure_stage(self.instrumentation, "surfaces", len(shots)):
+            # League average of every shot's zone is the expected number of made shots
+            expected = self.league_average_lookup.lookup(*zones) if self.league_average_lookup is not None else None
+            self.surfaces[key] = compute_surfaces(loc_x, loc_y, made, expected, resolution, bandwidth, self.width,
+                                                  self.height, self.norm_x, self.norm_y)
+        return self.surfaces[key]
+
+    def draw_surface(self, ax, surfaces, mode="efficiency", style="imshow"):
+        """
+        Draws smoothed surface under the court lines.
+
+        :param ax: Ax of the plot.
+        :param surfaces: ShotSurfaces returned by create_surfaces.
+        :param mode: efficiency (comparison with league average) or density (frequency of shots).
+        :param style: imshow for smooth image or contourf for filled contours.
+        :return: Image or contour set
+        """
+        if mode == "efficiency":
+            if surfaces.efficiency is None:
+                raise ValueError('Efficiency surface needs league averages')
+            values, (vmin, vmax) = surfaces.efficiency, COMPARISON_RANGE
+        elif mode == "density":
+            values = surfaces.density.copy()
+            vmin, vmax = 0, values.max()
+            # Areas with almost no shots show the court
+            values[values < vmax * 0.02] = np.nan
+        else:
+            raise ValueError('Invalid surface mode: ' + str(mode))
+        values = np.ma.masked_invalid(np.clip(values, vmin, vmax))
+        if style == "imshow":
+            return ax.imshow(values, extent=surfaces.extent, origin="lower", cmap=self.cmap, vmin=vmin, vmax=vmax,
+                             interpolation="bilinear", aspect="auto", zorder=0)
+        if style == "contourf":
+            x_start, x_end, y_start, y_end = surfaces.extent
+            rows, columns = values.shape
+            x = x_start + (np.arange(columns) + 0.5) * (x_end - x_start) / columns
+            y = y_start + (np.arange(rows) + 0.5) * (y_end - y_start) / rows
+            return ax.contourf(x, y, values, levels=np.linspace(vmin, vmax, 11), cmap=self.cmap, zorder=0)
+        raise ValueError('Invalid surface style: ' + str(style))
+
+    def draw_surface_chart(self, ax, title, mode="efficiency", style="imshow", surfaces=None):
+        """
+        Draws smoothed surface chart (instead of binned shots) with the court on given axes.
+
+        :param ax: Ax of the plot.
+        :param title: Title of the chart.
+        :param mode: efficiency or density.
+        :param style: imshow or contourf.
+        :param surfaces: ShotSurfaces, if None they are created with default resolution.
+        :return: axes
+        """
+        if surfaces is None:
+            surfaces = self.create_surfaces()
+        ax.set_facecolor(self.court_color)
+        self.draw_surface(ax, surfaces, mode, style)
+        self.draw_court(ax)
+        if mode == "efficiency":
+            self.plot_efficiency_legend(ax)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.set_xlim(-252, 252)
+        ax.set_ylim(-65, 424)
+        self.draw_credits(ax)
+        ax.set_title(title, size=self.title_font)
+        return ax
+
+    def draw_shotchart(self, ax, title, binned_df=None):
+        """
+        Method which draws the whole shotchart (binned shots, legends and court) on given axes.
+
+        :param ax: Ax of the plot.
+        :param title: Title of the chart.
+        :param binned_df: Data frame returned by create_bins, if None it is created.
+        :return: axes
+        """
+        if binned_df is None:
+            binned_df = self.binned_for_drawing()
+        self.draw_shots(ax, binned_df)
+        self.draw_static(ax)
+        # Title
+        ax.set_title(title, size=self.title_font)
+        return ax
+
+    def style_key(self):
+        """
+        Key which identifies how everything besides the shots looks, charts with the same key share the court template.
+
+        :return: tuple
+        """
+        marker = self.marker_name if isinstance(self.marker_name, str) else id(self.marker_name)
+        return (self.court_color, self.lines_color, self.lw, self.outer_lines, self.image_size,
+                self.should_save_image, marker)
+
+    def render_png(self, title, binned_df=None):
+        """
+        Renders the shotchart to PNG bytes by compositing the shots on top of a cached court template, so court
+        and legends aren't drawn again for every chart.
+
+        :param title: Title of the chart.
+        :param binned_df: Data frame returned by create_bins, if None it is created.
+        :return: PNG image as bytes
+        """
+        if binned_df is None:
+            binned_df = self.binned_for_drawing()
+        with measure_stage(self.instrumentation, "render_png", len(binned_df)):
+            from nba_shotcharts.shotcharts.court_template import get_court_template
+
+            image = get_court_template(self).render_png(binned_df, title, self.multiplier)
+            if image is None:
+                # Title is wider than the figure, so the saved image is larger than the template
+                buffer = io.BytesIO()
+                self.save_figure(self.create_figure(title, binned_df), buffer, "png")
+                image = buffer.getvalue()
+            return image
+
+    @staticmethod
+    def new_figure(figure_size):
+        """
+        Figure with Agg canvas which isn't tracked by pyplot.
+
+        :param figure_size: Size of the figure in inches.
+        :return: matplotlib Figure object
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure(figsize=(figure_size, figure_size), dpi=80)
+        FigureCanvasAgg(figure)
+        return figure
+
+    def create_figure(self, title, binned_df=None):
+        """
+        Creates the shotchart on a new figure without using pyplot, so the figure isn't tracked by pyplot and it is
+        released as soon as it isn't referenced anymore. This should be used when many charts are created in one
+        process.
+
+        :param title: Title of the chart.
+        :param binned_df: Data frame returned by create_bins, if None it is created.
+        :return: matplotlib Figure object
+        """
+        if binned_df is None:
+            binned_df = self.binned_for_drawing()
+        with measure_stage(self.instrumentation, "draw", len(binned_df)):
+            figure = self.new_figure(self.figure_size)
+            self.draw_shotchart(figure.add_subplot(), title, binned_df)
+        return figure
+
+    def create_surface_figure(self, title, mode="efficiency", style="imshow", resolution=SURFACE_RESOLUTION,
+                              bandwidth=SURFACE_BANDWIDTH):
+        """
+        Creates smoothed surface chart on a new figure without using pyplot, see create_figure.
+
+        :return: matplotlib Figure object
+        """
+        surfaces = self.create_surfaces(resolution, bandwidth)
+        with measure_stage(self.instrumentation, "draw"):
+            figure = self.new_figure(self.figure_size)
+            self.draw_surface_chart(figure.add_subplot(), title, mode, style, surfaces)
+        return figure
+
+    @staticmethod
+    def save_figure(figure, image_path, image_format=None, instrumentation=None):
+        """
+        Saves the figure created by create_figure.
+
+        :param figure: Figure which is saved.
+        :param image_path: Path of the file or file like object.
+        :param image_format: Format of the image, if None it is deduced from the path.
+        :param instrumentation: Instrumentation object which measures rendering and encoding of the image.
+        """
+        with measure_stage(instrumentation, "savefig"):
+            # Bbox_inches removes things that make image ugly
+            figure.savefig(image_path, format=image_format, dpi=80, bbox_inches='tight')
+
+    def plot_shotchart(self, title, image_path=None, is_plot_for_response=False):
+        """
+        Method which is in charge of plotting the shotchart. It creates the binned data first and plots that data.
+
+        :param title: Title of the chart.
+        :param image_path: Path of the file, used to save the shot chart.
+        :param is_plot_for_response: If image should be plotted to response then the buffer is returned.
+        :return Returns nothing, but if is_plot_for_response set to True returns buffer with plot which can be used
+        for plotting to response. For serving many charts ShotchartRenderer should be used instead.
+        """
+        import matplotlib.pyplot as plt
+
+        binned_df = self.binned_for_drawing()
+        with measure_stage(self.instrumentation, "draw", len(binned_df)):
+            plt.figure(figsize=(self.figure_size, self.figure_size), dpi=80)
+            self.draw_shotchart(plt.gca(), title, binned_df)
+
+            plt.draw()
         # Saving figure
         if self.should_save_image and image_path:
             final_path = image_path
-            # Bbox_inches removes things that make image ugly
-            plt.savefig(final_path, dpi=80, bbox_inches='tight')
+            with measure_stage(self.instrumentation, "savefig"):
+                # Bbox_inches removes things that make image ugly
+                plt.savefig(final_path, dpi=80, bbox_inches='tight')
 
         if is_plot_for_response:
             buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches="tight")
+            with measure_stage(self.instrumentation, "savefig"):
+                plt.savefig(buf, format='png', bbox_inches="tight")
+            # Figure isn't shown, so it is closed to release it from pyplot
+            plt.close()
+            buf.seek(0)
             return buf
 
         plt.show()
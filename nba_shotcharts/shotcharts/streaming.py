@@ -0,0 +1,68 @@
+import os
+
+import pandas as pd
+
+from nba_shotcharts.shotcharts.accumulator import BinAccumulator
+from nba_shotcharts.shotcharts.binning import filter_shots, ZONE_COLUMNS
+
+# Only these columns are read from shot logs
+STREAM_COLUMNS = ["LOC_X", "LOC_Y", "SHOT_MADE_FLAG"] + ZONE_COLUMNS
+DEFAULT_CHUNK_SIZE = 500000
+
+
+def read_shot_chunks(path, columns=None, chunk_size=DEFAULT_CHUNK_SIZE, raw=True):
+    """
+    Reads shot log from CSV or Parquet file in chunks, so the whole file is never in memory.
+
+    :param path: Path of .csv or .parquet file.
+    :param columns: Columns which are read, defaults to STREAM_COLUMNS.
+    :param chunk_size: Number of rows in one chunk (for Parquet files it is the size of record batches).
+    :param raw: If True, shots are stored as returned by ShotChartDetail, so they are filtered with filter_shots as
+    in DataRetrieverFactory (LOC_X is flipped, back court shots and shots far from the basket are dropped).
+    :return: Generator of data frames.
+    """
+    columns = list(columns or STREAM_COLUMNS)
+    if raw and "SHOT_ZONE_AREA" not in columns:
+        columns.append("SHOT_ZONE_AREA")
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        chunks = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size,
+                                                                                    columns=columns))
+    elif extension in (".csv", ".gz", ".bz2", ".zip", ".xz"):
+        chunks = pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+    else:
+        raise ValueError('Unsupported shot log format: ' + path)
+    for chunk in chunks:
+        if raw:
+            chunk = filter_shots(chunk)
+        yield chunk
+
+
+def stream_bins(path, number_of_markers="medium", chunk_size=DEFAULT_CHUNK_SIZE, raw=True, group_by=None):
+    """
+    Bins shot log chunk by chunk. Only counters of shots per bin and zone stay in memory, so peak memory doesn't
+    depend on the size of the file.
+
+    :param path: Path of .csv or .parquet file.
+    :param number_of_markers: Whether there will be small, medium or large number of markers.
+    :param chunk_size: Number of rows in one chunk.
+    :param raw: If True, shots are filtered the same way as in DataRetrieverFactory.
+    :param group_by: Column (e.g. PLAYER_ID) by which shots are split into separate counters.
+    :return: BinAccumulator, or dictionary of BinAccumulator objects per group if group_by is given.
+    """
+    columns = STREAM_COLUMNS + ([group_by] if group_by else [])
+    if group_by is None:
+        accumulator = BinAccumulator(number_of_markers)
+        for chunk in read_shot_chunks(path, columns, chunk_size, raw):
+            accumulator.add(chunk)
+        return accumulator
+
+    accumulators = {}
+    for chunk in read_shot_chunks(path, columns, chunk_size, raw):
+        for key, group in chunk.groupby(group_by, sort=False):
+            if key not in accumulators:
+                accumulators[key] = BinAccumulator(number_of_markers)
+            accumulators[key].add(group)
+    return accumulators
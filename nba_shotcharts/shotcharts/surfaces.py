@@ -0,0 +1,93 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from nba_shotcharts.shotcharts.binning import COURT_WIDTH, COURT_HEIGHT, NORM_X, NORM_Y
+from nba_shotcharts.shotcharts.grid import get_bin_grid
+
+SURFACE_RESOLUTION = 100  # Number of cells on x axis, 5 units (half a foot) per cell
+SURFACE_BANDWIDTH = 15.0  # Standard deviation of the Gaussian kernel in court units
+# Efficiency isn't shown where smoothed number of attempts in a cell is smaller than this
+MIN_SMOOTHED_ATTEMPTS = 0.02
+
+# Smoothed surfaces of one shotchart: attempts per cell, share of all shots per cell, percentage points above
+# league average (NaN where there are too few shots or no league averages) and extent of the grid in court coordinates
+ShotSurfaces = namedtuple("ShotSurfaces", ["attempts", "density", "efficiency", "extent"])
+
+
+@lru_cache(maxsize=32)
+def gaussian_kernel_fft(shape, sigma):
+    """
+    Real FFT of Gaussian kernel for convolution of rasters with given shape. Rasters are padded with zeros by three
+    standard deviations, so the convolution doesn't wrap around edges. Kernels are cached per shape and bandwidth.
+
+    :param shape: Shape of rasters (rows, columns).
+    :param sigma: Standard deviation of the kernel in cells.
+    :return: Tuple (kernel_fft, padded_shape)
+    """
+    pad = int(np.ceil(3 * sigma))
+    padded_shape = (shape[0] + pad, shape[1] + pad)
+    # Distances from the origin with wrap around, so the kernel is centered on the first cell
+    rows = np.minimum(np.arange(padded_shape[0]), padded_shape[0] - np.arange(padded_shape[0]))
+    columns = np.minimum(np.arange(padded_shape[1]), padded_shape[1] - np.arange(padded_shape[1]))
+    kernel = np.exp(-(rows[:, None] ** 2 + columns[None, :] ** 2) / (2 * sigma ** 2))
+    kernel /= kernel.sum()
+    kernel_fft = np.fft.rfft2(kernel)
+    kernel_fft.flags.writeable = False
+    return kernel_fft, padded_shape
+
+
+def smooth(rasters, sigma):
+    """
+    Convolves rasters with Gaussian kernel using FFT, cost depends only on the size of rasters.
+
+    :param rasters: Array of shape (rows, columns) or (count, rows, columns).
+    :param sigma: Standard deviation of the kernel in cells.
+    :return: Smoothed rasters with the same shape.
+    """
+    rasters = np.asarray(rasters, dtype=np.float64)
+    shape = rasters.shape[-2:]
+    kernel_fft, padded_shape = gaussian_kernel_fft(shape, float(sigma))
+    smoothed = np.fft.irfft2(np.fft.rfft2(rasters, s=padded_shape) * kernel_fft, s=padded_shape)
+    # Tiny negative values are numerical noise of FFT
+    return np.maximum(smoothed[..., :shape[0], :shape[1]], 0)
+
+
+def compute_surfaces(loc_x, loc_y, made, expected=None, resolution=SURFACE_RESOLUTION, bandwidth=SURFACE_BANDWIDTH,
+                     width=COURT_WIDTH, height=COURT_HEIGHT, norm_x=NORM_X, norm_y=NORM_Y):
+    """
+    Rasterizes shots onto a fine grid and smooths attempts, made shots and expected made shots with Gaussian kernel.
+    Shots are only counted per cell, so the cost of smoothing doesn't depend on the number of shots.
+
+    :param loc_x: Array of x coordinates of shots.
+    :param loc_y: Array of y coordinates of shots.
+    :param made: Array of made flags.
+    :param expected: Array of league average percentages for zones of shots, if None efficiency isn't computed.
+    :param resolution: Number of cells on x axis.
+    :param bandwidth: Standard deviation of the kernel in court units.
+    :return: ShotSurfaces
+    """
+    grid = get_bin_grid(float(resolution), width, height, norm_x, norm_y)
+    columns, rows = int(np.ceil(grid.bin_number_x)), int(np.ceil(grid.bin_number_y))
+    x_bins, y_bins = grid.bin_indices(loc_x, loc_y)
+    inside = (x_bins >= 0) & (x_bins < columns) & (y_bins >= 0) & (y_bins < rows)
+    cells = (y_bins * columns + x_bins)[inside]
+
+    weights = [None, np.asarray(made, dtype=np.float64)[inside]]
+    if expected is not None:
+        weights.append(np.asarray(expected, dtype=np.float64)[inside])
+    rasters = np.stack([np.bincount(cells, weights=weight, minlength=rows * columns).reshape(rows, columns)
+                        for weight in weights])
+    smoothed = smooth(rasters, bandwidth / grid.bin_size_x)
+
+    attempts = smoothed[0]
+    total = attempts.sum()
+    density = attempts / total if total > 0 else attempts
+    efficiency = None
+    if expected is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiency = (smoothed[1] - smoothed[2]) / attempts * 100
+        efficiency[attempts < MIN_SMOOTHED_ATTEMPTS] = np.nan
+    extent = (-norm_x, columns * grid.bin_size_x - norm_x, -norm_y, rows * grid.bin_size_y - norm_y)
+    return ShotSurfaces(attempts, density, efficiency, extent)
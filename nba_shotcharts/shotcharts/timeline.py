@@ -0,0 +1,233 @@
+"""
+Shotcharts of time windows (last N games, rolling windows over the season) and animations of them. Shots are binned
+once and counts of every (bin, zone) pair are kept as prefix sums over games, so counts of any window of games are
+a difference of two rows.
+"""
+import shutil
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.binning import compute_bin_statistics, COMPARISON_RANGE, NUMBER_OF_MARKERS, \
+    ZONE_COLUMNS
+from nba_shotcharts.shotcharts.grid import get_bin_grid
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup
+
+# Animation formats and default number of frames per second
+ANIMATION_FORMATS = (".gif", ".mp4")
+DEFAULT_FPS = 4
+
+
+class ShotTimeline:
+
+    def __init__(self, shots, number_of_markers="medium", bin_shape="square"):
+        """
+        Shots indexed by game. Shots are sorted by GAME_DATE (and GAME_ID for games on the same date), binned once and
+        cumulative attempts and made shots of every (bin, zone) pair are stored after every game.
+
+        :param shots: Data frame with LOC_X, LOC_Y, SHOT_MADE_FLAG, zone columns, GAME_DATE and optionally GAME_ID.
+        :param number_of_markers: Whether there will be small, medium or large number of markers.
+        :param bin_shape: Shape of bins, square or hexagon.
+        """
+        self.number_of_markers = number_of_markers
+        self.bin_shape = bin_shape
+        self.grid = get_bin_grid(NUMBER_OF_MARKERS.get(number_of_markers, NUMBER_OF_MARKERS["medium"]),
+                                 shape=bin_shape)
+        game_columns = ["GAME_DATE", "GAME_ID"] if "GAME_ID" in shots else ["GAME_DATE"]
+        shots = shots.sort_values(game_columns, kind="mergesort")
+        games = shots[game_columns]
+        # Shots are sorted, so a game starts where any of the game columns changes
+        first_shots = np.flatnonzero((games != games.shift()).any(axis=1).to_numpy())
+        # Start of every game in sorted shots, the last one is the number of shots
+        self.game_offsets = np.append(first_shots, len(shots)).astype(np.int64)
+        self.game_dates = shots.GAME_DATE.to_numpy()[first_shots]
+        self.game_ids = shots.GAME_ID.to_numpy()[first_shots] if "GAME_ID" in shots else self.game_dates
+        game = np.repeat(np.arange(len(first_shots)), np.diff(self.game_offsets))
+
+        # Every (bin, zone) pair is numbered in order of its first appearance
+        x_bins, y_bins = self.grid.bin_indices(shots.LOC_X.to_numpy(), shots.LOC_Y.to_numpy())
+        pairs = pd.DataFrame({"BIN_X": x_bins, "BIN_Y": y_bins})
+        for column in ZONE_COLUMNS:
+            pairs[column] = shots[column].to_numpy()
+        pair, _ = pd.MultiIndex.from_frame(pairs).factorize()
+        first = np.flatnonzero(~pd.Series(pair).duplicated().to_numpy())
+        self.pairs = pairs.iloc[first].reset_index(drop=True)
+        made = shots.SHOT_MADE_FLAG.to_numpy().astype(np.int64)
+
+        shape = (len(first_shots) + 1, len(first))
+        attempts = np.zeros(shape, dtype=np.int64)
+        made_shots = np.zeros(shape, dtype=np.int64)
+        np.add.at(attempts, (game + 1, pair), 1)
+        np.add.at(made_shots, (game + 1, pair), made)
+        self.cumulative_attempts = np.cumsum(attempts, axis=0)
+        self.cumulative_made = np.cumsum(made_shots, axis=0)
+
+        # First shot of every pair in every game, sorted by game, used for FIRST_SEEN of windows
+        occurrence = np.flatnonzero(~pd.DataFrame({"game": game, "pair": pair}).duplicated().to_numpy())
+        self.occurrence_pair = pair[occurrence]
+        self.occurrence_position = occurrence
+        self.occurrence_offsets = np.searchsorted(game[occurrence], np.arange(len(first_shots) + 1))
+
+    def __len__(self):
+        """
+        Number of games.
+        """
+        return len(self.game_dates)
+
+    def window(self, start=0, stop=None):
+        """
+        Counts of shots per bin and zone of games start:stop, the same as aggregate_bin_zones gives for shots of
+        those games.
+
+        :param start: Index of the first game, negative indices count from the end.
+        :param stop: Index after the last game, if None the window ends with the last game.
+        :return: Data frame with BIN_X, BIN_Y, zone columns, ATTEMPTS, MADE and FIRST_SEEN columns.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if stop <= start:
+            raise ValueError('Window must contain at least one game')
+        attempts = self.cumulative_attempts[stop] - self.cumulative_attempts[start]
+        made = self.cumulative_made[stop] - self.cumulative_made[start]
+
+        # First appearance of every pair in the window is its first occurrence in the first game where it appears
+        low, high = self.occurrence_offsets[start], self.occurrence_offsets[stop]
+        pairs, first = np.unique(self.occurrence_pair[low:high], return_index=True)
+        first_seen = self.occurrence_position[low:high][first] - self.game_offsets[start]
+        order = np.argsort(first_seen, kind="stable")
+        pairs, first_seen = pairs[order], first_seen[order]
+
+        aggregate = self.pairs.iloc[pairs].reset_index(drop=True)
+        aggregate["ATTEMPTS"] = attempts[pairs]
+        aggregate["MADE"] = made[pairs]
+        aggregate["FIRST_SEEN"] = first_seen.astype(np.int64)
+        return aggregate
+
+    def last_games(self, number_of_games):
+        """
+        Counts of shots of the last number_of_games games, see window.
+        """
+        return self.window(max(len(self) - number_of_games, 0), len(self))
+
+    def rolling_windows(self, size, step=1):
+        """
+        Windows of size games, moved by step games, over the whole season.
+
+        :return: List of (start, stop) tuples
+        """
+        if size < 1 or step < 1:
+            raise ValueError('Size and step of rolling windows must be positive')
+        last_start = max(len(self) - size, 0)
+        return [(start, min(start + size, len(self))) for start in range(0, last_start + 1, step)]
+
+    def bin_table(self, start, stop, league_average_data, marker_scaling="linear"):
+        """
+        Statistics of each bin of games start:stop, the same table as Shotchart.create_bin_table gives for shots of
+        those games.
+
+        :param league_average_data: League averages data frame, LeagueAverageLookup or None.
+        :param marker_scaling: Scaling of counts of shots to marker sizes: linear, sqrt, log or percentile.
+        :return: pandas DataFrame
+        """
+        lookup = league_average_data
+        if league_average_data is not None and not isinstance(league_average_data, LeagueAverageLookup):
+            lookup = LeagueAverageLookup(league_average_data)
+        grid = self.grid
+        return compute_bin_statistics(self.window(start, stop), lookup, grid.bin_number_x, grid.bin_number_y,
+                                      grid.width, grid.height, grid.norm_x, grid.norm_y, grid, marker_scaling)
+
+    def shotchart(self, start, stop, league_average_data, **options):
+        """
+        Shotchart of games start:stop drawn from windowed counts.
+
+        :param options: Other arguments of Shotchart constructor.
+        :return: Shotchart object
+        """
+        from nba_shotcharts.shotcharts.shotchart import Shotchart
+
+        return Shotchart(shotchart_data=None, league_average_data=league_average_data,
+                         number_of_markers=self.number_of_markers, bin_shape=self.bin_shape,
+                         bin_aggregate=self.window(start, stop), **options)
+
+    def window_title(self, start, stop, title=""):
+        """
+        Title of the frame of games start:stop, with dates of the first and the last game.
+        """
+        first, last = str(self.game_dates[start]), str(self.game_dates[stop - 1])
+        if len(first) == 8 and first.isdigit():
+            first, last = "{}-{}-{}".format(first[:4], first[4:6], first[6:]), \
+                "{}-{}-{}".format(last[:4], last[4:6], last[6:])
+        return "{}{} - {} ({} games)".format(title + " " if title else "", first, last, stop - start)
+
+    def animate(self, path, league_average_data, size=10, step=1, title="", fps=DEFAULT_FPS, **options):
+        """
+        Writes rolling windows of games as an animated GIF or MP4 video. Counts of every frame are prefix sum
+        differences and frames are composited on one court template, so nothing is binned or drawn again per frame.
+        MP4 videos need ffmpeg.
+
+        :param path: Path of .gif or .mp4 file.
+        :param league_average_data: League averages data frame or LeagueAverageLookup.
+        :param size: Number of games in one frame.
+        :param step: Number of games between frames.
+        :param title: Title which is followed by dates of the window.
+        :param fps: Number of frames per second.
+        :param options: Other arguments of Shotchart constructor which set the style.
+        :return: Number of frames
+        """
+        from nba_shotcharts.shotcharts.court_template import get_court_template
+
+        extension = str(path)[-4:].lower()
+        if extension not in ANIMATION_FORMATS:
+            raise ValueError('Unknown animation format of ' + str(path))
+        if extension == ".mp4" and shutil.which("ffmpeg") is None:
+            raise ValueError('MP4 animations need ffmpeg')
+        lookup = league_average_data
+        if league_average_data is not None and not isinstance(league_average_data, LeagueAverageLookup):
+            lookup = LeagueAverageLookup(league_average_data)
+
+        windows = self.rolling_windows(size, step)
+        style = self.shotchart(*windows[0], league_average_data=lookup, **options)
+        template = get_court_template(style)
+        titles = [self.window_title(start, stop, title) for start, stop in windows]
+        crop = template.tight_crop(titles)
+        if crop is None:
+            raise ValueError('Title is wider than the chart: ' + str(title))
+        frames = [template.render(self.bin_table(start, stop, lookup, style.marker_scaling), frame_title,
+                                  style.multiplier, COMPARISON_RANGE, crop)
+                  for (start, stop), frame_title in zip(windows, titles)]
+        if extension == ".gif":
+            _write_gif(frames, path, fps)
+        else:
+            _write_mp4(frames, path, fps)
+        return len(frames)
+
+
+def _write_gif(frames, path, fps):
+    from PIL import Image
+
+    images = [Image.fromarray(frame) for frame in frames]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=int(1000 / fps), loop=0)
+
+
+def _write_mp4(frames, path, fps):
+    height, width = frames[0].shape[:2]
+    command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+               "-s", "{}x{}".format(width, height), "-r", str(fps), "-i", "-",
+               # H.264 needs even dimensions
+               "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", str(path)]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE)
+    written = True
+    try:
+        for frame in frames:
+            process.stdin.write(np.ascontiguousarray(frame).tobytes())
+    except BrokenPipeError:
+        # ffmpeg exited before it got all frames
+        written = False
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            written = False
+        return_code = process.wait()
+    if return_code != 0 or not written:
+        raise ValueError('ffmpeg failed to write ' + str(path))
@@ -0,0 +1,50 @@
+import unittest
+
+import pandas as pd
+
+from nba_shotcharts.shotcharts.accumulator import BinAccumulator
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class BinAccumulatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shots = generate_shots(3000, seed=21, n_games=40)
+        self.league_average = generate_league_averages(self.shots)
+
+    def assert_same_as_full_rebuild(self, accumulator, number_of_markers="medium"):
+        expected = Shotchart(shotchart_data=self.shots, league_average_data=self.league_average,
+                             number_of_markers=number_of_markers).create_bin_table()
+        incremental = accumulator.shotchart(self.league_average).create_bin_table()
+        pd.testing.assert_frame_equal(incremental, expected, check_exact=True, check_dtype=False)
+
+    def test_games_added_one_by_one(self):
+        for number_of_markers in ["small", "large"]:
+            accumulator = BinAccumulator(number_of_markers)
+            for _, game in self.shots.groupby("GAME_ID", sort=True):
+                accumulator.add(game)
+            self.assertEqual(accumulator.shots_seen, len(self.shots))
+            self.assert_same_as_full_rebuild(accumulator, number_of_markers)
+
+    def test_nightly_update_skips_seen_games(self):
+        accumulator = BinAccumulator()
+        dates = sorted(self.shots.GAME_DATE.unique())
+        for date in dates[::5]:
+            # Each night whole season up to that date is retrieved again
+            accumulator.add(self.shots.loc[self.shots.GAME_DATE <= date], skip_seen_games=True)
+        accumulator.add(self.shots, skip_seen_games=True)
+        self.assertEqual(accumulator.shots_seen, len(self.shots))
+        self.assert_same_as_full_rebuild(accumulator)
+
+    def test_merge(self):
+        half = len(self.shots) // 2
+        first = BinAccumulator().add(self.shots.iloc[:half])
+        second = BinAccumulator().add(self.shots.iloc[half:])
+        self.assert_same_as_full_rebuild(first.merge(second))
+        with self.assertRaises(ValueError):
+            first.merge(BinAccumulator("small"))
+
+
+if __name__ == "__main__":
+    unittest.main()
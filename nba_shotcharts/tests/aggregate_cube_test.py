@@ -0,0 +1,45 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.aggregate_cube import BinAggregateCube
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class BinAggregateCubeTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.shots = generate_shots(20000, seed=5, n_players=8)
+        cls.league_average = generate_league_averages(cls.shots)
+        cls.cube = BinAggregateCube.build(cls.shots, tempfile.mkdtemp())
+
+    def test_cube_is_memory_mapped(self):
+        self.assertIsInstance(self.cube.cube, np.memmap)
+        self.assertEqual(self.cube.players(), sorted(self.shots.PLAYER_ID.unique()))
+
+    def test_same_bins_as_raw_shots(self):
+        for player_id in self.cube.players()[:3]:
+            player_shots = self.shots.loc[self.shots.PLAYER_ID == player_id]
+            for number_of_markers in ["small", "medium", "large"]:
+                expected = Shotchart(shotchart_data=player_shots, league_average_data=self.league_average,
+                                     number_of_markers=number_of_markers).create_bin_table()
+                from_cube = self.cube.shotchart(player_id, self.league_average,
+                                                number_of_markers=number_of_markers).create_bin_table()
+                pd.testing.assert_frame_equal(from_cube, expected, check_exact=True, check_dtype=False)
+
+    def test_renders_without_raw_shots(self):
+        shotchart = self.cube.shotchart(self.cube.players()[0], self.league_average, image_size="small",
+                                        should_save_image=True)
+        self.assertTrue(shotchart.render_png("Player").startswith(b"\x89PNG"))
+
+    def test_only_square_bins(self):
+        with self.assertRaises(ValueError):
+            self.cube.shotchart(self.cube.players()[0], self.league_average, bin_shape="hexagon")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import pandas as pd
+
+from nba_shotcharts.shotcharts.accumulator import BinAccumulator
+from nba_shotcharts.shotcharts.aggregation import aggregate_shots, aggregate_groups, aggregate_shotchart
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class AggregationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shots = generate_shots(6000, seed=5, n_players=12)
+        self.league_average = generate_league_averages(self.shots)
+        self.players = [group for _, group in self.shots.groupby("PLAYER_ID", sort=False)]
+        self.league = pd.concat(self.players, ignore_index=True)
+
+    def expected_bin_table(self, shots, number_of_markers="medium"):
+        return Shotchart(shotchart_data=shots, league_average_data=self.league_average,
+                         number_of_markers=number_of_markers).create_bin_table()
+
+    def test_league_chart_from_player_frames(self):
+        shotchart = aggregate_shotchart(self.players, self.league_average, number_of_markers="large", task_size=700)
+        pd.testing.assert_frame_equal(shotchart.create_bin_table(), self.expected_bin_table(self.league, "large"),
+                                      check_exact=True, check_dtype=False)
+
+    def test_single_frame(self):
+        accumulator = aggregate_shots(self.shots, task_size=1000)
+        self.assertEqual(accumulator.shots_seen, len(self.shots))
+        pd.testing.assert_frame_equal(accumulator.shotchart(self.league_average).create_bin_table(),
+                                      self.expected_bin_table(self.shots), check_exact=True, check_dtype=False)
+
+    def test_groups(self):
+        groups = aggregate_groups(self.shots, "PLAYER_ID", task_size=1000)
+        self.assertEqual(list(groups), list(self.shots.PLAYER_ID.unique()))
+        for player_id, accumulator in groups.items():
+            player_shots = self.shots.loc[self.shots.PLAYER_ID == player_id]
+            pd.testing.assert_frame_equal(accumulator.shotchart(self.league_average).create_bin_table(),
+                                          self.expected_bin_table(player_shots), check_exact=True,
+                                          check_dtype=False)
+        # Groups combined in order of their shots give the league counters
+        combined = BinAccumulator.combine(groups[player] for player in self.league.PLAYER_ID.unique())
+        pd.testing.assert_frame_equal(combined.aggregate(), BinAccumulator().add(self.league).aggregate(),
+                                      check_dtype=False)
+
+    def test_combine_same_as_merge(self):
+        accumulators = [BinAccumulator().add(player) for player in self.players]
+        merged = BinAccumulator()
+        for accumulator in accumulators:
+            merged.merge(accumulator)
+        combined = BinAccumulator.combine(accumulators)
+        self.assertEqual(combined.shots_seen, merged.shots_seen)
+        pd.testing.assert_frame_equal(combined.aggregate(), merged.aggregate(), check_dtype=False)
+        self.assertEqual(len(BinAccumulator.combine([]).counts), 0)
+        with self.assertRaises(ValueError):
+            BinAccumulator.combine([BinAccumulator("small"), BinAccumulator("large")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+from nba_shotcharts.shotcharts.async_retriever import AsyncDataRetriever
+from nba_shotcharts.shotcharts.cache import ShotchartCache
+from nba_shotcharts.shotcharts.data_retriever import DataRetrieverFactory
+from nba_shotcharts.tests.fake_endpoint import FakeShotChartDetail
+
+
+def _result_set(name, frame):
+    rows = frame.astype(object).where(frame.notna(), None).to_numpy().tolist()
+    return {"name": name, "headers": list(frame.columns),
+            "rowSet": [[value.item() if isinstance(value, np.generic) else value for value in row] for row in rows]}
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class AsyncDataRetrieverTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.delay = 0.0
+        app = web.Application()
+        app.router.add_get("/stats/shotchartdetail", self.shotchartdetail)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self.runner.addresses[0][:2]
+        self.base_url = "http://{}:{}/stats/{{endpoint}}".format(host, port)
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    async def shotchartdetail(self, request):
+        """
+        Local stand-in for stats.nba.com which returns the same data as FakeShotChartDetail.
+        """
+        self.requests.append((request.query["PlayerID"], request.query["Season"]))
+        await asyncio.sleep(self.delay)
+        dataset, league_averages = FakeShotChartDetail(0, request.query["PlayerID"], request.query["Season"],
+                                                       request.query["ContextMeasure"]).get_data_frames()
+        return web.json_response({"resultSets": [_result_set("Shot_Chart_Detail", dataset),
+                                                 _result_set("LeagueAverages", league_averages)]})
+
+    async def test_same_as_synchronous_retrieval(self):
+        async with AsyncDataRetriever(base_url=self.base_url) as retriever:
+            dataset, league_averages = await retriever.get_shotchart_league_averages("Russell Westbrook", "2017-18")
+        expected_dataset, expected_league_averages = DataRetrieverFactory.get_shotchart_league_averages(
+            "Russell Westbrook", season="2017-18", endpoint=FakeShotChartDetail)
+        pd.testing.assert_frame_equal(dataset.reset_index(drop=True), expected_dataset.reset_index(drop=True),
+                                      check_dtype=False)
+        pd.testing.assert_frame_equal(league_averages, expected_league_averages, check_dtype=False)
+        self.assertEqual(self.requests, [("201566", "2017-18")])
+
+    async def test_player_lookup_runs_off_the_loop(self):
+        find_player = DataRetrieverFactory.find_player
+        threads = []
+
+        def recording_find_player(*args):
+            threads.append(threading.current_thread())
+            return find_player(*args)
+
+        with mock.patch.object(DataRetrieverFactory, "find_player", side_effect=recording_find_player):
+            async with AsyncDataRetriever(base_url=self.base_url) as retriever:
+                await retriever.get_shotchart_league_averages("Russell Westbrook", "2017-18")
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    async def test_concurrent_requests_are_coalesced(self):
+        self.delay = 0.1
+        async with AsyncDataRetriever(base_url=self.base_url) as retriever:
+            results = await asyncio.gather(*[retriever.get_data_frames(201566, "2017-18") for _ in range(5)],
+                                           retriever.get_data_frames(201566, "2016-17"))
+            self.assertEqual(retriever.in_flight, {})
+            # Finished fetches aren't reused, later callers fetch again
+            await retriever.get_data_frames(201566, "2017-18")
+        self.assertEqual(sorted(self.requests), [("201566", "2016-17"), ("201566", "2017-18"),
+                                                 ("201566", "2017-18")])
+        self.assertTrue(all(result is results[0] for result in results[:5]))
+
+    async def test_timeout(self):
+        self.delay = 1.0
+        async with AsyncDataRetriever(base_url=self.base_url, timeout=0.1) as retriever:
+            with self.assertRaises(asyncio.TimeoutError):
+                await retriever.get_data_frames(201566, "2017-18")
+            self.assertEqual(retriever.in_flight, {})
+
+    async def test_cache(self):
+        cache = ShotchartCache(tempfile.mkdtemp(), current_season="2018-19")
+        async with AsyncDataRetriever(base_url=self.base_url, cache=cache) as retriever:
+            await retriever.get_shotchart_league_averages("Russell Westbrook", "2017-18")
+            await retriever.get_shotchart_league_averages("Russell Westbrook", "2017-18")
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+from nba_shotcharts.shotcharts.batch_renderer import BatchRenderer, RenderJob, retrieved_jobs
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup
+from nba_shotcharts.tests.fake_endpoint import FakeShotChartDetail
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class BatchRendererTest(unittest.TestCase):
+
+    def test_renders_images(self):
+        output_directory = tempfile.mkdtemp()
+        league_average = LeagueAverageLookup(generate_league_averages(n_shots=20000))
+        jobs = (RenderJob("player_{}".format(seed), "Player {}".format(seed), generate_shots(400, seed=seed),
+                          league_average, {"image_size": "small"}) for seed in range(5))
+        jobs = list(jobs) + [RenderJob("broken", "Broken", None, league_average)]
+        report = BatchRenderer(output_directory, max_workers=2, formats=("png", "svg"), max_pending=2).render(jobs)
+
+        self.assertEqual((report.rendered, report.failed), (5, 1))
+        self.assertIn("broken", report.errors)
+        for seed in range(5):
+            for image_format in ["png", "svg"]:
+                path = os.path.join(output_directory, "player_{}.{}".format(seed, image_format))
+                self.assertGreater(os.path.getsize(path), 0)
+        with open(os.path.join(output_directory, "player_0.png"), "rb") as image:
+            self.assertEqual(image.read(8), b"\x89PNG\r\n\x1a\n")
+
+    def test_failed_retrievals_are_logged(self):
+        with self.assertLogs("nba_shotcharts.shotcharts.batch_renderer", level="WARNING") as logs:
+            jobs = list(retrieved_jobs([201566, "Not A Player"], ["2017-18"], min_interval=0,
+                                       endpoint=FakeShotChartDetail))
+        self.assertEqual([job.name for job in jobs], ["201566_2017-18"])
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Not A Player", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
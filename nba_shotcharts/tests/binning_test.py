@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.binning import scale_marker_sizes
+from nba_shotcharts.shotcharts.instrumentation import Instrumentation
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.tests.legacy_binning import legacy_create_bins
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+# Vectorized binning must produce exactly the same columns as the row by row implementation
+class BinningTest(unittest.TestCase):
+
+    def assert_same_as_legacy(self, shots, league_average, number_of_markers):
+        shotchart = Shotchart(shotchart_data=shots, league_average_data=league_average,
+                              number_of_markers=number_of_markers)
+        expected = legacy_create_bins(shotchart)
+        binned = shotchart.create_bins()
+        pd.testing.assert_frame_equal(binned, expected, check_exact=True)
+
+    def test_same_as_legacy(self):
+        shots = generate_shots(3000, seed=7)
+        league_average = generate_league_averages(seed=3)
+        for number_of_markers in ["small", "medium", "large"]:
+            self.assert_same_as_legacy(shots, league_average, number_of_markers)
+
+    def test_same_as_legacy_filtered_index(self):
+        shots = generate_shots(2000, seed=11)
+        # Data from DataRetrieverFactory has holes in index because of filtering
+        shots = shots.loc[shots.LOC_Y % 3 != 0]
+        self.assert_same_as_legacy(shots, generate_league_averages(shots), "medium")
+
+    def test_ties_resolved_by_first_zone(self):
+        shots = pd.DataFrame({
+            "LOC_X": [0, 1, 2, 3, 100],
+            "LOC_Y": [150, 151, 150, 151, 100],
+            "SHOT_MADE_FLAG": [1, 0, 0, 1, 1],
+            "SHOT_ZONE_BASIC": ["Mid-Range", "In The Paint (Non-RA)", "In The Paint (Non-RA)", "Mid-Range",
+                                "Mid-Range"],
+            "SHOT_ZONE_AREA": ["Center(C)"] * 5,
+            "SHOT_ZONE_RANGE": ["16-24 ft.", "8-16 ft.", "8-16 ft.", "16-24 ft.", "16-24 ft."]
+        })
+        self.assert_same_as_legacy(shots, generate_league_averages(shots), "medium")
+
+    def test_marker_scaling_policies(self):
+        counts = np.array([1, 4, 9, 100, 16])
+        in_restricted = np.array([False, False, False, True, False])
+        # Restricted area is capped at the largest count out of it
+        np.testing.assert_allclose(scale_marker_sizes(counts, in_restricted, 32), [2, 8, 18, 32, 32])
+        np.testing.assert_allclose(scale_marker_sizes(counts, in_restricted, 32, "sqrt"), [8, 16, 24, 32, 32])
+        np.testing.assert_allclose(scale_marker_sizes(counts, in_restricted, 32, "log"),
+                                   np.log1p([1, 4, 9, 16, 16]) / np.log1p(16) * 32)
+        np.testing.assert_allclose(scale_marker_sizes(counts, in_restricted, 32, "percentile", 50),
+                                   [32 / 6.5, 32 * 4 / 6.5, 32, 32, 32])
+        # If every bin is in restricted area, the largest count gets the biggest marker
+        np.testing.assert_allclose(scale_marker_sizes([5, 10], [True, True], 20), [10, 20])
+        self.assertEqual(len(scale_marker_sizes([], [], 20)), 0)
+        with self.assertRaises(ValueError):
+            scale_marker_sizes(counts, in_restricted, 32, "cubic")
+
+    def test_rescaling_doesnt_bin_again(self):
+        shots = generate_shots(2000, seed=5)
+        league_average = generate_league_averages(shots)
+        instrumentation = Instrumentation()
+        shotchart = Shotchart(shotchart_data=shots, league_average_data=league_average,
+                              instrumentation=instrumentation)
+        binned = shotchart.binned_for_drawing()
+        shotchart.set_marker_scaling("sqrt")
+        shotchart.set_image_size("small")
+        self.assertIs(shotchart.binned_for_drawing(), binned)
+        summary = instrumentation.summary()
+        self.assertEqual(summary["create_bins"]["calls"], 1)
+        self.assertEqual(summary["scale_markers"]["calls"], 1)
+        self.assertEqual(shotchart.multiplier, 1)
+
+        expected = Shotchart(shotchart_data=shots, league_average_data=league_average,
+                             marker_scaling="sqrt").create_bins()
+        pd.testing.assert_frame_equal(binned, expected)
+        with self.assertRaises(ValueError):
+            Shotchart(shots, league_average, marker_scaling="cubic")
+
+
+if __name__ == "__main__":
+    unittest.main()
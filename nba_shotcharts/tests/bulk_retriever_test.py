@@ -0,0 +1,91 @@
+import json
+import threading
+import unittest
+
+from nba_shotcharts.shotcharts.bulk_retriever import BulkRetriever, RateLimiter
+from nba_shotcharts.tests.fake_endpoint import FakeShotChartDetail
+
+
+class FlakyShotChartDetail(FakeShotChartDetail):
+    """
+    Fails the first request for every player and season.
+    """
+    failed = set()
+    lock = threading.Lock()
+
+    def get_data_frames(self):
+        with FlakyShotChartDetail.lock:
+            key = (self.player_id, self.season)
+            if key not in FlakyShotChartDetail.failed:
+                FlakyShotChartDetail.failed.add(key)
+                raise ConnectionError("Connection reset")
+        return super().get_data_frames()
+
+
+class TruncatedShotChartDetail(FlakyShotChartDetail):
+    """
+    First response for every player and season is truncated JSON.
+    """
+
+    def get_data_frames(self):
+        try:
+            return super().get_data_frames()
+        except ConnectionError:
+            raise json.JSONDecodeError("Unterminated string", '{"resultSets": [', 16)
+
+
+class BulkRetrieverTest(unittest.TestCase):
+
+    def setUp(self):
+        FakeShotChartDetail.requests = []
+        FlakyShotChartDetail.failed = set()
+        self.sleeps = []
+
+    def test_retrieves_all_combinations(self):
+        retriever = BulkRetriever(max_workers=3, min_interval=0, endpoint=FakeShotChartDetail,
+                                  sleep=self.sleeps.append)
+        results = list(retriever.retrieve([201566, "2544", "Russell Westbrook"], ["2016-17", "2017-18"]))
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual({(result.player_id, result.season) for result in results},
+                         {(player_id, season) for player_id in [201566, 2544] for season in ["2016-17", "2017-18"]})
+        # League averages of the same season are shared
+        for season in ["2016-17", "2017-18"]:
+            frames = {id(result.league_averages) for result in results if result.season == season}
+            self.assertEqual(len(frames), 1)
+        self.assertTrue(all((result.dataset.LOC_Y < 300).all() for result in results))
+
+    def test_retries_with_backoff(self):
+        retriever = BulkRetriever(max_workers=2, min_interval=0, retries=2, backoff=1.0,
+                                  endpoint=FlakyShotChartDetail, sleep=self.sleeps.append)
+        results = list(retriever.retrieve([201566, 2544], ["2017-18"]))
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual(len(FakeShotChartDetail.requests), 4)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertTrue(all(1.0 <= sleep <= 1.1 for sleep in self.sleeps))
+
+    def test_malformed_responses_are_retried(self):
+        retriever = BulkRetriever(max_workers=1, min_interval=0, retries=1, endpoint=TruncatedShotChartDetail,
+                                  sleep=self.sleeps.append)
+        results = list(retriever.retrieve([201566], ["2017-18"]))
+        self.assertIsNone(results[0].error)
+        self.assertEqual(len(self.sleeps), 1)
+
+    def test_errors_are_reported(self):
+        retriever = BulkRetriever(max_workers=2, min_interval=0, retries=0, endpoint=FlakyShotChartDetail,
+                                  sleep=self.sleeps.append)
+        results = list(retriever.retrieve([201566, "Not A Player"], ["2017-18"]))
+        errors = {result.player: type(result.error) for result in results}
+        self.assertEqual(errors, {201566: ConnectionError, "Not A Player": ValueError})
+
+    def test_rate_limiter_spaces_requests(self):
+        now = [0.0]
+        sleeps = []
+        limiter = RateLimiter(0.5, clock=lambda: now[0], sleep=sleeps.append)
+        for _ in range(3):
+            limiter.wait()
+        self.assertEqual(sleeps, [0.5, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+
+import pandas as pd
+
+from nba_shotcharts.shotcharts.cache import ShotchartCache, CacheMissError
+from nba_shotcharts.shotcharts.data_retriever import DataRetrieverFactory
+from nba_shotcharts.tests.fake_endpoint import FakeShotChartDetail
+
+
+class ShotchartCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        FakeShotChartDetail.requests = []
+        self.directory = tempfile.mkdtemp()
+        self.now = 1000.0
+        self.cache = ShotchartCache(self.directory, current_season="2018-19", current_season_ttl=60,
+                                    clock=lambda: self.now)
+
+    def fetch(self, season, cache=None):
+        return DataRetrieverFactory.get_shotchart_league_averages(
+            "Russell Westbrook", season=season, cache=cache or self.cache, endpoint=FakeShotChartDetail
+        )
+
+    def test_served_from_cache(self):
+        dataset, league_averages = self.fetch("2017-18")
+        cached_dataset, cached_league_averages = self.fetch("2017-18")
+        self.assertEqual(len(FakeShotChartDetail.requests), 1)
+        pd.testing.assert_frame_equal(cached_dataset.reset_index(drop=True), dataset.reset_index(drop=True))
+        pd.testing.assert_frame_equal(cached_league_averages, league_averages)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        # Data is filtered after it is read from cache
+        self.assertNotIn("Back Court(BC)", set(cached_dataset.SHOT_ZONE_AREA))
+
+    def test_current_season_expires(self):
+        self.fetch("2018-19")
+        self.fetch("2017-18")
+        self.now += 61
+        self.fetch("2018-19")
+        self.fetch("2017-18")
+        self.assertEqual([season for _, season, _ in FakeShotChartDetail.requests], ["2018-19", "2017-18", "2018-19"])
+
+    def test_offline_mode(self):
+        self.fetch("2018-19")
+        self.now += 61
+        offline = ShotchartCache(self.directory, current_season="2018-19", current_season_ttl=60, offline=True,
+                                 clock=lambda: self.now)
+        # Expired entries are still served in offline mode
+        self.fetch("2018-19", cache=offline)
+        with self.assertRaises(CacheMissError):
+            self.fetch("2016-17", cache=offline)
+        self.assertEqual(len(FakeShotChartDetail.requests), 1)
+
+    def test_lru_eviction(self):
+        self.fetch("2015-16")
+        entry_size = self.cache.size()
+        self.cache.max_size_bytes = int(entry_size * 2.5)
+        self.now += 1
+        self.fetch("2016-17")
+        self.now += 1
+        # Access makes 2015-16 recently used, so 2016-17 is evicted
+        self.fetch("2015-16")
+        self.now += 1
+        self.fetch("2017-18")
+        self.assertEqual(len(self.cache.entries()), 2)
+        self.fetch("2015-16")
+        self.fetch("2016-17")
+        self.assertEqual([season for _, season, _ in FakeShotChartDetail.requests],
+                         ["2015-16", "2016-17", "2017-18", "2016-17"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.compact import CompactShotTable
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class CompactShotTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shots = generate_shots(20000, seed=17)
+        self.league_average = generate_league_averages(self.shots)
+        self.table = CompactShotTable.from_frame(self.shots)
+
+    def test_round_trip(self):
+        frame = self.table.to_frame()
+        for column in ["LOC_X", "LOC_Y", "SHOT_ZONE_BASIC", "SHOT_ZONE_AREA", "SHOT_ZONE_RANGE", "ACTION_TYPE"]:
+            np.testing.assert_array_equal(frame[column].to_numpy(), self.shots[column].to_numpy())
+        self.assertEqual(self.table.columns["SHOT_ZONE_BASIC"].dtype, np.int8)
+        self.assertEqual(self.table.columns["SHOT_MADE_FLAG"].dtype, bool)
+
+    def test_unknown_values_extend_vocabulary(self):
+        shots = self.shots.head(10).copy()
+        shots.loc[shots.index[0], "SHOT_ZONE_AREA"] = "Back Court(BC)"
+        table = CompactShotTable.from_frame(shots)
+        self.assertEqual(table.vocabularies["SHOT_ZONE_AREA"][-1], "Back Court(BC)")
+        self.assertEqual(table.to_frame().SHOT_ZONE_AREA.iloc[0], "Back Court(BC)")
+
+    def test_smaller_than_data_frame(self):
+        columns = ["LOC_X", "LOC_Y", "SHOT_MADE_FLAG", "SHOT_ZONE_BASIC", "SHOT_ZONE_AREA", "SHOT_ZONE_RANGE",
+                   "ACTION_TYPE", "PLAYER_ID"]
+        frame_memory = self.shots[columns].memory_usage(deep=True, index=False).sum()
+        self.assertLess(self.table.memory_usage() * 4, frame_memory)
+
+    def test_same_bins_as_data_frame(self):
+        for number_of_markers in ["small", "medium", "large"]:
+            expected = Shotchart(shotchart_data=self.shots, league_average_data=self.league_average,
+                                 number_of_markers=number_of_markers).create_bin_table()
+            compact = Shotchart(shotchart_data=self.table, league_average_data=self.league_average,
+                                number_of_markers=number_of_markers).create_bin_table()
+            pd.testing.assert_frame_equal(compact, expected, check_exact=True, check_dtype=False)
+
+    def test_missing_zones_are_own_zone(self):
+        shots = generate_shots(500, seed=3)
+        shots.loc[shots.index[:5], "SHOT_ZONE_AREA"] = np.nan
+        table = CompactShotTable.from_frame(shots)
+        self.assertGreaterEqual(table.columns["SHOT_ZONE_AREA"].min(), 0)
+        self.assertTrue(table.to_frame().SHOT_ZONE_AREA.head(5).isna().all())
+        expected = Shotchart(shotchart_data=shots, league_average_data=self.league_average).create_bin_table()
+        compact = Shotchart(shotchart_data=table, league_average_data=self.league_average).create_bin_table()
+        self.assertTrue(expected.SHOT_ZONE_AREA.isna().any())
+        pd.testing.assert_frame_equal(compact, expected, check_exact=True, check_dtype=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import io
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from nba_shotcharts.shotcharts.court_template import get_court_template, clear_court_templates
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class CourtTemplateTest(unittest.TestCase):
+
+    def setUp(self):
+        clear_court_templates()
+        self.league_average = generate_league_averages(n_shots=20000)
+
+    def assert_same_as_full_drawing(self, shotchart, title):
+        template_image = np.asarray(Image.open(io.BytesIO(shotchart.render_png(title))).convert("RGB"))
+        buffer = io.BytesIO()
+        Shotchart.save_figure(shotchart.create_figure(title), buffer, "png")
+        full_image = np.asarray(Image.open(buffer).convert("RGB"))
+
+        self.assertEqual(template_image.shape, full_image.shape)
+        # Images can differ only on edges because of anti aliasing and sub pixel offset of the tight crop
+        difference = np.abs(template_image.astype(int) - full_image.astype(int))
+        self.assertLess(difference.mean(), 3)
+
+    def test_same_as_full_drawing(self):
+        shotchart = Shotchart(shotchart_data=generate_shots(1000), league_average_data=self.league_average,
+                              image_size="small", should_save_image=True)
+        self.assert_same_as_full_drawing(shotchart, "Player")
+
+    def test_crop_follows_title(self):
+        for image_size in ["small", "large"]:
+            shotchart = Shotchart(shotchart_data=generate_shots(1000), league_average_data=self.league_average,
+                                  image_size=image_size, should_save_image=True)
+            for title in ["", "Stephen Curry, Golden State Warriors\n2017-18 Regular Season, all games"]:
+                self.assert_same_as_full_drawing(shotchart, title)
+            # Title wider than the figure doesn't fit on the template, so the chart is fully drawn
+            self.assertIsNone(get_court_template(shotchart).render_png(shotchart.binned_for_drawing(), "X" * 60))
+            self.assert_same_as_full_drawing(shotchart, "X" * 60)
+
+    def test_template_is_shared_by_style(self):
+        first = Shotchart(shotchart_data=generate_shots(100, seed=1), league_average_data=self.league_average)
+        second = Shotchart(shotchart_data=generate_shots(100, seed=2), league_average_data=self.league_average)
+        light = Shotchart(shotchart_data=generate_shots(100, seed=2), league_average_data=self.league_average,
+                          court_color="light")
+        self.assertIs(get_court_template(first), get_court_template(second))
+        self.assertIsNot(get_court_template(first), get_court_template(light))
+
+
+if __name__ == "__main__":
+    unittest.main()
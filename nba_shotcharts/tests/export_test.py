@@ -0,0 +1,86 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.shotcharts.compact import CompactShotTable
+from nba_shotcharts.shotcharts.export import bin_table, export_bins, EXPORT_COLUMNS
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class ExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shots = generate_shots(2000, seed=13)
+        self.league_average = generate_league_averages(self.shots)
+
+    def test_same_as_shotchart(self):
+        for bin_shape in ["square", "hexagon"]:
+            expected = Shotchart(shotchart_data=self.shots, league_average_data=self.league_average,
+                                 number_of_markers="large", bin_shape=bin_shape).create_bin_table()[EXPORT_COLUMNS]
+            bins, metadata = bin_table(self.shots, self.league_average, "large", bin_shape)
+            pd.testing.assert_frame_equal(bins, expected)
+            compact_bins, _ = bin_table(CompactShotTable.from_frame(self.shots), self.league_average, "large",
+                                        bin_shape)
+            pd.testing.assert_frame_equal(compact_bins, expected, check_dtype=False)
+            self.assertEqual(metadata["shots"], len(self.shots))
+            self.assertEqual(metadata["bin_shape"], bin_shape)
+
+    def test_compact_json(self):
+        buffer = io.BytesIO()
+        bins = export_bins(self.shots, self.league_average, buffer, "json")
+        document = json.loads(buffer.getvalue())
+        self.assertEqual(document["rows"], len(bins))
+        zones = document["vocabularies"]["SHOT_ZONE_BASIC"]
+        self.assertEqual([zones[code] for code in document["columns"]["SHOT_ZONE_BASIC"]],
+                         bins.SHOT_ZONE_BASIC.tolist())
+        np.testing.assert_allclose(document["columns"]["LOC_PERCENTAGE"], bins.LOC_PERCENTAGE, atol=0.005)
+        self.assertEqual(document["columns"]["ATTEMPTS"], bins.ATTEMPTS.tolist())
+        with self.assertRaises(ValueError):
+            export_bins(self.shots, self.league_average, "bins.csv")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_and_parquet(self):
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+
+        directory = tempfile.mkdtemp()
+        bins = export_bins(self.shots, self.league_average, os.path.join(directory, "bins.parquet"))
+        export_bins(self.shots, self.league_average, os.path.join(directory, "bins.arrow"))
+        for table in [pq.read_table(os.path.join(directory, "bins.parquet")),
+                      feather.read_table(os.path.join(directory, "bins.arrow"))]:
+            metadata = json.loads(table.schema.metadata[b"nba_shotcharts"])
+            self.assertEqual(metadata["shots"], len(self.shots))
+            frame = table.to_pandas()
+            for column in ["SHOT_ZONE_BASIC", "SHOT_ZONE_AREA", "SHOT_ZONE_RANGE"]:
+                frame[column] = frame[column].astype(object)
+            pd.testing.assert_frame_equal(frame, bins, check_dtype=False)
+
+    def test_matplotlib_is_not_imported(self):
+        code = ("import sys\n"
+                "from nba_shotcharts.shotcharts.export import export_bins\n"
+                "from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages\n"
+                "shots = generate_shots(500)\n"
+                "export_bins(shots, generate_league_averages(shots), sys.argv[1])\n"
+                "print(sorted(m for m in sys.modules if m.startswith(('matplotlib', 'seaborn'))))\n")
+        path = os.path.join(tempfile.mkdtemp(), "bins.json")
+        output = subprocess.check_output([sys.executable, "-c", code, path],
+                                         cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        self.assertEqual(output.decode().strip(), "[]")
+        self.assertTrue(os.path.getsize(path) > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import io
+import unittest
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pandas as pd  # noqa: E402
+
+from nba_shotcharts.shotcharts.binning import COMPARISON_RANGE  # noqa: E402
+from nba_shotcharts.shotcharts.compact import CompactShotTable  # noqa: E402
+from nba_shotcharts.shotcharts.facets import ShotchartGrid, FacetPanel  # noqa: E402
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup  # noqa: E402
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+
+class ShotchartGridTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shots = [generate_shots(800, seed=seed) for seed in range(5)]
+        self.league_average = generate_league_averages(self.shots[0])
+
+    def test_batched_bins_same_as_separate_shotcharts(self):
+        other_league_average = generate_league_averages(self.shots[1])
+        panels = [("First", self.shots[0]),
+                  FacetPanel("Second", self.shots[1], other_league_average),
+                  ("Compact", CompactShotTable.from_frame(self.shots[2])),
+                  ("Empty", self.shots[3].iloc[:0])]
+        for bin_shape in ["square", "hexagon"]:
+            grid = ShotchartGrid(panels, LeagueAverageLookup(self.league_average), number_of_markers="large",
+                                 bin_shape=bin_shape)
+            tables = grid.create_bin_tables()
+            self.assertIs(grid.create_bin_tables(), tables)
+            for table, shots, league_average in zip(tables, self.shots, [self.league_average, other_league_average,
+                                                                         self.league_average]):
+                expected = Shotchart(shots, league_average, number_of_markers="large",
+                                     bin_shape=bin_shape).create_bin_table()
+                pd.testing.assert_frame_equal(table, expected, check_dtype=False)
+            self.assertIsNone(tables[3])
+
+    def test_figure(self):
+        grid = ShotchartGrid([("Panel {}".format(index), shots) for index, shots in enumerate(self.shots)],
+                             self.league_average, columns=3, panel_size=3)
+        figure = grid.create_figure("Grid")
+        panels = [ax for ax in figure.axes if ax.get_title().startswith("Panel")]
+        self.assertEqual(len(panels), 5)
+        # Every panel has court lines as collections and shots with the same color scale
+        for ax in panels:
+            scatter = [collection for collection in ax.collections if collection.get_array() is not None]
+            self.assertEqual(len(scatter), 1)
+            self.assertEqual((scatter[0].norm.vmin, scatter[0].norm.vmax), COMPARISON_RANGE)
+            self.assertEqual(len(ax.collections), 3)
+        # Sixth cell of 2x3 grid is hidden
+        self.assertEqual(sum(not ax.get_visible() for ax in figure.axes), 1)
+        buffer = io.BytesIO()
+        grid.render(buffer, "Grid", "png")
+        self.assertTrue(buffer.getvalue().startswith(b"\x89PNG"))
+        with self.assertRaises(ValueError):
+            ShotchartGrid([], self.league_average)
+
+
+if __name__ == "__main__":
+    unittest.main()
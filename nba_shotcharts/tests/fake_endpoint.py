@@ -0,0 +1,21 @@
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class FakeShotChartDetail:
+    """
+    Local stand-in for nba_api's ShotChartDetail endpoint which returns synthetic data and records every request.
+    """
+    requests = []
+
+    def __init__(self, team_id, player_id, season_nullable, context_measure_simple, **kwargs):
+        FakeShotChartDetail.requests.append((player_id, season_nullable, context_measure_simple))
+        self.player_id = player_id
+        self.season = season_nullable
+
+    def get_data_frames(self):
+        seed = int(self.player_id) + int(self.season[:4])
+        shots = generate_shots(300, seed=seed, season=self.season)
+        # Real data is flipped and has back court shots
+        shots["LOC_X"] = -shots.LOC_X
+        shots.loc[0, "SHOT_ZONE_AREA"] = "Back Court(BC)"
+        return [shots, generate_league_averages(n_shots=5000, seed=int(self.season[:4]))]
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from nba_shotcharts.shotcharts.binning import compute_bin_indices, bin_number_y_for, COURT_WIDTH, COURT_HEIGHT, \
+    NORM_X, NORM_Y
+from nba_shotcharts.shotcharts.grid import BinGrid, get_bin_grid
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class BinGridTest(unittest.TestCase):
+
+    def setUp(self):
+        random = np.random.default_rng(3)
+        # Coordinates on the court and some far outside of the lookup tables
+        self.loc_x = np.concatenate([random.integers(-250, 251, 5000), [-1000, 1000, 250, -250]])
+        self.loc_y = np.concatenate([random.integers(-52, 420, 5000), [-1000, 2000, 0, -48]])
+
+    def test_square_bins_same_as_arithmetic(self):
+        for bin_number_x in [20.0, 30.0, 40.0, 17.0]:
+            grid = get_bin_grid(bin_number_x)
+            expected = compute_bin_indices(self.loc_x, self.loc_y, bin_number_x, bin_number_y_for(bin_number_x),
+                                           COURT_WIDTH, COURT_HEIGHT, NORM_X, NORM_Y)
+            for actual, wanted in zip(grid.bin_indices(self.loc_x, self.loc_y), expected):
+                np.testing.assert_array_equal(actual, wanted)
+            # Float coordinates are computed instead of looked up
+            for actual, wanted in zip(grid.bin_indices(self.loc_x + 0.5, self.loc_y - 0.25),
+                                      compute_bin_indices(self.loc_x + 0.5, self.loc_y - 0.25, bin_number_x,
+                                                          bin_number_y_for(bin_number_x), COURT_WIDTH, COURT_HEIGHT,
+                                                          NORM_X, NORM_Y)):
+                np.testing.assert_array_equal(actual, wanted)
+
+    def test_hexagons_are_nearest_centers(self):
+        grid = BinGrid(30.0, shape="hexagon")
+        x_bins, y_bins = grid.bin_indices(self.loc_x[:-4], self.loc_y[:-4])
+        center_x, center_y = grid.centers(x_bins, y_bins)
+        distance = np.hypot(self.loc_x[:-4] - center_x, self.loc_y[:-4] - center_y)
+
+        # Brute force over all hexagons around the court
+        columns, rows = np.meshgrid(np.arange(-2, 33), np.arange(-2, 70), indexing="ij")
+        all_x, all_y = grid.centers(columns.ravel(), rows.ravel())
+        nearest = np.hypot(self.loc_x[:-4, None] - all_x[None, :], self.loc_y[:-4, None] - all_y[None, :]).min(axis=1)
+        np.testing.assert_allclose(distance, nearest, atol=1e-9)
+        # No point is farther from its center than the circumradius of hexagon
+        self.assertLessEqual(distance.max(), grid.bin_size_x / np.sqrt(3) + 1e-9)
+        # Lookup tables give the same bins as computation
+        for actual, wanted in zip(grid.bin_indices(self.loc_x, self.loc_y),
+                                  grid.bin_indices(self.loc_x.astype(float), self.loc_y.astype(float))):
+            np.testing.assert_array_equal(actual, wanted)
+
+    def test_shared_grid(self):
+        self.assertIs(get_bin_grid(30.0), get_bin_grid(30.0))
+        self.assertIsNot(get_bin_grid(30.0), get_bin_grid(30.0, shape="hexagon"))
+        with self.assertRaises(ValueError):
+            BinGrid(30.0, shape="triangle")
+
+    def test_hexagonal_shotchart(self):
+        shots = generate_shots(2000, seed=4)
+        shotchart = Shotchart(shotchart_data=shots, league_average_data=generate_league_averages(shots),
+                              bin_shape="hexagon", marker="h", image_size="small")
+        bins = shotchart.create_bin_table()
+        self.assertEqual(bins.ATTEMPTS.sum(), len(shots))
+        binned = shotchart.create_bins()
+        # Every shot is drawn at the center of its hexagon
+        x_bins, y_bins = shotchart.grid.bin_indices(binned.LOC_X, binned.LOC_Y)
+        center_x, center_y = shotchart.grid.centers(x_bins, y_bins)
+        np.testing.assert_array_equal(binned.BIN_LOC_X.to_numpy(), center_x)
+        np.testing.assert_array_equal(binned.BIN_LOC_Y.to_numpy(), center_y)
+        self.assertLessEqual(bins.LOC_COUNTS.max(), shotchart.grid.max_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
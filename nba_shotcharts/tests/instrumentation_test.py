@@ -0,0 +1,105 @@
+import io
+import logging
+import tempfile
+import unittest
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from nba_shotcharts.shotcharts.cache import ShotchartCache  # noqa: E402
+from nba_shotcharts.shotcharts.data_retriever import DataRetrieverFactory  # noqa: E402
+from nba_shotcharts.shotcharts.instrumentation import Instrumentation  # noqa: E402
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup  # noqa: E402
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.tests.fake_endpoint import FakeShotChartDetail  # noqa: E402
+
+
+class InstrumentationTest(unittest.TestCase):
+
+    def setUp(self):
+        FakeShotChartDetail.requests = []
+        self.records = []
+        self.instrumentation = Instrumentation(callback=self.records.append)
+
+    def fetch(self, cache=None):
+        return DataRetrieverFactory.get_shotchart_league_averages(
+            "Russell Westbrook", season="2017-18", cache=cache, endpoint=FakeShotChartDetail,
+            instrumentation=self.instrumentation
+        )
+
+    def test_retrieval_stages(self):
+        cache = ShotchartCache(tempfile.mkdtemp(), current_season="2018-19")
+        dataset, _ = self.fetch(cache)
+        self.fetch(cache)
+        stages = [record.stage for record in self.records]
+        self.assertEqual(stages, ["find_player", "cache_read", "shotchart_detail", "cache_write", "filter_dataset",
+                                  "find_player", "cache_read", "filter_dataset"])
+        self.assertEqual(self.instrumentation.counters, {"cache_hits": 1, "cache_misses": 1})
+        self.assertEqual(self.records[2].rows, 300)
+        self.assertEqual(self.records[-1].rows, len(dataset))
+        self.assertTrue(all(record.seconds >= 0 and record.peak_bytes is None for record in self.records))
+
+    def test_shotchart_stages(self):
+        dataset, league_averages = self.fetch()
+        shotchart = Shotchart(dataset, league_averages, image_size="small", should_save_image=True,
+                              instrumentation=self.instrumentation)
+        figure = shotchart.create_figure("Instrumented")
+        Shotchart.save_figure(figure, io.BytesIO(), "png", instrumentation=self.instrumentation)
+        summary = self.instrumentation.summary()
+        for stage in ["league_average_build", "create_bins", "aggregate_bins", "bin_statistics",
+                      "league_average_lookup", "draw", "savefig"]:
+            self.assertEqual(summary[stage]["calls"], 1, stage)
+        self.assertEqual(summary["create_bins"]["rows"], len(dataset))
+        self.assertEqual(summary["league_average_lookup"]["rows"], summary["bin_statistics"]["rows"])
+        # Nested stages take part of the time of the outer stage
+        self.assertLessEqual(summary["bin_statistics"]["seconds"], summary["create_bins"]["seconds"])
+        self.assertLessEqual(summary["league_average_lookup"]["seconds"], summary["bin_statistics"]["seconds"])
+
+    def test_lookup_stage_with_prebuilt_lookup(self):
+        dataset, league_averages = self.fetch()
+        shotchart = Shotchart(dataset, LeagueAverageLookup(league_averages), instrumentation=self.instrumentation)
+        shotchart.create_bin_table()
+        summary = self.instrumentation.summary()
+        self.assertNotIn("league_average_build", summary)
+        self.assertEqual(summary["league_average_lookup"]["calls"], 1)
+
+    def test_peak_memory(self):
+        instrumentation = Instrumentation(trace_memory=True)
+        with instrumentation.stage("outer"):
+            with instrumentation.stage("inner"):
+                inner = bytearray(4000000)
+            del inner
+            small = bytearray(1000)
+        inner_record, outer_record = instrumentation.records
+        self.assertGreaterEqual(inner_record.peak_bytes, 4000000)
+        # Peak of the inner stage is also the peak of the outer stage
+        self.assertGreaterEqual(outer_record.peak_bytes, 4000000)
+        self.assertEqual(len(small), 1000)
+
+    def test_prometheus_text(self):
+        ticks = iter([0.0, 0.5, 1.0, 1.25])
+        instrumentation = Instrumentation(clock=lambda: next(ticks))
+        with instrumentation.stage("create_bins", rows=10):
+            pass
+        with instrumentation.stage("create_bins") as stage:
+            stage["rows"] = 5
+        instrumentation.count("cache_hits", 3)
+        text = instrumentation.prometheus_text()
+        self.assertIn('nba_shotcharts_stage_calls_total{stage="create_bins"} 2', text)
+        self.assertIn('nba_shotcharts_stage_seconds_total{stage="create_bins"} 0.75', text)
+        self.assertIn('nba_shotcharts_stage_rows_total{stage="create_bins"} 15', text)
+        self.assertIn("nba_shotcharts_cache_hits_total 3", text)
+        self.assertNotIn("peak_bytes", text)
+
+    def test_structured_log(self):
+        with self.instrumentation.stage("draw", rows=7):
+            pass
+        with self.assertLogs("nba_shotcharts.shotcharts.instrumentation", logging.INFO) as logs:
+            self.instrumentation.log()
+        self.assertEqual(logs.records[0].stage, "draw")
+        self.assertEqual(logs.records[0].rows, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class LeagueAverageLookupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.league_average = generate_league_averages(n_shots=20000)
+        self.lookup = LeagueAverageLookup(self.league_average)
+
+    def test_same_as_mask_lookup(self):
+        for row in self.league_average.itertuples():
+            expected = self.league_average.loc[
+                (self.league_average.SHOT_ZONE_BASIC == row.SHOT_ZONE_BASIC) &
+                (self.league_average.SHOT_ZONE_AREA == row.SHOT_ZONE_AREA) &
+                (self.league_average.SHOT_ZONE_RANGE == row.SHOT_ZONE_RANGE)].FG_PCT.iloc[0]
+            self.assertEqual(self.lookup.get(row.SHOT_ZONE_BASIC, row.SHOT_ZONE_AREA, row.SHOT_ZONE_RANGE), expected)
+
+    def test_missing_zone_falls_back(self):
+        mid_range = self.league_average.loc[self.league_average.SHOT_ZONE_BASIC == "Mid-Range"]
+        expected = mid_range.FGM.sum() / mid_range.FGA.sum()
+        self.assertAlmostEqual(self.lookup.get("Mid-Range", "Center(C)", "24+ ft."), expected)
+        overall = self.league_average.FGM.sum() / self.league_average.FGA.sum()
+        self.assertAlmostEqual(self.lookup.get("Backcourt", "Back Court(BC)", "Back Court Shot"), overall)
+
+        constant = LeagueAverageLookup(self.league_average, fallback=0.45)
+        self.assertEqual(constant.lookup(["Mid-Range", "Unknown"], ["Center(C)"] * 2, ["24+ ft."] * 2).tolist(),
+                         [0.45, 0.45])
+
+    def test_shared_between_shotcharts(self):
+        shots = generate_shots(500, seed=1)
+        binned = Shotchart(shotchart_data=shots, league_average_data=self.league_average).create_bins()
+        shared = Shotchart(shotchart_data=shots, league_average_data=self.lookup)
+        self.assertIs(shared.league_average_lookup, self.lookup)
+        np.testing.assert_array_equal(shared.create_bins().PCT_LEAGUE_COMPARISON_ZONE,
+                                      binned.PCT_LEAGUE_COMPARISON_ZONE)
+
+
+if __name__ == "__main__":
+    unittest.main()
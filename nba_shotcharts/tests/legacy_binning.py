@@ -0,0 +1,194 @@
+import operator
+from collections import Counter
+
+import numpy as np
+
+
+def legacy_create_bins(self):
+    """
+    Row by row implementation of Shotchart.create_bins, kept as a reference for tests and benchmarks of the
+    vectorized binning engine.
+
+    Method which creates bins the dataset into squared grid. This is used so that plot looks nicer than the raw
+    locations plot. Along with binning the data, the percentages per zones and for each bin are calculated here
+    and added to the copy of self.shotchart_data object so they can be used for plotting later.
+
+    :return: Returns the copied  self.shotchart_data pandas DataFrame object with additional info about the shots.
+    """
+    # Binned x and y coordinates
+    x_bins, y_bins = [], []
+    # Copying the dataset to add more data
+    copied_df = self.shotchart_data.copy()
+    # Keys are basically x_bin and y_bin
+    keys = []
+    # Counter of shots and shots made per locations
+    location_counts, location_made = Counter(), Counter()
+    # be found
+
+    # Size of elements in bin, they should be the same
+    bin_size_x = float(self.width) / float(self.bin_number_x)
+    bin_size_y = float(self.height) / float(self.bin_number_y)
+    # List for locations of shots
+    locations_annotated = []
+    # Counter of shots and shots made per zone
+    zones_counts, zones_made = Counter(), Counter()
+
+    # Maximum size of an element in one bin
+    max_size = int((int(bin_size_x) - 1) * (int(bin_size_y) - 1))
+
+    # Keys that are in restricted area will be stored here, this will be used for finding maximum number of shots
+    restricted_area_keys = []
+
+    # Dictionary which will determine the color of marker in bin
+    percentage_color_dict = {}
+
+    for i in range(len(self.shotchart_data)):
+
+        # Row from data frame
+        row = self.shotchart_data.iloc[i]
+
+        x_shot_orig, y_shot_orig = row.LOC_X, row.LOC_Y
+
+        # Normalize
+        x_shot = x_shot_orig + self.norm_x  # to put minimum to zero
+        y_shot = y_shot_orig + self.norm_y  # to put minimum to zero
+
+        # bin_index = (x_shot / w) * bin_size
+        curr_x_bin = 0 if x_shot == 0 else int((x_shot / float(self.width)) * self.bin_number_x)
+        curr_y_bin = 0 if y_shot == 0 else int((y_shot / float(self.height)) * self.bin_number_y)
+
+        # Key for dicts
+        key = (curr_x_bin, curr_y_bin)
+
+        if row.SHOT_ZONE_BASIC == "Restricted Area":
+            restricted_area_keys.append(key)
+
+        # Counting number of shots made and shots shot
+        keys.append(key)
+        location_counts[key] += 1
+        location_made[key] += row.SHOT_MADE_FLAG
+
+        basic_shot_zone, shot_zone_area = row.SHOT_ZONE_BASIC, row.SHOT_ZONE_AREA
+        zone_dist = row.SHOT_ZONE_RANGE
+
+        area_code = shot_zone_area.split("(")[1].split(")")[0]
+        if "3" in basic_shot_zone:
+            locations_annotated.append("3" + area_code)
+        elif "Paint" in basic_shot_zone:
+            locations_annotated.append("P" + area_code + zone_dist[0])
+        elif "Mid" in basic_shot_zone:
+            locations_annotated.append("M" + area_code + zone_dist[0])
+        else:
+            locations_annotated.append("R" + area_code)
+
+        # Creating key for zones
+        zone_key = (basic_shot_zone, shot_zone_area, zone_dist)
+
+        # Counting the occurences based on both bin_key and zone_key, because of that we have dict in dict
+        if key in percentage_color_dict:
+            if zone_key in percentage_color_dict[key]:
+                percentage_color_dict[key][zone_key] = percentage_color_dict[key][zone_key] + 1
+            else:
+                percentage_color_dict[key][zone_key] = 1
+        else:
+            percentage_color_dict[key] = {}
+            percentage_color_dict[key][zone_key] = 1
+
+        zones_counts[zone_key] += 1
+
+        if row.SHOT_MADE_FLAG:
+            zones_made[zone_key] += 1
+
+    shot_locations_percentage = []  # percentage in given bin
+    shot_locations_counts = []
+    raw_counts = []
+    # List which contains comparison for each shot with league average in that zone
+    shot_comparison = []
+    # List which contains comparison of player's shooting in zone vs league average
+    per_zone_comparison = []
+    per_zone_percentage = []
+
+    # Finding the maximal number of shots from data
+    non_ra = []
+    for key in location_counts:
+        if key not in restricted_area_keys:
+            if location_counts[key] not in non_ra:
+                non_ra.append(location_counts[key])
+
+    sorted_non_ra = sorted(non_ra)
+    max_out_of_restricted = float(sorted_non_ra[-1])
+
+    for j in range(len(self.shotchart_data)):
+        key = keys[j]
+        x_bin, y_bin = key[0], key[1]
+        shot_percent = float(location_made[key]) / location_counts[key]
+        # shot_percent = np.clip(shot_percent, 0.3, 0.7)
+        shot_locations_percentage.append(shot_percent * 100)
+        if self.league_average is not None:
+            # Getting info about zone
+            # We are getting that info from
+            per_zone_counter_from_percentage_color_dict = percentage_color_dict[key]
+            zone_key = max(per_zone_counter_from_percentage_color_dict.items(),
+                           key=operator.itemgetter(1))[0]
+
+            shot_zone_basic = zone_key[0]
+            shot_zone_area = zone_key[1]
+            distance = zone_key[2]
+
+            # Calculating the percentage in current zone
+            zone_percent = 0.0 if zone_key not in zones_made else float(zones_made[zone_key]) / \
+                                                                  float(zones_counts[zone_key])
+
+            # Retrieving league average percentage for current zone
+            avg_percentage = self.league_average.loc[
+                (self.league_average.SHOT_ZONE_BASIC == shot_zone_basic) &
+                (self.league_average.SHOT_ZONE_AREA == shot_zone_area) &
+                (self.league_average.SHOT_ZONE_RANGE == distance)].FG_PCT.iloc[
+                0
+            ]
+            # Comparison of league average and each shot
+            shot_comparison.append(np.clip((shot_percent - avg_percentage) * 100, -10, 10))
+            # Comparison of zone and league average
+            per_zone_comparison.append(np.clip((zone_percent - avg_percentage) * 100, -10, 10))
+            # Percentage of shot in current zone, kinda inaccurate info, good for some other type of plot
+            per_zone_percentage.append(np.clip(zone_percent * 100, 35, 65))
+
+        # Calculating value to which the markers will be scaled later on
+        # The data in restricted is scaled to maximum out of restricted area, because players usually have a lot
+        # more shots in restricted area
+        value_to_scale = max_out_of_restricted if location_counts[key] > max_out_of_restricted else \
+            location_counts[key]
+        # Storing the data into a list
+        shot_locations_counts.append((float(value_to_scale) / max_out_of_restricted) * max_size)
+
+        # Count of shots per bin
+        raw_counts.append(location_counts[key])
+
+        # Middle of current and next bin is where we will place the marker in real coordinates
+        unbinned_x = ((x_bin * float(self.width)) / self.bin_number_x + (
+                (x_bin + 1) * float(self.width)) / self.bin_number_x) / 2 - self.norm_x
+        unbinned_y = ((y_bin * float(self.height)) / self.bin_number_y + (
+                (y_bin + 1) * float(self.height)) / self.bin_number_y) / 2 - self.norm_y
+
+        # Adding binned locations
+        x_bins.append(unbinned_x)
+        y_bins.append(unbinned_y)
+
+    # Binned locations
+    copied_df['BIN_LOC_X'] = x_bins
+    copied_df['BIN_LOC_Y'] = y_bins
+    # Percentage comparison with league averages
+    if self.league_average is not None:
+        # Comparison of each shot with league average for that zone
+        copied_df['PCT_LEAGUE_AVG_COMPARISON'] = shot_comparison
+        # Comparison of each zone with league average for that zone
+        copied_df['PCT_LEAGUE_COMPARISON_ZONE'] = per_zone_comparison
+    # Percentage of shots for that location
+    copied_df['LOC_PERCENTAGE'] = shot_locations_percentage
+    # Percentage of whole zone (not in comparison with league average)
+    copied_df['LOC_ZONE_PERCENTAGE'] = per_zone_percentage
+    # Scaled count of shots and count of shots per bin
+    copied_df['LOC_COUNTS'] = shot_locations_counts
+    copied_df['LOC_RAW_COUNTS'] = raw_counts
+
+    return copied_df
@@ -1,21 +1,23 @@
+import io
+import os
 import unittest
 
-from nba_stats.retrieval.api_retriever_factory import ApiRetrieverFactory
+from nba_shotcharts.shotcharts.data_retriever import DataRetrieverFactory
 from nba_shotcharts.shotcharts.shotchart import Shotchart
 
 
 # Test for whole pipeline, retrieval of data and shotchart
+@unittest.skipUnless(os.environ.get("NBA_SHOTCHARTS_NETWORK_TESTS"), "Set NBA_SHOTCHARTS_NETWORK_TESTS to run "
+                                                                     "tests which use stats.nba.com")
 class PipelineTest(unittest.TestCase):
 
-    def plot_westbrook_shots_test(self):
-        westbrook_id = "201566"
-        retriever = ApiRetrieverFactory.create_regular_shotchart_retriever_for_player(player_id=westbrook_id,
-                                                                                      season="2017-18")
-        data = retriever.get_shotchart()
-        league_average = retriever.get_league_averages()
-
-        shotchart = Shotchart(shotchart_data=data, league_average_data=league_average)
-        shotchart.plot_shotchart("Westbrook shot chart")
+    def test_plot_westbrook_shots(self):
+        data, league_average = DataRetrieverFactory.get_shotchart_league_averages("Russell Westbrook",
+                                                                                  season="2017-18")
+        shotchart = Shotchart(shotchart_data=data, league_average_data=league_average, should_save_image=True)
+        buffer = io.BytesIO()
+        Shotchart.save_figure(shotchart.create_figure("Westbrook shot chart"), buffer, "png")
+        self.assertTrue(buffer.getvalue().startswith(b"\x89PNG"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+import unittest
+
+from nba_shotcharts.shotcharts.player_index import PlayerIndex, normalize_name, get_player_index
+from nba_shotcharts.utils.data_constants import CURRENT_SEASON
+
+PLAYERS = [
+    {"id": 1, "full_name": "Patrick Ewing", "first_name": "Patrick", "last_name": "Ewing", "is_active": False},
+    {"id": 2, "full_name": "Patrick Ewing", "first_name": "Patrick", "last_name": "Ewing", "is_active": True},
+    {"id": 3, "full_name": "Nikola Jokić", "first_name": "Nikola", "last_name": "Jokić", "is_active": True},
+    {"id": 4, "full_name": "Shaquille O'Neal", "first_name": "Shaquille", "last_name": "O'Neal", "is_active": False},
+    {"id": 5, "full_name": "J.J. Redick", "first_name": "J.J.", "last_name": "Redick", "is_active": False},
+    {"id": 6, "full_name": "Nikola Vučević", "first_name": "Nikola", "last_name": "Vučević", "is_active": True}
+]
+
+
+class PlayerIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.roster_requests = []
+        self.index = PlayerIndex(PLAYERS, roster_lookup=self.roster)
+
+    def roster(self, team_id, season):
+        self.roster_requests.append((team_id, season))
+        return {1} if team_id == 10 else {2}
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("  Nikola   JOKIĆ "), "nikola jokic")
+        self.assertEqual(normalize_name("Shaquille O'Neal"), "shaquille oneal")
+        self.assertEqual(normalize_name("J.J. Redick"), "jj redick")
+        self.assertEqual(normalize_name("Karl-Anthony Towns"), "karl anthony towns")
+
+    def test_exact_lookup(self):
+        self.assertEqual(self.index.resolve("nikola jokic")["id"], 3)
+        self.assertEqual(self.index.resolve("Shaquille ONeal")["id"], 4)
+        self.assertEqual(self.index.resolve("Redick")["id"], 5)
+        self.assertEqual(self.index.resolve("6")["id"], 6)
+        # Part of the name is found the same way as with nba_api's search
+        self.assertEqual(self.index.resolve("quille")["id"], 4)
+        with self.assertRaises(ValueError):
+            self.index.resolve("Michael Jordan")
+
+    def test_disambiguation(self):
+        self.assertEqual(self.index.resolve("Patrick Ewing", team_id=10, season="1990-91")["id"], 1)
+        self.assertEqual(self.index.resolve("Patrick Ewing", team_id="20", season="2012-13")["id"], 2)
+        self.index.resolve("Patrick Ewing", team_id=10, season="1990-91")
+        # Rosters are memoized
+        self.assertEqual(self.roster_requests, [(10, "1990-91"), (20, "2012-13")])
+        # Without team, active player is preferred in the current season
+        self.assertEqual(self.index.resolve("Patrick Ewing", season=CURRENT_SEASON)["id"], 2)
+        self.assertEqual(self.index.resolve("Patrick Ewing", season="1990-91")["id"], 1)
+        # Unique names never need rosters
+        self.index.resolve("Nikola Jokic", team_id=30)
+        self.assertEqual(len(self.roster_requests), 2)
+
+    def test_search(self):
+        self.assertEqual([player["id"] for player in self.index.search("nik")], [3, 6])
+        self.assertEqual([player["id"] for player in self.index.search("vuc")], [6])
+        self.assertEqual([player["id"] for player in self.index.search("patrick e")], [2, 1])
+        self.assertEqual(self.index.search(""), [])
+        self.assertEqual([player["id"] for player in self.index.fuzzy_search("Nicola Jokic")], [3])
+
+    def test_shared_index(self):
+        index = get_player_index()
+        self.assertIs(index, get_player_index())
+        self.assertEqual(index.resolve("Russell Westbrook")["id"], 201566)
+
+
+if __name__ == "__main__":
+    unittest.main()
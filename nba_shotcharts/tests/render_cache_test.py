@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from nba_shotcharts.shotcharts.compact import CompactShotTable  # noqa: E402
+from nba_shotcharts.shotcharts.league_averages import LeagueAverageLookup  # noqa: E402
+from nba_shotcharts.shotcharts.render_cache import RenderCache, render_key  # noqa: E402
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.utils.custom_marker import get_smooth_square  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+
+class CountingRender:
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, shotchart, title):
+        self.calls += 1
+        return "{}:{}".format(title, self.calls).encode() * 100
+
+
+class RenderCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shots = generate_shots(800, seed=5)
+        self.lookup = LeagueAverageLookup(generate_league_averages(self.shots))
+
+    def shotchart(self, shots=None, **options):
+        return Shotchart(shotchart_data=self.shots if shots is None else shots, league_average_data=self.lookup,
+                         **options)
+
+    def test_key_depends_on_data_and_style(self):
+        key = render_key(self.shotchart(), "Player")
+        # Equal data in a new frame with other columns and index gives the same key
+        copied = self.shots.copy().assign(EXTRA=1)
+        copied.index = copied.index + 1000
+        self.assertEqual(render_key(self.shotchart(copied), "Player"), key)
+        self.assertEqual(render_key(self.shotchart(CompactShotTable.from_frame(self.shots)), "Player"),
+                         render_key(self.shotchart(CompactShotTable.from_frame(copied)), "Player"))
+
+        changed = self.shots.copy()
+        changed.loc[changed.index[0], "SHOT_MADE_FLAG"] = 1 - changed.SHOT_MADE_FLAG.iloc[0]
+        others = [
+            render_key(self.shotchart(changed), "Player"),
+            render_key(self.shotchart(), "Other player"),
+            render_key(self.shotchart(court_color="light"), "Player"),
+            render_key(self.shotchart(image_size="small"), "Player"),
+            render_key(self.shotchart(number_of_markers="large"), "Player"),
+            render_key(self.shotchart(marker="h"), "Player"),
+            render_key(self.shotchart(marker=get_smooth_square()), "Player"),
+            render_key(self.shotchart(marker_scaling="sqrt"), "Player"),
+            render_key(Shotchart(shotchart_data=self.shots, league_average_data=None), "Player"),
+        ]
+        self.assertEqual(len(set(others + [key])), len(others) + 1)
+
+    def test_hit_is_not_rendered_again(self):
+        render = CountingRender()
+        cache = RenderCache(render=render)
+        first = cache.render(self.shotchart(), "Player")
+        self.assertEqual(cache.render(self.shotchart(), "Player"), first)
+        self.assertEqual((render.calls, cache.memory_hits, cache.misses), (1, 1, 1))
+        cache.render(self.shotchart(court_color="light"), "Player")
+        self.assertEqual(render.calls, 2)
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        cache = RenderCache(max_memory_items=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+        self.assertEqual(list(cache.memory), ["a", "c"])
+        cache = RenderCache(max_memory_bytes=10)
+        cache.put("a", b"1" * 6)
+        cache.put("b", b"2" * 6)
+        self.assertEqual((list(cache.memory), cache.memory_bytes), (["b"], 6))
+
+    def test_disk_tier_is_shared_and_limited(self):
+        directory = tempfile.mkdtemp()
+        render = CountingRender()
+        image = RenderCache(directory, render=render).render(self.shotchart(), "Player")
+        cache = RenderCache(directory, render=render)
+        self.assertEqual(cache.render(self.shotchart(), "Player"), image)
+        self.assertEqual((render.calls, cache.disk_hits), (1, 1))
+        # Image read from disk is kept in memory
+        cache.render(self.shotchart(), "Player")
+        self.assertEqual(cache.memory_hits, 1)
+
+        cache = RenderCache(directory, max_disk_bytes=250)
+        cache.clear()
+        for index, key in enumerate(["a", "b", "c"]):
+            cache.put(key, b"x" * 100)
+            os.utime(os.path.join(directory, key + ".png"), (index, index))
+        cache.evict()
+        self.assertEqual(sorted(os.listdir(directory)), ["b.png", "c.png"])
+        self.assertEqual(cache.disk_bytes, 200)
+
+        # Images written by other caches in the same directory count against the limit once it is scanned
+        cache.clear()
+        first = RenderCache(directory, max_disk_bytes=250)
+        second = RenderCache(directory, max_disk_bytes=250, rescan_interval=2)
+        first.put("a", b"x" * 100)
+        first.put("b", b"x" * 100)
+        os.utime(os.path.join(directory, "a.png"), (0, 0))
+        second.put("c", b"x" * 30)
+        self.assertEqual(len(os.listdir(directory)), 3)
+        second.put("d", b"x" * 30)
+        self.assertEqual(sorted(os.listdir(directory)), ["b.png", "c.png", "d.png"])
+        self.assertEqual(second.disk_bytes, 160)
+
+    def test_writes_under_limit_dont_scan_directory(self):
+        cache = RenderCache(tempfile.mkdtemp(), max_disk_bytes=500)
+        with mock.patch.object(cache, "disk_entries", wraps=cache.disk_entries) as disk_entries:
+            for index in range(10):
+                cache.put(str(index), b"x" * 50)
+            self.assertEqual(disk_entries.call_count, 0)
+            # Crossing the limit scans the directory and evicts
+            cache.put("10", b"x" * 50)
+            self.assertEqual(disk_entries.call_count, 1)
+        self.assertEqual(cache.disk_bytes, 500)
+
+    def test_renders_png(self):
+        image = RenderCache().render(self.shotchart(image_size="small"), "Player")
+        self.assertTrue(image.startswith(b"\x89PNG"))
+
+
+if __name__ == "__main__":
+    unittest.main()
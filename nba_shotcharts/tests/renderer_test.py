@@ -0,0 +1,126 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from nba_shotcharts.shotcharts.court_template import CourtTemplate  # noqa: E402
+from nba_shotcharts.shotcharts.renderer import ShotchartRenderer  # noqa: E402
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+
+class ShotchartRendererTest(unittest.TestCase):
+
+    def setUp(self):
+        league_average = generate_league_averages(n_shots=20000)
+        self.shotcharts = [Shotchart(shotchart_data=generate_shots(500, seed=seed), league_average_data=league_average,
+                                     image_size="small", should_save_image=True) for seed in range(6)]
+        self.binned = [shotchart.create_bins() for shotchart in self.shotcharts]
+
+    def test_same_as_court_template(self):
+        renderer = ShotchartRenderer(pool_size=2)
+        template = CourtTemplate(self.shotcharts[0])
+        for shotchart, binned_df in zip(self.shotcharts, self.binned):
+            self.assertEqual(renderer.render(shotchart, "Player", binned_df),
+                             template.render_png(binned_df, "Player"))
+
+    def test_concurrent_requests(self):
+        renderer = ShotchartRenderer(pool_size=2)
+        expected = [renderer.render(shotchart, str(index), binned_df)
+                    for index, (shotchart, binned_df) in enumerate(zip(self.shotcharts, self.binned))]
+
+        def request(index):
+            index = index % len(self.shotcharts)
+            return index, renderer.render(self.shotcharts[index], str(index), self.binned[index])
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            for index, image in executor.map(request, range(24)):
+                self.assertEqual(image, expected[index])
+        # Figures are reused, the pool never grows over its size
+        self.assertEqual(list(renderer.figures().values()), [2])
+
+    def test_waiting_requests_are_served_in_order(self):
+        renderer = ShotchartRenderer(pool_size=1)
+        shotchart = self.shotcharts[0]
+        busy = renderer._acquire(shotchart)
+        order = []
+        threads = []
+        for index in range(3):
+            started = threading.Event()
+
+            def wait(index=index, started=started):
+                started.set()
+                template = renderer._acquire(shotchart)
+                order.append(index)
+                renderer._release(shotchart, template)
+
+            threads.append(threading.Thread(target=wait))
+            threads[-1].start()
+            started.wait()
+            # Thread is waiting for the figure before the next one starts
+            while len(renderer._pools[shotchart.style_key()].waiting) <= index:
+                threading.Event().wait(0.001)
+        renderer._release(shotchart, busy)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, [0, 1, 2])
+
+    def test_failed_build_wakes_waiting_request(self):
+        renderer = ShotchartRenderer(pool_size=1)
+        shotchart = self.shotcharts[0]
+        building = threading.Event()
+        fail = threading.Event()
+        calls = []
+
+        def failing_template(shotchart):
+            calls.append(shotchart)
+            building.set()
+            fail.wait()
+            raise RuntimeError("build failed")
+
+        errors = []
+
+        def request():
+            try:
+                renderer._acquire(shotchart)
+            except RuntimeError as error:
+                errors.append(error)
+
+        with mock.patch("nba_shotcharts.shotcharts.renderer.CourtTemplate", failing_template):
+            first = threading.Thread(target=request)
+            first.start()
+            building.wait()
+            second = threading.Thread(target=request)
+            second.start()
+            while not renderer._pools[shotchart.style_key()].waiting:
+                threading.Event().wait(0.001)
+            fail.set()
+            first.join(5)
+            second.join(5)
+        self.assertFalse(first.is_alive() or second.is_alive())
+        # Waiting request got the slot of the failed figure and tried to build it
+        self.assertEqual((len(calls), len(errors)), (2, 2))
+        self.assertEqual(renderer.figures(), {shotchart.style_key(): 0})
+        # Pool works again after the failures
+        self.assertEqual(renderer.render(shotchart, "Player", self.binned[0])[:4], b"\x89PNG")
+
+    def test_response_buffer_releases_figure(self):
+        shotchart = self.shotcharts[0]
+        figures = len(plt.get_fignums())
+        buffer = shotchart.plot_shotchart("Player", is_plot_for_response=True)
+        self.assertEqual(buffer.read(4), b"\x89PNG")
+        self.assertEqual(len(plt.get_fignums()), figures)
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            ShotchartRenderer(pool_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
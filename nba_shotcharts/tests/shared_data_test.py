@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pandas as pd  # noqa: E402
+
+from nba_shotcharts.shotcharts.batch_renderer import BatchRenderer, RenderJob  # noqa: E402
+from nba_shotcharts.shotcharts import shared_data  # noqa: E402
+from nba_shotcharts.shotcharts.shared_data import SharedDataset  # noqa: E402
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+
+def _worker_bin_table(selection):
+    shots, league_average_lookup = selection.resolve()
+    return Shotchart(shotchart_data=shots, league_average_data=league_average_lookup).create_bin_table()
+
+
+def _worker_attached(selection):
+    selection.resolve()
+    return sorted(shared_data._attached)
+
+
+class SharedDatasetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shots = generate_shots(3000, seed=21, n_players=4)
+        self.league_average = generate_league_averages(self.shots)
+        self.dataset = SharedDataset.publish(self.shots, self.league_average)
+        self.addCleanup(self.dataset.close)
+
+    def expected_bin_table(self, player_id):
+        shots = self.shots.loc[self.shots.PLAYER_ID == player_id]
+        return Shotchart(shotchart_data=shots, league_average_data=self.league_average).create_bin_table()
+
+    def test_player_ranges(self):
+        self.assertEqual(len(self.dataset), len(self.shots))
+        self.assertEqual(sorted(self.dataset.ranges), sorted(self.shots.PLAYER_ID.unique()))
+        for player_id in self.dataset.ranges:
+            shots = self.dataset.select(player_id).resolve()[0]
+            self.assertTrue((shots.columns["PLAYER_ID"] == player_id).all())
+            # Rows are views of shared memory which can't be changed
+            self.assertFalse(shots.columns["LOC_X"].flags.writeable)
+            pd.testing.assert_frame_equal(self.dataset.shotchart(player_id).create_bin_table(),
+                                          self.expected_bin_table(player_id), check_dtype=False)
+        with self.assertRaises(ValueError):
+            self.dataset.select(-1)
+
+    def test_workers_attach(self):
+        player_ids = sorted(self.dataset.ranges)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            tables = list(executor.map(_worker_bin_table, [self.dataset.select(player_id)
+                                                           for player_id in player_ids]))
+        for player_id, table in zip(player_ids, tables):
+            pd.testing.assert_frame_equal(table, self.expected_bin_table(player_id), check_dtype=False)
+
+    def test_workers_detach_unlinked_datasets(self):
+        old = SharedDataset.publish(self.shots, self.league_average)
+        self.addCleanup(old.close)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            player_id = sorted(old.ranges)[0]
+            self.assertEqual(executor.submit(_worker_attached, old.select(player_id)).result(), [old.handle.name])
+            old.close()
+            # Worker keeps only the dataset which still exists
+            self.assertEqual(executor.submit(_worker_attached, self.dataset.select(player_id)).result(),
+                             [self.dataset.handle.name])
+
+    def test_detach(self):
+        handle = self.dataset.handle
+        self.dataset.select(sorted(self.dataset.ranges)[0]).resolve()
+        self.assertTrue(SharedDataset.detach(handle))
+        self.assertFalse(SharedDataset.detach(handle))
+        self.assertNotIn(handle.name, shared_data._attached)
+
+    def test_batch_renderer_with_selections(self):
+        directory = tempfile.mkdtemp()
+        jobs = [RenderJob(str(player_id), "Player", self.dataset.select(player_id), None, {"image_size": "small"})
+                for player_id in self.dataset.ranges]
+        report = BatchRenderer(directory, max_workers=1).render(jobs)
+        self.assertEqual(report.failed, 0, report.errors)
+        self.assertEqual(len(os.listdir(directory)), len(jobs))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+
+class StartupTest(unittest.TestCase):
+
+    def test_plotting_modules_are_loaded_lazily(self):
+        code = ("import sys\n"
+                "import nba_shotcharts.shotcharts.shotchart\n"
+                "import nba_shotcharts.shotcharts.aggregation\n"
+                "print(sorted(m for m in ('matplotlib.pyplot', 'seaborn', 'nba_api') if m in sys.modules))\n")
+        output = subprocess.check_output([sys.executable, "-c", code],
+                                         cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        self.assertEqual(output.decode().strip(), "[]")
+
+    def test_cmap_and_marker_are_shared(self):
+        shots = generate_shots(200, seed=2)
+        league_average = generate_league_averages(shots)
+        first = Shotchart(shotchart_data=shots, league_average_data=league_average)
+        second = Shotchart(shotchart_data=shots, league_average_data=league_average, court_color="light")
+        self.assertIs(first.cmap, second.cmap)
+        self.assertIs(first.marker, second.marker)
+        self.assertEqual(Shotchart(shots, league_average, marker="h").marker, "h")
+        self.assertIsNotNone(first.create_figure("Startup"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+from nba_shotcharts.shotcharts.data_retriever import DataRetrieverFactory
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.shotcharts.streaming import stream_bins, read_shot_chunks
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class StreamingTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        shots = generate_shots(5000, seed=13, n_players=3)
+        cls.league_average = generate_league_averages(shots)
+        # Shot logs are stored as returned by ShotChartDetail
+        raw = shots.copy()
+        raw["LOC_X"] = -raw.LOC_X
+        raw.loc[raw.index[::97], "SHOT_ZONE_AREA"] = "Back Court(BC)"
+        raw.loc[raw.index[::89], "LOC_Y"] = 420
+        cls.shots = DataRetrieverFactory.filter_dataset(raw)
+        cls.directory = tempfile.mkdtemp()
+        raw.to_csv(os.path.join(cls.directory, "shots.csv"), index=False)
+        raw.to_parquet(os.path.join(cls.directory, "shots.parquet"), index=False, row_group_size=700)
+
+    def assert_same_bins(self, accumulator, shots):
+        expected = Shotchart(shotchart_data=shots, league_average_data=self.league_average).create_bin_table()
+        streamed = accumulator.shotchart(self.league_average).create_bin_table()
+        pd.testing.assert_frame_equal(streamed, expected, check_exact=True, check_dtype=False)
+
+    def test_stream_csv_and_parquet(self):
+        for file_name in ["shots.csv", "shots.parquet"]:
+            accumulator = stream_bins(os.path.join(self.directory, file_name), chunk_size=600)
+            self.assertEqual(accumulator.shots_seen, len(self.shots))
+            self.assert_same_bins(accumulator, self.shots)
+
+    def test_only_needed_columns_are_read(self):
+        chunk = next(read_shot_chunks(os.path.join(self.directory, "shots.parquet"), chunk_size=600))
+        self.assertEqual(set(chunk.columns), {"LOC_X", "LOC_Y", "SHOT_MADE_FLAG", "SHOT_ZONE_BASIC",
+                                              "SHOT_ZONE_AREA", "SHOT_ZONE_RANGE"})
+        self.assertLessEqual(len(chunk), 600)
+
+    def test_grouped_by_player(self):
+        accumulators = stream_bins(os.path.join(self.directory, "shots.csv"), chunk_size=1000, group_by="PLAYER_ID")
+        self.assertEqual(set(accumulators), set(self.shots.PLAYER_ID))
+        for player_id, accumulator in accumulators.items():
+            self.assert_same_bins(accumulator, self.shots.loc[self.shots.PLAYER_ID == player_id])
+
+    def test_raw_logs_are_read_without_nba_api(self):
+        code = ("import sys\n"
+                "from nba_shotcharts.shotcharts.streaming import stream_bins\n"
+                "stream_bins(sys.argv[1], chunk_size=1000)\n"
+                "print('nba_api' in sys.modules)\n")
+        output = subprocess.check_output([sys.executable, "-c", code, os.path.join(self.directory, "shots.csv")],
+                                         cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        self.assertEqual(output.decode().strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
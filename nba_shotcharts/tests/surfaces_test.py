@@ -0,0 +1,77 @@
+import io
+import unittest
+
+import numpy as np
+
+from nba_shotcharts.shotcharts.compact import CompactShotTable
+from nba_shotcharts.shotcharts.shotchart import Shotchart
+from nba_shotcharts.shotcharts.surfaces import smooth, compute_surfaces
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages
+
+
+class SurfacesTest(unittest.TestCase):
+
+    def test_smooth_same_as_direct_convolution(self):
+        random = np.random.default_rng(0)
+        raster = random.poisson(1.0, size=(12, 15)).astype(float)
+        sigma = 1.5
+        smoothed = smooth(raster, sigma)
+
+        # Direct convolution with the same kernel, zeros outside of the raster
+        radius = int(np.ceil(3 * sigma))
+        offsets = np.arange(-radius, radius + 1)
+        kernel = np.exp(-(offsets[:, None] ** 2 + offsets[None, :] ** 2) / (2 * sigma ** 2))
+        padded = np.pad(raster, radius)
+        expected = np.zeros_like(raster)
+        for row in range(raster.shape[0]):
+            for column in range(raster.shape[1]):
+                window = padded[row:row + 2 * radius + 1, column:column + 2 * radius + 1]
+                expected[row, column] = (window * kernel).sum()
+        # Kernel of FFT is normalized over the whole padded raster, which includes the tails beyond the radius
+        np.testing.assert_allclose(smoothed, expected / kernel.sum(), rtol=2e-2, atol=1e-3)
+
+    def test_efficiency_surface(self):
+        # All shots are made from one spot, while league makes half of them
+        loc_x = np.zeros(50, dtype=np.int64)
+        loc_y = np.full(50, 100, dtype=np.int64)
+        surfaces = compute_surfaces(loc_x, loc_y, np.ones(50), np.full(50, 0.5), resolution=50, bandwidth=20.0)
+        self.assertAlmostEqual(surfaces.attempts.sum(), 50, delta=0.5)
+        self.assertAlmostEqual(surfaces.density.sum(), 1.0)
+        peak = np.unravel_index(surfaces.attempts.argmax(), surfaces.attempts.shape)
+        self.assertAlmostEqual(surfaces.efficiency[peak], 50.0)
+        # Far from the shots there is no efficiency
+        self.assertTrue(np.isnan(surfaces.efficiency[0, 0]))
+        x_start, x_end, y_start, y_end = surfaces.extent
+        self.assertEqual((x_start, x_end, y_start, y_end), (-250, 250, -48.5, 421.5))
+
+    def test_shotchart_surfaces(self):
+        shots = generate_shots(3000, seed=8)
+        league_average = generate_league_averages(shots)
+        shotchart = Shotchart(shotchart_data=shots, league_average_data=league_average, image_size="small",
+                              should_save_image=True)
+        surfaces = shotchart.create_surfaces(resolution=80)
+        self.assertIs(shotchart.create_surfaces(resolution=80), surfaces)
+        self.assertEqual(surfaces.attempts.shape, (76, 80))
+
+        compact = Shotchart(shotchart_data=CompactShotTable.from_frame(shots), league_average_data=league_average)
+        np.testing.assert_allclose(compact.create_surfaces(resolution=80).efficiency, surfaces.efficiency)
+
+        for mode in ["efficiency", "density"]:
+            for style in ["imshow", "contourf"]:
+                buffer = io.BytesIO()
+                Shotchart.save_figure(shotchart.create_surface_figure(mode, mode, style, resolution=80), buffer,
+                                      "png")
+                self.assertTrue(buffer.getvalue().startswith(b"\x89PNG"))
+        with self.assertRaises(ValueError):
+            shotchart.create_surface_figure("Player", mode="frequency")
+
+    def test_surfaces_need_shots(self):
+        shots = generate_shots(500, seed=9)
+        shotchart = Shotchart(shotchart_data=None, league_average_data=generate_league_averages(shots),
+                              bin_aggregate=Shotchart(shots, None).aggregate_bins())
+        with self.assertRaises(ValueError):
+            shotchart.create_surfaces()
+
+
+if __name__ == "__main__":
+    unittest.main()
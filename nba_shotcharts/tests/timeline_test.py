@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from nba_shotcharts.shotcharts.shotchart import Shotchart  # noqa: E402
+from nba_shotcharts.shotcharts.timeline import ShotTimeline, _write_mp4  # noqa: E402
+from nba_shotcharts.utils.synthetic_data import generate_shots, generate_league_averages  # noqa: E402
+
+
+class ShotTimelineTest(unittest.TestCase):
+
+    def setUp(self):
+        # Shots are shuffled, timeline sorts them by date
+        self.shots = generate_shots(1500, seed=17, n_games=30).sample(frac=1.0, random_state=1)
+        self.league_average = generate_league_averages(self.shots)
+        self.timeline = ShotTimeline(self.shots, number_of_markers="large")
+        self.ordered = self.shots.sort_values(["GAME_DATE", "GAME_ID"], kind="mergesort")
+
+    def expected_bin_table(self, start, stop, marker_scaling="linear"):
+        games = self.timeline.game_ids[start:stop]
+        shots = self.ordered.loc[self.ordered.GAME_ID.isin(games)]
+        return Shotchart(shotchart_data=shots, league_average_data=self.league_average, number_of_markers="large",
+                         marker_scaling=marker_scaling).create_bin_table()
+
+    def test_windows_same_as_binning_shots_of_games(self):
+        self.assertEqual(len(self.timeline), self.shots.GAME_ID.nunique())
+        for start, stop in [(0, 30), (0, 1), (7, 17), (29, 30), (-5, None)]:
+            expected = self.expected_bin_table(start, stop)
+            pd.testing.assert_frame_equal(self.timeline.bin_table(start, stop, self.league_average), expected,
+                                          check_dtype=False)
+        pd.testing.assert_frame_equal(self.timeline.last_games(5), self.timeline.window(25, 30))
+        self.assertEqual(self.timeline.window().ATTEMPTS.sum(), len(self.shots))
+        with self.assertRaises(ValueError):
+            self.timeline.window(10, 10)
+
+    def test_marker_scaling(self):
+        for marker_scaling in ["sqrt", "percentile"]:
+            pd.testing.assert_frame_equal(self.timeline.bin_table(5, 15, self.league_average, marker_scaling),
+                                          self.expected_bin_table(5, 15, marker_scaling), check_dtype=False)
+        # Frames of animations are drawn with the marker scaling of the style
+        with mock.patch.object(ShotTimeline, "bin_table", wraps=self.timeline.bin_table) as bin_table:
+            self.timeline.animate(os.path.join(tempfile.mkdtemp(), "rolling.gif"), self.league_average, size=10,
+                                  step=20, image_size="small", marker_scaling="sqrt")
+        self.assertEqual(bin_table.call_args[0][3], "sqrt")
+
+    def test_rolling_windows(self):
+        self.assertEqual(self.timeline.rolling_windows(10, 5), [(0, 10), (5, 15), (10, 20), (15, 25), (20, 30)])
+        self.assertEqual(self.timeline.rolling_windows(50), [(0, 30)])
+        with self.assertRaises(ValueError):
+            self.timeline.rolling_windows(0)
+
+    def test_gif_animation(self):
+        path = os.path.join(tempfile.mkdtemp(), "rolling.gif")
+        frames = self.timeline.animate(path, self.league_average, size=10, step=10, title="Player",
+                                       image_size="small")
+        self.assertEqual(frames, 3)
+        with Image.open(path) as image:
+            self.assertEqual(image.n_frames, 3)
+        with self.assertRaises(ValueError):
+            self.timeline.animate(os.path.join(tempfile.mkdtemp(), "rolling.avi"), self.league_average)
+
+    def test_ffmpeg_exiting_early(self):
+        process = mock.Mock()
+        process.stdin.write.side_effect = BrokenPipeError()
+        process.wait.return_value = 1
+        frames = [np.zeros((4, 4, 3), dtype=np.uint8)] * 2
+        with mock.patch("subprocess.Popen", return_value=process):
+            with self.assertRaises(ValueError):
+                _write_mp4(frames, "rolling.mp4", 4)
+        process.wait.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,17 @@
-import matplotlib.path as mpath
+from functools import lru_cache
+
 import numpy as np
 
 
+@lru_cache(maxsize=None)
 def get_smooth_square():
     """
-    Creates marker which represents smooth square.
+    Creates marker which represents smooth square. It is created once and shared, so the path is read only.
 
-    :return: new matplotlib.path.Path instance
+    :return: matplotlib.path.Path instance
     """
+    import matplotlib.path as mpath
+
     marker = np.array([[-0.8, 1.0],
                        [-1.0, 0.8],
                        [-1.0, -0.8],
@@ -18,4 +22,4 @@ def get_smooth_square():
                        [0.8, 1.0],
                        [-0.8, 1.0]])
 
-    return mpath.Path(marker, closed=True)
+    return mpath.Path(marker, closed=True, readonly=True)
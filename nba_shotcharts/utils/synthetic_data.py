@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+
+from nba_shotcharts.utils.data_constants import CURRENT_SEASON
+from nba_shotcharts.utils.shotchart_constants import SHOT_TYPES
+
+# Probability of making a shot per basic zone, roughly equal to league averages
+MAKE_PROBABILITY = {
+    "Restricted Area": 0.62,
+    "In The Paint (Non-RA)": 0.40,
+    "Mid-Range": 0.40,
+    "Left Corner 3": 0.39,
+    "Right Corner 3": 0.39,
+    "Above the Break 3": 0.35
+}
+
+# Share of shots per region of the court, (region, probability)
+SHOT_MIX = [
+    ("rim", 0.32),
+    ("paint", 0.13),
+    ("mid", 0.17),
+    ("corner", 0.09),
+    ("above_break", 0.29)
+]
+
+LEAGUE_AVERAGE_COLUMNS = ["GRID_TYPE", "SHOT_ZONE_BASIC", "SHOT_ZONE_AREA", "SHOT_ZONE_RANGE", "FGA", "FGM",
+                          "FG_PCT"]
+
+
+def _polar_locations(rng, size, min_radius, max_radius, max_angle):
+    """
+    Draws locations uniformly by angle and radius around the hoop.
+    """
+    radius = rng.uniform(min_radius, max_radius, size)
+    angle = rng.uniform(-max_angle, max_angle, size)
+    return radius * np.sin(angle), radius * np.cos(angle)
+
+
+def generate_locations(n_shots, seed=0):
+    """
+    Generates LOC_X and LOC_Y coordinates of shots, distributed similarly to shots of a regular NBA player.
+
+    :param n_shots: Number of shots which will be generated.
+    :param seed: Seed for the random generator.
+    :return: Tuple of integer arrays (loc_x, loc_y)
+    """
+    rng = np.random.default_rng(seed)
+    regions = rng.choice(len(SHOT_MIX), size=n_shots, p=[share for _, share in SHOT_MIX])
+    loc_x = np.zeros(n_shots)
+    loc_y = np.zeros(n_shots)
+    for index, (region, _) in enumerate(SHOT_MIX):
+        mask = regions == index
+        size = int(mask.sum())
+        if region == "rim":
+            x, y = rng.normal(0, 12, size), rng.normal(6, 12, size)
+        elif region == "paint":
+            x, y = rng.uniform(-80, 80, size), rng.uniform(-40, 142, size)
+        elif region == "mid":
+            x, y = _polar_locations(rng, size, 80, 230, np.pi / 2)
+        elif region == "corner":
+            x = rng.choice([-1, 1], size) * rng.uniform(222, 245, size)
+            y = rng.uniform(-45, 88, size)
+        else:
+            x, y = _polar_locations(rng, size, 238, 290, 1.2)
+        loc_x[mask], loc_y[mask] = x, y
+    loc_x = np.clip(np.round(loc_x), -250, 250).astype(np.int64)
+    loc_y = np.clip(np.round(loc_y), -47, 299).astype(np.int64)
+    return loc_x, loc_y
+
+
+def classify_zones(loc_x, loc_y):
+    """
+    Assigns SHOT_ZONE_BASIC, SHOT_ZONE_AREA and SHOT_ZONE_RANGE labels based on shot locations, following the
+    court zones which are used by stats.nba.com.
+
+    :param loc_x: Array of x coordinates of shots.
+    :param loc_y: Array of y coordinates of shots.
+    :return: Tuple of arrays (shot_zone_basic, shot_zone_area, shot_zone_range, shot_distance)
+    """
+    loc_x = np.asarray(loc_x, dtype=np.float64)
+    loc_y = np.asarray(loc_y, dtype=np.float64)
+    distance = np.sqrt(loc_x ** 2 + loc_y ** 2)
+    corner = (np.abs(loc_x) >= 220) & (loc_y <= 92.5)
+    three = corner | (distance >= 237.5)
+    restricted = distance < 40
+    paint = (np.abs(loc_x) < 80) & (loc_y < 142.5) & ~restricted
+
+    basic = np.select(
+        [restricted, corner & (loc_x < 0), corner, three, paint],
+        ["Restricted Area", "Left Corner 3", "Right Corner 3", "Above the Break 3", "In The Paint (Non-RA)"],
+        default="Mid-Range"
+    ).astype(object)
+
+    angle = np.degrees(np.arctan2(loc_x, np.maximum(loc_y, 0)))
+    area = np.select(
+        [np.abs(angle) < 22.5, angle <= -67.5, angle < 0, angle >= 67.5],
+        ["Center(C)", "Left Side(L)", "Left Side Center(LC)", "Right Side(R)"],
+        default="Right Side Center(RC)"
+    ).astype(object)
+    area[restricted] = "Center(C)"
+    area[corner & (loc_x < 0)] = "Left Side(L)"
+    area[corner & (loc_x > 0)] = "Right Side(R)"
+
+    zone_range = np.select(
+        [distance < 80, distance < 160, distance < 240],
+        ["Less Than 8 ft.", "8-16 ft.", "16-24 ft."],
+        default="24+ ft."
+    ).astype(object)
+    zone_range[three & (distance < 240)] = "24+ ft."
+    zone_range[restricted] = "Less Than 8 ft."
+    return basic, area, zone_range, np.round(distance / 10).astype(np.int64)
+
+
+def generate_shots(n_shots, seed=0, n_players=1, n_games=82, season=CURRENT_SEASON):
+    """
+    Generates synthetic shot frame with same columns that ShotChartDetail returns (after the filtering which is done
+    in DataRetrieverFactory). Zones are consistent with locations and made shots follow realistic percentages.
+
+    :param n_shots: Number of shots which will be generated.
+    :param seed: Seed for the random generator.
+    :param n_players: Number of different players to which shots are assigned.
+    :param n_games: Number of games over which shots are spread.
+    :param season: Season in format YYYY-YY, used for game dates.
+    :return: pandas DataFrame with shots, sorted by game date.
+    """
+    rng = np.random.default_rng(seed)
+    loc_x, loc_y = generate_locations(n_shots, seed=seed)
+    basic, area, zone_range, distance = classify_zones(loc_x, loc_y)
+    probability = pd.Series(basic).map(MAKE_PROBABILITY).to_numpy(dtype=np.float64)
+    made = (rng.random(n_shots) < probability).astype(np.int64)
+
+    games = np.sort(rng.integers(0, n_games, n_shots))
+    first_day = np.datetime64(season[:4] + "-10-16")
+    game_dates = pd.to_datetime(first_day + (games * 2).astype("timedelta64[D]")).strftime("%Y%m%d")
+    player_ids = rng.integers(0, n_players, n_shots) + 200000
+    three = np.array(["3" in zone for zone in basic]) if n_shots else np.zeros(0, dtype=bool)
+
+    return pd.DataFrame({
+        "GRID_TYPE": "Shot Chart Detail",
+        "GAME_ID": (21800001 + games).astype(str),
+        "GAME_EVENT_ID": np.arange(n_shots, dtype=np.int64),
+        "PLAYER_ID": player_ids,
+        "PLAYER_NAME": pd.Series(player_ids).map(lambda player_id: "Player " + str(player_id)).to_numpy(),
+        "ACTION_TYPE": np.asarray(SHOT_TYPES, dtype=object)[rng.integers(0, len(SHOT_TYPES), n_shots)],
+        "SHOT_TYPE": np.where(three, "3PT Field Goal", "2PT Field Goal"),
+        "SHOT_ZONE_BASIC": basic,
+        "SHOT_ZONE_AREA": area,
+        "SHOT_ZONE_RANGE": zone_range,
+        "SHOT_DISTANCE": distance,
+        "LOC_X": loc_x,
+        "LOC_Y": loc_y,
+        "SHOT_ATTEMPTED_FLAG": np.ones(n_shots, dtype=np.int64),
+        "SHOT_MADE_FLAG": made,
+        "GAME_DATE": np.asarray(game_dates)
+    })
+
+
+def generate_league_averages(shots=None, seed=0, n_shots=200000):
+    """
+    Generates league averages per zone, in the same format as the second data frame returned by ShotChartDetail.
+
+    :param shots: Shots from which averages are calculated, if None then new shots are generated.
+    :param seed: Seed for the random generator, used only when shots are generated.
+    :param n_shots: Number of shots which will be generated if shots aren't given.
+    :return: pandas DataFrame with league averages per zone.
+    """
+    if shots is None:
+        shots = generate_shots(n_shots, seed=seed)
+    averages = shots.groupby(["SHOT_ZONE_BASIC", "SHOT_ZONE_AREA", "SHOT_ZONE_RANGE"]).agg(
+        FGA=("SHOT_MADE_FLAG", "size"),
+        FGM=("SHOT_MADE_FLAG", "sum")
+    ).reset_index()
+    averages["FG_PCT"] = (averages.FGM / averages.FGA).round(3)
+    averages["GRID_TYPE"] = "League Averages"
+    return averages[LEAGUE_AVERAGE_COLUMNS]
@@ -2,10 +2,16 @@ from setuptools import setup, find_packages
 setup(
     name="nba_shotcharts",
     version="0.1",
-    packages=find_packages(exclude=['tests', 'images']),
+    packages=find_packages(exclude=['tests', 'images', 'benchmarks', 'benchmarks.*']),
 
-    install_requires=['docutils>=0.3', 'pandas>=0.20.3', 'matplotlib>=2.2.2',
-                      'numpy>=1.14.2', 'seaborn>=0.8.1'],
+    # pandas 1.5 for factorize(use_na_sentinel=...), Python 3.9 for shared memory and asyncio.to_thread
+    python_requires='>=3.9',
+    install_requires=['docutils>=0.3', 'pandas>=1.5', 'matplotlib>=2.2.2',
+                      'numpy>=1.21', 'seaborn>=0.8.1'],
+    extras_require={
+        'cache': ['pyarrow'],  # Parquet files of ShotchartCache
+        'async': ['aiohttp'],  # AsyncDataRetriever
+    },
 
     include_package_data=True,
 